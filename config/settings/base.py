@@ -12,6 +12,7 @@ INSTALLED_APPS = [
   "django_filters",
   "drf_spectacular",
 
+  "common",
   "users",
   "auth",
   "doctors",
@@ -23,3 +24,60 @@ INSTALLED_APPS = [
 ]
 
 AUTH_USER_MODEL = "users.User"
+
+CHANNEL_LAYERS = {
+  "default": {
+    "BACKEND": "chat.infrastructure.channel_layer.DatabaseChannelLayer",
+    "CONFIG": {
+      "expiry": 60,
+      "group_expiry": 86400,
+    },
+  },
+  # Typing and presence only; carried by NOTIFY between workers, never stored
+  "ephemeral": {
+    "BACKEND": "chat.infrastructure.channel_layer.NotifyChannelLayer",
+  },
+}
+
+BUFFERED_WRITERS = {
+  "audit": {
+    "capacity": 10000,
+    "flush_size": 500,
+    "flush_interval": 1.0,
+  },
+  "video_events": {
+    "capacity": 50000,
+    "flush_size": 2000,
+    "flush_interval": 0.5,
+    # High-volume telemetry relies on size/time flushes only
+    "flush_on_request_end": False,
+  },
+  "record_access": {
+    "capacity": 20000,
+    "flush_size": 1000,
+    "flush_interval": 1.0,
+    # Append-only log: batch by size/time rather than once per request
+    "flush_on_request_end": False,
+  },
+}
+
+# Clients heartbeat well inside this window; lapsed ACTIVE sessions are swept to FAILED
+VIDEO_SESSION_LEASE_SECONDS = 45
+
+# Shared content-addressed file store (common.blobstore). Any Django storage
+# works; common.blob_storage.S3CompatibleStorage targets S3-style object stores.
+BLOB_STORAGE = {
+  "BACKEND": "django.core.files.storage.FileSystemStorage",
+  "OPTIONS": {},
+}
+
+VIDEO_PROVIDER = {
+  "BACKEND": "video.infrastructure.providers.FakeVideoProvider",
+  "OPTIONS": {},
+}
+
+VIDEO_PROVISIONING = {
+  "window_minutes": 30,
+  "batch_size": 100,
+  "max_workers": 8,
+}
@@ -1,2 +1,39 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 DEBUG = False
+
+if not os.environ.get("VIDEO_PROVIDER_URL"):
+  # Fail at startup rather than on the first video join
+  raise ImproperlyConfigured("VIDEO_PROVIDER_URL must be set in production.")
+
+VIDEO_PROVIDER = {
+  "BACKEND": "video.infrastructure.http_provider.HttpVideoProvider",
+  "OPTIONS": {
+    "base_url": os.environ["VIDEO_PROVIDER_URL"],
+    "api_key": os.environ.get("VIDEO_PROVIDER_API_KEY", ""),
+    # Bounded per process so provider latency cannot hold every worker
+    "max_connections": int(os.environ.get("VIDEO_PROVIDER_MAX_CONNECTIONS", "10")),
+    "connect_timeout": 1.0,
+    "read_timeout": 3.0,
+    "pool_timeout": 0.5,
+    "failure_threshold": 5,
+    "reset_timeout": 30.0,
+  },
+}
+
+if os.environ.get("BLOB_STORAGE_BUCKET"):
+  # Needs boto3; set BLOB_STORAGE_ENDPOINT_URL for non-AWS S3-compatible stores
+  BLOB_STORAGE = {
+    "BACKEND": "common.blob_storage.S3CompatibleStorage",
+    "OPTIONS": {
+      "bucket": os.environ["BLOB_STORAGE_BUCKET"],
+      "prefix": os.environ.get("BLOB_STORAGE_PREFIX", ""),
+      "client_options": {
+        "endpoint_url": os.environ.get("BLOB_STORAGE_ENDPOINT_URL") or None,
+        "region_name": os.environ.get("BLOB_STORAGE_REGION") or None,
+      },
+    },
+  }
@@ -24,4 +24,8 @@ urlpatterns = [
     path("api/v1/users/", include("users.presentation.urls")),
     path("api/v1/doctors/", include("doctors.presentation.urls")),
     path("api/v1/appointments/", include("appointments.presentation.urls")),
+    path("api/v1/records/", include("records.presentation.urls")),
+    path("api/v1/video/", include("video.presentation.urls")),
+    path("api/v1/chat/", include("chat.presentation.urls")),
+    path("api/v1/dashboard/", include("dashboard.presentation.urls")),
 ]
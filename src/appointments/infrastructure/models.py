@@ -88,6 +88,12 @@ class Appointment(models.Model):
             models.Index(fields=["doctor", "start_time"]),
             models.Index(fields=["patient", "start_time"]),
             models.Index(fields=["status"]),
+            # Upcoming booked appointments, scanned by video pre-provisioning
+            models.Index(
+                fields=["start_time"],
+                name="appt_booked_start_idx",
+                condition=Q(status=AppointmentStatus.BOOKED),
+            ),
         ]
         constraints = [
             models.CheckConstraint(
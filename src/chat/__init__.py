@@ -0,0 +1 @@
+"""Chat app package."""
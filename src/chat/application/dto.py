@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class MarkConversationReadRequest:
+    user_id: str
+    conversation_id: str
+    message_id: Optional[str]
+
+
+@dataclass(frozen=True)
+class GetUnreadCountRequest:
+    user_id: str
+    conversation_id: str
+
+
+@dataclass(frozen=True)
+class RecordReadReceiptRequest:
+    user_id: str
+    message_id: str
+
+
+@dataclass(frozen=True)
+class UnreadCountResult:
+    conversation_id: str
+    unread: int
+
+
+class ChatError(Exception):
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        details: Optional[dict] = None,
+        status: int = 400,
+    ) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details or {}
+        self.status = status
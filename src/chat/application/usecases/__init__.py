@@ -0,0 +1,9 @@
+from chat.application.usecases.get_unread_count import GetUnreadCountUseCase
+from chat.application.usecases.mark_conversation_read import MarkConversationReadUseCase
+from chat.application.usecases.record_read_receipt import RecordReadReceiptUseCase
+
+__all__ = [
+    "GetUnreadCountUseCase",
+    "MarkConversationReadUseCase",
+    "RecordReadReceiptUseCase",
+]
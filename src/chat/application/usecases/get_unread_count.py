@@ -0,0 +1,29 @@
+from chat.application.dto import ChatError, GetUnreadCountRequest, UnreadCountResult
+from chat.domain.repositories import ChatMessageRepository, ReadStateRepository
+
+
+class GetUnreadCountUseCase:
+    def __init__(
+        self,
+        message_repository: ChatMessageRepository,
+        read_state_repository: ReadStateRepository,
+    ) -> None:
+        self.message_repository = message_repository
+        self.read_state_repository = read_state_repository
+
+    def execute(self, request: GetUnreadCountRequest) -> UnreadCountResult:
+        state = self.read_state_repository.get(request.conversation_id, request.user_id)
+        if state is None:
+            raise ChatError(
+                code="not_participant",
+                message="You are not a participant in this conversation.",
+                details={"conversationId": request.conversation_id},
+                status=403,
+            )
+
+        unread = self.message_repository.count_after(
+            conversation_id=request.conversation_id,
+            after=state,
+            exclude_sender_id=request.user_id,
+        )
+        return UnreadCountResult(conversation_id=request.conversation_id, unread=unread)
@@ -0,0 +1,53 @@
+import uuid
+
+from chat.application.dto import ChatError, MarkConversationReadRequest
+from chat.domain.entities import ReadState
+from chat.domain.repositories import ChatMessageRepository, ReadStateRepository
+
+
+class MarkConversationReadUseCase:
+    def __init__(
+        self,
+        message_repository: ChatMessageRepository,
+        read_state_repository: ReadStateRepository,
+    ) -> None:
+        self.message_repository = message_repository
+        self.read_state_repository = read_state_repository
+
+    def execute(self, request: MarkConversationReadRequest) -> ReadState:
+        state = self.read_state_repository.get(request.conversation_id, request.user_id)
+        if state is None:
+            raise ChatError(
+                code="not_participant",
+                message="You are not a participant in this conversation.",
+                details={"conversationId": request.conversation_id},
+                status=403,
+            )
+
+        if request.message_id:
+            message = self.message_repository.get_by_id(request.message_id)
+            if message is None or not _same_id(message.conversation_id, request.conversation_id):
+                raise ChatError(
+                    code="message_not_found",
+                    message="Message not found in this conversation.",
+                    details={"messageId": request.message_id},
+                    status=404,
+                )
+        else:
+            message = self.message_repository.get_latest(request.conversation_id)
+            if message is None:
+                return state
+
+        return self.read_state_repository.advance(
+            conversation_id=request.conversation_id,
+            user_id=request.user_id,
+            message=message,
+        )
+
+
+def _same_id(left: str, right: str) -> bool:
+    """Compare ids as UUIDs, so uppercase or brace-wrapped forms from a URL still match."""
+    try:
+        return uuid.UUID(str(left)) == uuid.UUID(str(right))
+    except ValueError:
+        return False
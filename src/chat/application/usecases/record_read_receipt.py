@@ -0,0 +1,47 @@
+from django.db import transaction
+
+from chat.application.dto import ChatError, RecordReadReceiptRequest
+from chat.domain.entities import ReadReceipt
+from chat.domain.repositories import (
+    ChatMessageRepository,
+    ReadReceiptRepository,
+    ReadStateRepository,
+)
+
+
+class RecordReadReceiptUseCase:
+    def __init__(
+        self,
+        message_repository: ChatMessageRepository,
+        read_state_repository: ReadStateRepository,
+        receipt_repository: ReadReceiptRepository,
+    ) -> None:
+        self.message_repository = message_repository
+        self.read_state_repository = read_state_repository
+        self.receipt_repository = receipt_repository
+
+    def execute(self, request: RecordReadReceiptRequest) -> ReadReceipt:
+        message = self.message_repository.get_by_id(request.message_id)
+        if message is None:
+            raise ChatError(
+                code="message_not_found",
+                message="Message not found.",
+                details={"messageId": request.message_id},
+                status=404,
+            )
+        if self.read_state_repository.get(message.conversation_id, request.user_id) is None:
+            raise ChatError(
+                code="not_participant",
+                message="You are not a participant in this conversation.",
+                details={"conversationId": message.conversation_id},
+                status=403,
+            )
+
+        with transaction.atomic():
+            receipt = self.receipt_repository.record(message.id, request.user_id)
+            self.read_state_repository.advance(
+                conversation_id=message.conversation_id,
+                user_id=request.user_id,
+                message=message,
+            )
+        return receipt
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class ChatConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "chat"
+
+    def ready(self) -> None:
+        from django.db.models.signals import post_delete
+
+        from chat.infrastructure import models
+        from common.blobstore import release_on_delete
+
+        post_delete.connect(release_on_delete, sender=models.Message, dispatch_uid="chat.message_blob_release")
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ChatMessage:
+    id: str
+    conversation_id: str
+    sender_id: str
+    created_at: datetime
+
+
+@dataclass(frozen=True)
+class ReadState:
+    conversation_id: str
+    user_id: str
+    last_read_message_id: Optional[str]
+    last_read_at: Optional[datetime]
+
+
+@dataclass(frozen=True)
+class ReadReceipt:
+    message_id: str
+    user_id: str
+    read_at: datetime
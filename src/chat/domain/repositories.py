@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from chat.domain.entities import ChatMessage, ReadReceipt, ReadState
+
+
+class ChatMessageRepository(ABC):
+    @abstractmethod
+    def get_by_id(self, message_id: str) -> Optional[ChatMessage]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_latest(self, conversation_id: str) -> Optional[ChatMessage]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_after(self, conversation_id: str, after: Optional[ReadState], exclude_sender_id: str) -> int:
+        """Messages after the read watermark, ordered by (created_at, id)."""
+        raise NotImplementedError
+
+
+class ReadStateRepository(ABC):
+    @abstractmethod
+    def get(self, conversation_id: str, user_id: str) -> Optional[ReadState]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def advance(
+        self, conversation_id: str, user_id: str, message: ChatMessage
+    ) -> ReadState:
+        raise NotImplementedError
+
+
+class ReadReceiptRepository(ABC):
+    @abstractmethod
+    def record(self, message_id: str, user_id: str) -> ReadReceipt:
+        raise NotImplementedError
@@ -0,0 +1,455 @@
+import asyncio
+import functools
+import json
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, Optional, Set
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from chat.infrastructure.models import ChannelGroupMembership, ChannelMessage
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseChannelLayer(BaseChannelLayer):
+    """Channel layer that keeps messages and group membership in the database.
+
+    Every ASGI worker sharing the database sees the same groups, so chat rooms
+    span processes and hosts without Redis. On PostgreSQL receivers are woken
+    through LISTEN/NOTIFY; on other databases one task polls for every waiting
+    receiver. Queries run on the layer's own threads, each of which keeps its
+    database connection open between calls.
+    """
+
+    extensions = ["groups", "flush"]
+
+    def __init__(
+        self,
+        expiry: int = 60,
+        group_expiry: int = 86400,
+        capacity: int = 100,
+        channel_capacity=None,
+        poll_interval: float = 0.05,
+        listen_timeout: float = 1.0,
+        notify_channel: str = "chat_channel_layer",
+        db_threads: int = 4,
+    ) -> None:
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.listen_timeout = listen_timeout
+        self.notify_channel = notify_channel
+        self.client_prefix = uuid.uuid4().hex
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._listening = asyncio.Event()
+        self._last_cleanup = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=db_threads, thread_name_prefix="channel-layer")
+
+    # Channel API
+
+    async def send(self, channel: str, message: dict) -> None:
+        assert isinstance(message, dict), "message is not a dict"
+        assert self.require_valid_channel_name(channel)
+        assert "__asgi_channel__" not in message
+        self._wake(await self._db(self._insert, [channel], message, enforce_capacity=True))
+
+    async def receive(self, channel: str) -> dict:
+        assert self.require_valid_channel_name(channel)
+        self._ensure_listener()
+        wakeup = self._wakeups.setdefault(channel, asyncio.Event())
+        try:
+            while True:
+                wakeup.clear()
+                message = await self._db(self._pop, channel)
+                if message is not None:
+                    return message
+                await self._maybe_cleanup()
+                if self._listening.is_set():
+                    # The listener or poller wakes us; no query until then
+                    await wakeup.wait()
+                    continue
+                try:
+                    # Neither is running: check back every listen_timeout
+                    await asyncio.wait_for(wakeup.wait(), timeout=self.listen_timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeups.pop(channel, None)
+
+    async def new_channel(self, prefix: str = "specific") -> str:
+        return f"{prefix}.{self.client_prefix}!{uuid.uuid4().hex}"
+
+    # Groups extension
+
+    async def group_add(self, group: str, channel: str) -> None:
+        assert self.require_valid_group_name(group)
+        assert self.require_valid_channel_name(channel)
+        await self._db(self._upsert_membership, group, channel)
+
+    async def group_discard(self, group: str, channel: str) -> None:
+        assert self.require_valid_group_name(group)
+        assert self.require_valid_channel_name(channel)
+        await self._db(self._discard_membership, group, channel)
+
+    async def group_send(self, group: str, message: dict) -> None:
+        assert self.require_valid_group_name(group)
+        self._wake(await self._db(self._send_to_group, group, message))
+
+    # Flush extension
+
+    async def flush(self) -> None:
+        await self._db(self._flush)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    # Database side
+
+    def _insert(self, channels: List[str], message: dict, enforce_capacity: bool = False) -> List[str]:
+        if not channels:
+            return channels
+        expires_at = timezone.now() + timedelta(seconds=self.expiry)
+        if enforce_capacity:
+            capacity = self.get_capacity(channels[0])
+            queued = ChannelMessage.objects.filter(channel=channels[0])[:capacity].count()
+            if queued >= capacity:
+                raise ChannelFull(channels[0])
+        with transaction.atomic():
+            ChannelMessage.objects.bulk_create(
+                [ChannelMessage(channel=channel, payload=message, expires_at=expires_at) for channel in channels]
+            )
+            if self._uses_notify():
+                with connection.cursor() as cursor:
+                    # Delivered to listeners when the transaction commits
+                    for channel in channels:
+                        cursor.execute("SELECT pg_notify(%s, %s)", [self.notify_channel, channel])
+        return channels
+
+    def _send_to_group(self, group: str, message: dict) -> List[str]:
+        channels = list(
+            ChannelGroupMembership.objects.filter(group=group, expires_at__gt=timezone.now())
+            .values_list("channel", flat=True)
+        )
+        return self._insert(channels, message)
+
+    def _pop(self, channel: str) -> Optional[dict]:
+        with transaction.atomic():
+            row = (
+                ChannelMessage.objects.select_for_update(skip_locked=True)
+                .filter(channel=channel, expires_at__gt=timezone.now())
+                .order_by("id")
+                .only("id", "payload")
+                .first()
+            )
+            if row is None:
+                return None
+            ChannelMessage.objects.filter(pk=row.pk).delete()
+        return row.payload
+
+    def _discard_membership(self, group: str, channel: str) -> None:
+        ChannelGroupMembership.objects.filter(group=group, channel=channel).delete()
+
+    def _channels_with_messages(self, channels: List[str]) -> List[str]:
+        return list(
+            ChannelMessage.objects.filter(channel__in=channels, expires_at__gt=timezone.now())
+            .order_by()
+            .values_list("channel", flat=True)
+            .distinct()
+        )
+
+    def _upsert_membership(self, group: str, channel: str) -> None:
+        ChannelGroupMembership.objects.update_or_create(
+            group=group,
+            channel=channel,
+            defaults={"expires_at": timezone.now() + timedelta(seconds=self.group_expiry)},
+        )
+
+    def _cleanup(self) -> None:
+        now = timezone.now()
+        ChannelMessage.objects.filter(expires_at__lte=now).delete()
+        ChannelGroupMembership.objects.filter(expires_at__lte=now).delete()
+
+    def _flush(self) -> None:
+        ChannelMessage.objects.all().delete()
+        ChannelGroupMembership.objects.all().delete()
+
+    async def _maybe_cleanup(self) -> None:
+        now = time.monotonic()
+        if now - self._last_cleanup >= self.expiry:
+            self._last_cleanup = now
+            await self._db(self._cleanup)
+
+    def _wake(self, channels: List[str]) -> None:
+        # Receivers in this process need not wait for a notification or poll
+        for channel in channels:
+            wakeup = self._wakeups.get(channel)
+            if wakeup is not None:
+                wakeup.set()
+
+    async def _db(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(_call, fn, *args, **kwargs))
+
+    # LISTEN/NOTIFY
+
+    def _uses_notify(self) -> bool:
+        return connection.vendor == "postgresql"
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.ensure_future(self._listen() if self._uses_notify() else self._poll())
+
+    async def _poll(self) -> None:
+        # One query per interval for all waiting receivers, not one per receiver
+        self._listening.set()
+        try:
+            while True:
+                channels = list(self._wakeups)
+                if channels:
+                    try:
+                        ready = await self._db(self._channels_with_messages, channels)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:
+                        logger.exception("Channel layer poll failed")
+                        ready = []
+                    self._wake(ready)
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            self._stopped_listening()
+
+    async def _listen(self) -> None:
+        import psycopg
+
+        params = await self._db(_listen_params)
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(**params, autocommit=True) as conn:
+                    await conn.execute(f'LISTEN "{self.notify_channel}"')
+                    self._listening.set()
+                    # Anything sent while we were not listening was not announced
+                    self._wake(list(self._wakeups))
+                    async for notify in conn.notifies():
+                        wakeup = self._wakeups.get(notify.payload)
+                        if wakeup is not None:
+                            wakeup.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Receivers fall back to listen_timeout polling until we reconnect
+                logger.exception("Channel layer listener failed; reconnecting")
+                self._stopped_listening()
+                await asyncio.sleep(self.listen_timeout)
+            finally:
+                self._stopped_listening()
+
+    def _stopped_listening(self) -> None:
+        # Receivers waiting without a timeout re-check and fall back to polling
+        self._listening.clear()
+        self._wake(list(self._wakeups))
+
+
+class NotifyChannelLayer(BaseChannelLayer):
+    """Channel layer for ephemeral events that are never written to a table.
+
+    Messages travel as PostgreSQL NOTIFY payloads to every process listening
+    on ``notify_channel``; each process keeps its own group membership and
+    queues and delivers to the channels it owns. Nothing is stored, so a
+    message reaches only receivers connected when it is sent, which suits
+    typing and presence. On other databases delivery stays within the
+    process.
+    """
+
+    extensions = ["groups", "flush"]
+
+    # NOTIFY payloads must stay under 8000 bytes
+    max_payload = 7900
+
+    def __init__(
+        self,
+        expiry: int = 60,
+        capacity: int = 100,
+        channel_capacity=None,
+        notify_channel: str = "chat_ephemeral_layer",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity)
+        self.notify_channel = notify_channel
+        self.reconnect_delay = reconnect_delay
+        self.client_prefix = uuid.uuid4().hex
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._groups: Dict[str, Set[str]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._listening = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ephemeral-layer")
+
+    # Channel API
+
+    async def send(self, channel: str, message: dict) -> None:
+        assert isinstance(message, dict), "message is not a dict"
+        assert self.require_valid_channel_name(channel)
+        if channel in self._queues:
+            self._deliver(channel, message, raise_full=True)
+            return
+        await self._publish({"channel": channel, "message": message})
+
+    async def receive(self, channel: str) -> dict:
+        assert self.require_valid_channel_name(channel)
+        self._ensure_listener()
+        return await self._queue(channel).get()
+
+    async def new_channel(self, prefix: str = "specific") -> str:
+        channel = f"{prefix}.{self.client_prefix}!{uuid.uuid4().hex}"
+        self._queue(channel)
+        return channel
+
+    # Groups extension
+
+    async def group_add(self, group: str, channel: str) -> None:
+        assert self.require_valid_group_name(group)
+        assert self.require_valid_channel_name(channel)
+        self._ensure_listener()
+        self._queue(channel)
+        self._groups.setdefault(group, set()).add(channel)
+
+    async def group_discard(self, group: str, channel: str) -> None:
+        assert self.require_valid_group_name(group)
+        assert self.require_valid_channel_name(channel)
+        members = self._groups.get(group)
+        if members is not None:
+            members.discard(channel)
+            if not members:
+                del self._groups[group]
+        if not any(channel in members for members in self._groups.values()):
+            self._queues.pop(channel, None)
+
+    async def group_send(self, group: str, message: dict) -> None:
+        assert self.require_valid_group_name(group)
+        self._deliver_to_group(group, message)
+        await self._publish({"group": group, "message": message})
+
+    # Flush extension
+
+    async def flush(self) -> None:
+        self._queues.clear()
+        self._groups.clear()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    # Delivery
+
+    def _queue(self, channel: str) -> asyncio.Queue:
+        queue = self._queues.get(channel)
+        if queue is None:
+            queue = self._queues[channel] = asyncio.Queue(maxsize=self.get_capacity(channel))
+        return queue
+
+    def _deliver(self, channel: str, message: dict, raise_full: bool = False) -> None:
+        queue = self._queues.get(channel)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            if raise_full:
+                raise ChannelFull(channel)
+            # As with other layers, group sends to a full channel are dropped
+
+    def _deliver_to_group(self, group: str, message: dict) -> None:
+        for channel in list(self._groups.get(group, ())):
+            self._deliver(channel, message)
+
+    def _receive_payload(self, payload: str) -> None:
+        try:
+            envelope = json.loads(payload)
+        except ValueError:
+            envelope = None
+        if not isinstance(envelope, dict) or not isinstance(envelope.get("message"), dict):
+            logger.error("Ephemeral layer ignored a malformed notification")
+            return
+        if envelope.get("origin") == self.client_prefix:
+            # Already delivered locally when it was sent
+            return
+        if "group" in envelope:
+            self._deliver_to_group(envelope["group"], envelope["message"])
+        elif "channel" in envelope:
+            self._deliver(envelope["channel"], envelope["message"])
+
+    # LISTEN/NOTIFY
+
+    def _uses_notify(self) -> bool:
+        return connection.vendor == "postgresql"
+
+    async def _publish(self, envelope: dict) -> None:
+        if not self._uses_notify():
+            return
+        payload = json.dumps({"origin": self.client_prefix, **envelope})
+        if len(payload.encode()) > self.max_payload:
+            raise ValueError(f"Ephemeral message of {len(payload)} bytes is too large for NOTIFY")
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, functools.partial(_call, self._notify, payload))
+
+    def _notify(self, payload: str) -> None:
+        # Outside a transaction, so delivered as soon as it is issued
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.notify_channel, payload])
+
+    def _ensure_listener(self) -> None:
+        if not self._uses_notify():
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.ensure_future(self._listen())
+
+    async def _listen(self) -> None:
+        import psycopg
+
+        loop = asyncio.get_running_loop()
+        params = await loop.run_in_executor(self._executor, _listen_params)
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(**params, autocommit=True) as conn:
+                    await conn.execute(f'LISTEN "{self.notify_channel}"')
+                    self._listening.set()
+                    async for notify in conn.notifies():
+                        self._receive_payload(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Events from other processes are missed until we reconnect
+                logger.exception("Ephemeral layer listener failed; reconnecting")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                self._listening.clear()
+
+
+def _listen_params() -> dict:
+    # Django's params carry a sync cursor_factory and adapters context built
+    # for its own connections; the async listener connection needs neither
+    params = connection.get_connection_params()
+    for key in ("cursor_factory", "context", "pool"):
+        params.pop(key, None)
+    return params
+
+
+def _call(fn, *args, **kwargs):
+    # Runs on a layer thread; its connection stays open for the next call
+    # unless an error left it unusable
+    try:
+        return fn(*args, **kwargs)
+    except DatabaseError:
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
+        raise
@@ -0,0 +1,333 @@
+import json
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+from django.utils import timezone
+
+from chat.infrastructure.models import Conversation, ConversationParticipant, Message, MessageType
+from chat.infrastructure.models import LegacyMigrationCheckpoint
+from common.blob_storage import blob_url
+from common.blobstore import add_references
+from common.utils import preserve_timestamps
+
+# Chat ids are derived from legacy ids, so reruns and the verify pass never
+# need a mapping table.
+LEGACY_NAMESPACE = uuid.UUID("6f1c2a7e-3f0e-4b8e-9a51-2d3c4b5a6978")
+LEGACY_APP_LABEL = "messaging"
+
+
+MESSAGE_COPY_COLUMNS = [
+    "id",
+    "conversation_id",
+    "sender_id",
+    "message_type",
+    "body",
+    "file_url",
+    "blob_id",
+    "metadata",
+    "created_at",
+    "edited_at",
+]
+
+
+def conversation_uuid(legacy_id: int) -> uuid.UUID:
+    return uuid.uuid5(LEGACY_NAMESPACE, f"conversation:{legacy_id}")
+
+
+def participant_uuid(legacy_conversation_id: int, user_id) -> uuid.UUID:
+    return uuid.uuid5(LEGACY_NAMESPACE, f"participant:{legacy_conversation_id}:{user_id}")
+
+
+def message_uuid(legacy_id: int) -> uuid.UUID:
+    return uuid.uuid5(LEGACY_NAMESPACE, f"message:{legacy_id}")
+
+
+@dataclass(frozen=True)
+class BatchReport:
+    stage: str
+    rows: int
+    total_rows: int
+    last_legacy_id: int
+    rows_per_second: float
+
+
+@dataclass(frozen=True)
+class VerifyMismatch:
+    legacy_conversation_id: int
+    legacy_messages: int
+    chat_messages: int
+
+
+class LegacyMessagingMigrator:
+    """Copies messaging.* rows into chat.* in id order, one transaction per batch.
+
+    Each batch commits together with its checkpoint row, so an interrupted run
+    resumes exactly after the last committed batch.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 5000,
+        use_copy: Optional[bool] = None,
+        report: Callable[[BatchReport], None] = lambda report: None,
+    ) -> None:
+        # The legacy app is only importable in deployments that still install it
+        if LEGACY_APP_LABEL not in apps.app_configs:
+            raise ImproperlyConfigured("The legacy messaging app must be installed to migrate its data.")
+        self.legacy_conversations = apps.get_model(LEGACY_APP_LABEL, "Conversation")
+        self.legacy_messages = apps.get_model(LEGACY_APP_LABEL, "Message")
+        self.batch_size = batch_size
+        self.use_copy = connection.vendor == "postgresql" if use_copy is None else use_copy
+        self.report = report
+
+    def run(self) -> None:
+        # Every message at or below this id belongs to a conversation that
+        # already exists, so it is safe to copy after the conversation stage.
+        message_high_water = self.legacy_messages.objects.aggregate(top=Max("id"))["top"] or 0
+        self.copy_conversations()
+        self.copy_messages(up_to=message_high_water)
+        self.copy_read_state()
+
+    def reset(self) -> None:
+        LegacyMigrationCheckpoint.objects.all().delete()
+
+    def copy_conversations(self) -> None:
+        participants = self.legacy_conversations.participants.through
+        rows = self.legacy_conversations.objects.filter(
+            id__gt=self._checkpoint("conversations").last_legacy_id
+        ).order_by("id").values_list(
+            "id",
+            "subject",
+            "is_archived",
+            "created_at",
+            "updated_at",
+            "last_message_at",
+            "patient__user_id",
+            "doctor__user_id",
+        )
+
+        def write(batch):
+            ids = [row[0] for row in batch]
+            members = {}
+            for legacy_id, user_id in participants.objects.filter(
+                conversation_id__in=ids
+            ).values_list("conversation_id", "user_id"):
+                members.setdefault(legacy_id, []).append(user_id)
+
+            conversations, participant_rows = [], []
+            for legacy_id, subject, archived, created, updated, last_message, patient_user, doctor_user in batch:
+                conversations.append(Conversation(
+                    id=conversation_uuid(legacy_id),
+                    topic=subject or "",
+                    created_by_id=patient_user,
+                    is_archived=archived,
+                    created_at=created,
+                    updated_at=updated,
+                    last_message_at=last_message,
+                ))
+                for user_id in members.get(legacy_id, []):
+                    role = "patient" if user_id == patient_user else "doctor" if user_id == doctor_user else ""
+                    participant_rows.append(ConversationParticipant(
+                        id=participant_uuid(legacy_id, user_id),
+                        conversation_id=conversation_uuid(legacy_id),
+                        user_id=user_id,
+                        role=role,
+                        joined_at=created,
+                    ))
+            with preserve_timestamps(Conversation, ConversationParticipant):
+                Conversation.objects.bulk_create(conversations, ignore_conflicts=True)
+                ConversationParticipant.objects.bulk_create(participant_rows, ignore_conflicts=True)
+
+        self._run_stage("conversations", rows, write)
+
+    def copy_messages(self, up_to: Optional[int] = None) -> None:
+        bound = self._copied_messages_bound()
+        up_to = bound if up_to is None else min(up_to, bound)
+        rows = self.legacy_messages.objects.filter(
+            id__gt=self._checkpoint("messages").last_legacy_id,
+            id__lte=up_to,
+        )
+        rows = rows.order_by("id").values_list(
+            "id", "conversation_id", "sender_id", "content", "attachment", "blob_id", "created_at", "edited_at"
+        )
+        self._run_stage("messages", rows, self._copy_message_batch if self.use_copy else self._insert_message_batch)
+
+    def _copied_messages_bound(self) -> int:
+        """Highest message id whose conversation, and every earlier message's, is already copied"""
+        copied_up_to = self._checkpoint("conversations").last_legacy_id
+        top = self.legacy_messages.objects.aggregate(top=Max("id"))["top"] or 0
+        first_uncopied = self.legacy_messages.objects.filter(
+            conversation_id__gt=copied_up_to
+        ).aggregate(first=Min("id"))["first"]
+        return top if first_uncopied is None else min(top, first_uncopied - 1)
+
+    def copy_read_state(self) -> None:
+        """Set each participant's watermark from the legacy is_read flags"""
+        rows = self.legacy_conversations.objects.filter(
+            id__gt=self._checkpoint("read_state").last_legacy_id
+        ).order_by("id").values_list("id")
+
+        def write(batch):
+            ids = [row[0] for row in batch]
+            # The newest read message per (conversation, sender): its time and id come from the same row
+            newest = self.legacy_messages.objects.filter(
+                conversation_id=OuterRef("conversation_id"),
+                sender_id=OuterRef("sender_id"),
+                is_read=True,
+            ).order_by("-created_at", "-id")
+            newest_read = {}
+            for legacy_id, sender_id, last_at, last_id in self.legacy_messages.objects.filter(
+                conversation_id__in=ids, is_read=True
+            ).order_by().values("conversation_id", "sender_id").distinct().annotate(
+                last_at=Subquery(newest.values("created_at")[:1]),
+                last_id=Subquery(newest.values("id")[:1]),
+            ).values_list("conversation_id", "sender_id", "last_at", "last_id"):
+                newest_read.setdefault(legacy_id, []).append((sender_id, last_at, last_id))
+
+            updates = []
+            participants = ConversationParticipant.objects.filter(
+                conversation_id__in=[conversation_uuid(legacy_id) for legacy_id in ids]
+            )
+            legacy_by_uuid = {conversation_uuid(legacy_id): legacy_id for legacy_id in ids}
+            for participant in participants:
+                # A legacy message marked read was read by the participant who did not send it
+                read = [
+                    (last_at, last_id)
+                    for sender_id, last_at, last_id in newest_read.get(legacy_by_uuid[participant.conversation_id], [])
+                    if sender_id != participant.user_id
+                ]
+                if not read:
+                    continue
+                last_at, last_id = max(read)
+                participant.last_read_at = last_at
+                participant.last_read_message_id = message_uuid(last_id)
+                updates.append(participant)
+            ConversationParticipant.objects.bulk_update(updates, ["last_read_at", "last_read_message"])
+
+        self._run_stage("read_state", rows, write)
+
+    def verify(self) -> Iterator[VerifyMismatch]:
+        """Compare per-conversation message counts, one batch of conversations at a time"""
+        last_id = 0
+        while True:
+            ids = list(
+                self.legacy_conversations.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[: self.batch_size]
+            )
+            if not ids:
+                return
+            last_id = ids[-1]
+            legacy_counts = dict(
+                self.legacy_messages.objects.filter(conversation_id__in=ids).order_by()
+                .values("conversation_id").annotate(n=Count("id")).values_list("conversation_id", "n")
+            )
+            chat_counts = dict(
+                Message.objects.filter(conversation_id__in=[conversation_uuid(i) for i in ids]).order_by()
+                .values("conversation_id").annotate(n=Count("id")).values_list("conversation_id", "n")
+            )
+            for legacy_id in ids:
+                expected = legacy_counts.get(legacy_id, 0)
+                actual = chat_counts.get(conversation_uuid(legacy_id), 0)
+                if expected != actual:
+                    yield VerifyMismatch(legacy_id, expected, actual)
+
+    def _insert_message_batch(self, batch) -> None:
+        values = self._new_message_values(batch)
+        with preserve_timestamps(Message):
+            Message.objects.bulk_create([Message(**row) for row in values], ignore_conflicts=True)
+        self._reference_blobs(row["blob_id"] for row in values)
+
+    def _copy_message_batch(self, batch) -> None:
+        # COPY has no conflict handling, so rows land in a scratch table and
+        # are moved with ON CONFLICT DO NOTHING; a rerun copies nothing twice
+        columns = ", ".join(MESSAGE_COPY_COLUMNS)
+        table = Message._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE chat_message_copy (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            with cursor.cursor.copy(f"COPY chat_message_copy ({columns}) FROM STDIN") as copy:
+                for values in self._message_values(batch):
+                    values["metadata"] = json.dumps(values["metadata"])
+                    copy.write_row([values[column] for column in MESSAGE_COPY_COLUMNS])
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM chat_message_copy "
+                f"ON CONFLICT DO NOTHING RETURNING blob_id"
+            )
+            inserted_blobs = [row[0] for row in cursor.fetchall()]
+        self._reference_blobs(inserted_blobs)
+
+    def _new_message_values(self, batch) -> List[dict]:
+        values = list(self._message_values(batch))
+        existing = set(Message.objects.filter(id__in=[row["id"] for row in values]).values_list("id", flat=True))
+        return [row for row in values if row["id"] not in existing]
+
+    def _reference_blobs(self, blob_ids: Iterable) -> None:
+        # Copied messages share the legacy message's blob, so each inserted copy holds its own reference
+        add_references(Counter(str(blob_id) for blob_id in blob_ids if blob_id))
+
+    def _message_values(self, batch) -> Iterable[dict]:
+        for legacy_id, legacy_conversation_id, sender_id, content, attachment, blob_id, created, edited in batch:
+            if not attachment:
+                file_url = ""
+            elif blob_id:
+                file_url = blob_url(attachment)
+            else:
+                file_url = default_storage.url(attachment)
+            yield {
+                "id": message_uuid(legacy_id),
+                "conversation_id": conversation_uuid(legacy_conversation_id),
+                "sender_id": sender_id,
+                "message_type": MessageType.FILE if attachment else MessageType.TEXT,
+                "body": content or "",
+                "file_url": file_url,
+                "blob_id": blob_id,
+                "metadata": {"legacy_id": legacy_id},
+                "created_at": created,
+                "edited_at": edited,
+            }
+
+    def _run_stage(self, stage: str, rows, write: Callable[[Sequence[tuple]], None]) -> None:
+        checkpoint = self._checkpoint(stage)
+        # iterator() streams through a server-side cursor on PostgreSQL
+        for batch in _batched(rows.iterator(chunk_size=self.batch_size), self.batch_size):
+            started = time.monotonic()
+            with transaction.atomic():
+                write(batch)
+                checkpoint.last_legacy_id = batch[-1][0]
+                checkpoint.rows_copied += len(batch)
+                checkpoint.save(update_fields=["last_legacy_id", "rows_copied", "updated_at"])
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.report(BatchReport(
+                stage=stage,
+                rows=len(batch),
+                total_rows=checkpoint.rows_copied,
+                last_legacy_id=checkpoint.last_legacy_id,
+                rows_per_second=len(batch) / elapsed,
+            ))
+        checkpoint.completed_at = timezone.now()
+        checkpoint.save(update_fields=["completed_at", "updated_at"])
+
+    def _checkpoint(self, stage: str) -> LegacyMigrationCheckpoint:
+        checkpoint, _ = LegacyMigrationCheckpoint.objects.get_or_create(stage=stage)
+        return checkpoint
+
+
+def _batched(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,6 +1,7 @@
 import uuid
 
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
 
@@ -100,6 +101,13 @@ class Message(models.Model):
     )
     body = models.TextField(blank=True)
     file_url = models.URLField(blank=True)
+    blob = models.ForeignKey(
+        "common.Blob",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="chat_messages",
+    )
     metadata = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     edited_at = models.DateTimeField(null=True, blank=True)
@@ -143,3 +151,52 @@ class MessageRead(models.Model):
 
     def __str__(self) -> str:
         return f"{self.message_id}:{self.user_id}"
+
+
+class LegacyMigrationCheckpoint(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    stage = models.CharField(max_length=50, unique=True)
+    last_legacy_id = models.BigIntegerField(default=0)
+    rows_copied = models.BigIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.stage}:{self.last_legacy_id}"
+
+
+class ChannelGroupMembership(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    group = models.CharField(max_length=200)
+    channel = models.CharField(max_length=200)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["group", "channel"],
+                name="uniq_channel_group_membership",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["expires_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.group}:{self.channel}"
+
+
+class ChannelMessage(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    channel = models.CharField(max_length=200)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["channel", "id"]),
+            models.Index(fields=["expires_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"ChannelMessage({self.channel})"
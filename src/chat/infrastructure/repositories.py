@@ -0,0 +1,105 @@
+import uuid
+from typing import Optional
+
+from django.db.models import Q
+
+from chat.domain.entities import ChatMessage, ReadReceipt, ReadState
+from chat.domain.repositories import (
+    ChatMessageRepository,
+    ReadReceiptRepository,
+    ReadStateRepository,
+)
+from chat.infrastructure.models import ConversationParticipant as ParticipantModel
+from chat.infrastructure.models import Message as MessageModel
+from chat.infrastructure.models import MessageRead as MessageReadModel
+
+
+class DjangoChatMessageRepository(ChatMessageRepository):
+    def get_by_id(self, message_id: str) -> Optional[ChatMessage]:
+        try:
+            uuid.UUID(str(message_id))
+        except ValueError:
+            return None
+        message = MessageModel.objects.filter(pk=message_id).only(
+            "id", "conversation_id", "sender_id", "created_at"
+        ).first()
+        return self._to_entity(message) if message else None
+
+    def get_latest(self, conversation_id: str) -> Optional[ChatMessage]:
+        message = (
+            MessageModel.objects.filter(conversation_id=conversation_id)
+            .only("id", "conversation_id", "sender_id", "created_at")
+            .order_by("-created_at", "-id")
+            .first()
+        )
+        return self._to_entity(message) if message else None
+
+    def count_after(self, conversation_id: str, after: Optional[ReadState], exclude_sender_id: str) -> int:
+        # Range scan on the (conversation, created_at) index past the watermark;
+        # messages sharing its timestamp are ordered by id, as in get_latest
+        queryset = MessageModel.objects.filter(conversation_id=conversation_id)
+        if after is not None and after.last_read_at is not None:
+            queryset = queryset.filter(created_at__gte=after.last_read_at)
+            if after.last_read_message_id is not None:
+                queryset = queryset.exclude(created_at=after.last_read_at, id__lte=after.last_read_message_id)
+            else:
+                queryset = queryset.exclude(created_at=after.last_read_at)
+        return queryset.exclude(sender_id=exclude_sender_id).order_by().count()
+
+    def _to_entity(self, message: MessageModel) -> ChatMessage:
+        return ChatMessage(
+            id=str(message.pk),
+            conversation_id=str(message.conversation_id),
+            sender_id=str(message.sender_id),
+            created_at=message.created_at,
+        )
+
+
+class DjangoReadStateRepository(ReadStateRepository):
+    def get(self, conversation_id: str, user_id: str) -> Optional[ReadState]:
+        try:
+            uuid.UUID(str(conversation_id))
+        except ValueError:
+            return None
+        participant = ParticipantModel.objects.filter(
+            conversation_id=conversation_id, user_id=user_id
+        ).only("conversation_id", "user_id", "last_read_message_id", "last_read_at").first()
+        return self._to_entity(participant) if participant else None
+
+    def advance(
+        self, conversation_id: str, user_id: str, message: ChatMessage
+    ) -> ReadState:
+        # The watermark is the (created_at, id) of the newest read message, so
+        # unread counts are an exact range past it. It only ever moves forward.
+        ParticipantModel.objects.filter(
+            conversation_id=conversation_id, user_id=user_id
+        ).filter(
+            Q(last_read_at__isnull=True)
+            | Q(last_read_at__lt=message.created_at)
+            | Q(last_read_at=message.created_at, last_read_message_id__isnull=True)
+            | Q(last_read_at=message.created_at, last_read_message_id__lt=message.id)
+        ).update(
+            last_read_message_id=message.id,
+            last_read_at=message.created_at,
+        )
+        return self.get(conversation_id, user_id)
+
+    def _to_entity(self, participant: ParticipantModel) -> ReadState:
+        return ReadState(
+            conversation_id=str(participant.conversation_id),
+            user_id=str(participant.user_id),
+            last_read_message_id=(
+                str(participant.last_read_message_id) if participant.last_read_message_id else None
+            ),
+            last_read_at=participant.last_read_at,
+        )
+
+
+class DjangoReadReceiptRepository(ReadReceiptRepository):
+    def record(self, message_id: str, user_id: str) -> ReadReceipt:
+        receipt, _ = MessageReadModel.objects.get_or_create(message_id=message_id, user_id=user_id)
+        return ReadReceipt(
+            message_id=str(receipt.message_id),
+            user_id=str(receipt.user_id),
+            read_at=receipt.read_at,
+        )
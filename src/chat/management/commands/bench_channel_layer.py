@@ -0,0 +1,78 @@
+import asyncio
+import multiprocessing
+import os
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+GROUP = "bench_fanout"
+
+
+def _worker(ready, results, messages: int) -> None:
+    import django
+
+    django.setup()
+    from channels.layers import get_channel_layer
+
+    async def consume():
+        layer = get_channel_layer()
+        channel = await layer.new_channel()
+        await layer.group_add(GROUP, channel)
+        ready.put(os.getpid())
+        latencies = []
+        while len(latencies) < messages:
+            message = await layer.receive(channel)
+            latencies.append((time.time() - message["sent_at"]) * 1000)
+        await layer.group_discard(GROUP, channel)
+        await layer.close()
+        return latencies
+
+    results.put(asyncio.run(consume()))
+
+
+class Command(BaseCommand):
+    help = "Measure group_send throughput and fan-out latency across worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--messages", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        from channels.layers import get_channel_layer
+
+        workers, messages = options["workers"], options["messages"]
+        context = multiprocessing.get_context("spawn")
+        ready, results = context.Queue(), context.Queue()
+        processes = [
+            context.Process(target=_worker, args=(ready, results, messages)) for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            ready.get(timeout=60)
+
+        async def produce():
+            layer = get_channel_layer()
+            started = time.perf_counter()
+            for sequence in range(messages):
+                await layer.group_send(GROUP, {"type": "bench.message", "seq": sequence, "sent_at": time.time()})
+            return time.perf_counter() - started
+
+        send_seconds = asyncio.run(produce())
+        started = time.perf_counter()
+        latencies = []
+        for _ in processes:
+            latencies.extend(results.get(timeout=600))
+        drain_seconds = send_seconds + (time.perf_counter() - started)
+        for process in processes:
+            process.join()
+
+        latencies.sort()
+        self.stdout.write(f"workers: {workers}, messages per worker: {messages}")
+        self.stdout.write(f"group_send: {messages / send_seconds:,.0f} msg/s")
+        self.stdout.write(f"delivered: {len(latencies) / drain_seconds:,.0f} msg/s across all workers")
+        self.stdout.write(
+            f"fan-out latency: p50 {statistics.median(latencies):.1f}ms "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f}ms max {latencies[-1]:.1f}ms"
+        )
@@ -0,0 +1,61 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.infrastructure.legacy_migration import BatchReport, LegacyMessagingMigrator
+
+
+class Command(BaseCommand):
+    help = "Copy legacy messaging conversations and messages into the chat tables (resumable)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--stage",
+            choices=["all", "conversations", "messages", "read_state"],
+            default="all",
+        )
+        parser.add_argument("--no-copy", action="store_true", help="Use bulk_create even on PostgreSQL.")
+        parser.add_argument("--reset", action="store_true", help="Forget checkpoints and start over.")
+        parser.add_argument("--verify", action="store_true", help="Compare per-conversation counts afterwards.")
+        parser.add_argument("--verify-only", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            migrator = LegacyMessagingMigrator(
+                batch_size=options["batch_size"],
+                use_copy=False if options["no_copy"] else None,
+                report=self._report,
+            )
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc)) from exc
+        if options["reset"]:
+            migrator.reset()
+
+        if not options["verify_only"]:
+            stage = options["stage"]
+            if stage == "all":
+                migrator.run()
+            elif stage == "conversations":
+                migrator.copy_conversations()
+            elif stage == "messages":
+                migrator.copy_messages()
+            else:
+                migrator.copy_read_state()
+
+        if options["verify"] or options["verify_only"]:
+            mismatches = 0
+            for mismatch in migrator.verify():
+                mismatches += 1
+                self.stderr.write(
+                    f"conversation {mismatch.legacy_conversation_id}: "
+                    f"legacy={mismatch.legacy_messages} chat={mismatch.chat_messages}"
+                )
+            if mismatches:
+                raise CommandError(f"{mismatches} conversations differ between legacy and chat tables.")
+            self.stdout.write(self.style.SUCCESS("Verify pass: all conversation message counts match."))
+
+    def _report(self, report: BatchReport) -> None:
+        self.stdout.write(
+            f"[{report.stage}] +{report.rows} rows (total {report.total_rows}, "
+            f"last id {report.last_legacy_id}) {report.rows_per_second:,.0f} rows/s"
+        )
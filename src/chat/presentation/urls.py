@@ -0,0 +1,21 @@
+from django.urls import path
+
+from chat.presentation.views import ConversationReadView, ConversationUnreadView, MessageReadReceiptView
+
+urlpatterns = [
+    path(
+        "conversations/<str:conversation_id>/read/",
+        ConversationReadView.as_view(),
+        name="chat-conversation-read",
+    ),
+    path(
+        "conversations/<str:conversation_id>/unread/",
+        ConversationUnreadView.as_view(),
+        name="chat-conversation-unread",
+    ),
+    path(
+        "messages/<str:message_id>/receipts/",
+        MessageReadReceiptView.as_view(),
+        name="chat-message-receipt",
+    ),
+]
@@ -0,0 +1,85 @@
+from dataclasses import asdict
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from chat.application.dto import (
+    ChatError,
+    GetUnreadCountRequest,
+    MarkConversationReadRequest,
+    RecordReadReceiptRequest,
+)
+from chat.application.usecases import (
+    GetUnreadCountUseCase,
+    MarkConversationReadUseCase,
+    RecordReadReceiptUseCase,
+)
+from chat.infrastructure.repositories import (
+    DjangoChatMessageRepository,
+    DjangoReadReceiptRepository,
+    DjangoReadStateRepository,
+)
+
+
+class ConversationReadView(APIView):
+    """Advance the caller's read watermark to a message, or to the latest one."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, conversation_id: str):
+        message_id = request.data.get("messageId") if isinstance(request.data, dict) else None
+        usecase = MarkConversationReadUseCase(DjangoChatMessageRepository(), DjangoReadStateRepository())
+        try:
+            state = usecase.execute(
+                MarkConversationReadRequest(
+                    user_id=str(request.user.id),
+                    conversation_id=str(conversation_id),
+                    message_id=str(message_id) if message_id else None,
+                )
+            )
+        except ChatError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response({"data": asdict(state), "meta": {}})
+
+
+class ConversationUnreadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, conversation_id: str):
+        usecase = GetUnreadCountUseCase(DjangoChatMessageRepository(), DjangoReadStateRepository())
+        try:
+            result = usecase.execute(
+                GetUnreadCountRequest(user_id=str(request.user.id), conversation_id=str(conversation_id))
+            )
+        except ChatError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response({"data": asdict(result), "meta": {}})
+
+
+class MessageReadReceiptView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, message_id: str):
+        usecase = RecordReadReceiptUseCase(
+            DjangoChatMessageRepository(),
+            DjangoReadStateRepository(),
+            DjangoReadReceiptRepository(),
+        )
+        try:
+            receipt = usecase.execute(
+                RecordReadReceiptRequest(user_id=str(request.user.id), message_id=str(message_id))
+            )
+        except ChatError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response({"data": asdict(receipt), "meta": {}}, status=201)
+
+
+def _error_response(code: str, message: str, details: dict, status: int):
+    return Response(
+        {"error": {"code": code, "message": message, "details": details or {}}},
+        status=status,
+    )
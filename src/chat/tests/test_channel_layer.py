@@ -0,0 +1,36 @@
+import asyncio
+import unittest
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import TransactionTestCase
+
+from chat.infrastructure.channel_layer import DatabaseChannelLayer
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "LISTEN/NOTIFY needs PostgreSQL")
+class DatabaseChannelLayerNotifyTests(TransactionTestCase):
+    def test_notify_wakes_waiting_receive(self):
+        async_to_sync(self._notify_wakes_waiting_receive)()
+
+    async def _notify_wakes_waiting_receive(self):
+        # listen_timeout far exceeds the wait below, so only a NOTIFY from the
+        # other layer (a separate process in production) can wake the receiver
+        receiver = DatabaseChannelLayer(listen_timeout=60, db_threads=1)
+        sender = DatabaseChannelLayer(listen_timeout=60, db_threads=1)
+        channel = await receiver.new_channel()
+        try:
+            receiving = asyncio.ensure_future(receiver.receive(channel))
+            await asyncio.wait_for(receiver._listening.wait(), timeout=5)
+
+            await sender.send(channel, {"type": "chat.message", "text": "hi"})
+
+            message = await asyncio.wait_for(receiving, timeout=5)
+            self.assertEqual(message, {"type": "chat.message", "text": "hi"})
+        finally:
+            await receiver.close()
+            await sender.close()
+            # Layer threads keep their connections open; release them so the
+            # test database can be dropped
+            await receiver._db(connection.close)
+            await sender._db(connection.close)
@@ -0,0 +1,349 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core import serializers
+from django.db import DataError, IntegrityError, close_old_connections, models, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class FlushListenerError(Exception):
+    """A listener running inside a flush transaction failed."""
+
+
+@dataclass(frozen=True)
+class WriterMetrics:
+    name: str
+    depth: int
+    capacity: int
+    enqueued: int
+    flushed: int
+    flushes: int
+    failed_flushes: int
+    blocked_enqueues: int
+    dropped: int
+    dead_lettered: int
+    high_water: int
+    last_flush_ms: float
+    last_flush_rows: int
+
+
+class BufferedBulkWriter:
+    """Bounded in-process buffer of unsaved model instances.
+
+    ``enqueue`` only appends to a deque; a background thread writes the
+    buffer with one ``bulk_create`` per model once ``flush_size`` rows are
+    waiting or ``flush_interval`` seconds have passed. When the buffer is
+    full the producer wakes that thread and waits, up to ``enqueue_timeout``
+    seconds, for room, so producers slow down instead of rows being lost.
+    Flushes never run on the producer's thread or inside its transaction.
+
+    A batch rejected for its content (an integrity or data error) is split
+    until the offending rows are isolated; those go to ``WriterDeadLetter``
+    and the rest are written. Other failures requeue the whole batch.
+
+    Fields with ``auto_now_add`` are stamped at flush time, at most
+    ``flush_interval`` after the event.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int = 10000,
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        flush_on_request_end: bool = True,
+        enqueue_timeout: float = 5.0,
+    ) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.flush_on_request_end = flush_on_request_end
+        self.enqueue_timeout = enqueue_timeout
+        self._buffer: Deque[models.Model] = deque()
+        self._lock = threading.Lock()
+        self._room = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._listeners: List[Callable[[List[models.Model]], None]] = []
+        self._transaction_listeners: List[Callable[[List[models.Model]], None]] = []
+
+    def add_flush_listener(self, listener: Callable[[List[models.Model]], None], in_transaction: bool = False) -> None:
+        """Call ``listener`` with every batch after it has been written.
+
+        With ``in_transaction`` the listener runs inside the insert's
+        transaction, so its own writes commit or roll back with the rows; if it
+        fails, the rows are requeued.
+        """
+        listeners = self._transaction_listeners if in_transaction else self._listeners
+        if listener not in listeners:
+            listeners.append(listener)
+
+    def enqueue(self, instance: models.Model) -> None:
+        self.enqueue_many([instance])
+
+    def enqueue_many(self, instances: List[models.Model]) -> bool:
+        """Queue all of ``instances`` or none of them.
+
+        The whole batch waits for room under one ``enqueue_timeout``
+        deadline. Returns False, dropping the batch, if the buffer is still
+        too full when that deadline passes.
+        """
+        if not instances:
+            return True
+        if len(instances) > self.capacity:
+            raise ValueError(f"{self.name}: a batch of {len(instances)} exceeds the capacity of {self.capacity}")
+        with self._lock:
+            self._ensure_thread_locked()
+            if len(self._buffer) + len(instances) > self.capacity and not self._closed:
+                # Backpressure: the producer waits for the writer thread
+                self._counters["blocked_enqueues"] += 1
+                deadline = time.monotonic() + self.enqueue_timeout
+                while len(self._buffer) + len(instances) > self.capacity and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["dropped"] += len(instances)
+                        logger.error(
+                            "%s: buffer still full after %.1fs; dropped %d rows",
+                            self.name,
+                            self.enqueue_timeout,
+                            len(instances),
+                        )
+                        return False
+                    self._wakeup.set()
+                    self._room.wait(min(remaining, self.flush_interval))
+                    self._ensure_thread_locked()
+            self._buffer.extend(instances)
+            depth = len(self._buffer)
+            self._counters["enqueued"] += len(instances)
+            self._counters["high_water"] = max(self._counters["high_water"], depth)
+        if depth >= self.flush_size:
+            self._wakeup.set()
+        return True
+
+    def wake(self) -> None:
+        """Ask the writer thread to flush now rather than at the next interval."""
+        self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write the buffer on the calling thread.
+
+        Meant for the writer thread and for shutdown; never call it from a
+        request or inside a transaction, which the inserts would join.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._buffer)
+                self._buffer.clear()
+                self._room.notify_all()
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            written, rejected, unwritten = self._write(batch)
+            if unwritten:
+                self._count(failed_flushes=1)
+                self._requeue(unwritten)
+            if rejected:
+                self._dead_letter(rejected)
+            if not written:
+                return 0
+            with self._lock:
+                self._counters["flushes"] += 1
+                self._counters["flushed"] += len(written)
+                self._counters["last_flush_ms"] = (time.perf_counter() - started) * 1000
+                self._counters["last_flush_rows"] = len(written)
+            for listener in self._listeners:
+                try:
+                    listener(written)
+                except Exception:
+                    logger.exception("%s: flush listener %r failed", self.name, listener)
+            return len(written)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def metrics(self) -> WriterMetrics:
+        with self._lock:
+            counters = defaultdict(float, self._counters)
+            depth = len(self._buffer)
+        return WriterMetrics(
+            name=self.name,
+            depth=depth,
+            capacity=self.capacity,
+            enqueued=int(counters["enqueued"]),
+            flushed=int(counters["flushed"]),
+            flushes=int(counters["flushes"]),
+            failed_flushes=int(counters["failed_flushes"]),
+            blocked_enqueues=int(counters["blocked_enqueues"]),
+            dropped=int(counters["dropped"]),
+            dead_lettered=int(counters["dead_lettered"]),
+            high_water=int(counters["high_water"]),
+            last_flush_ms=counters["last_flush_ms"],
+            last_flush_rows=int(counters["last_flush_rows"]),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._room.notify_all()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval * 5)
+        self.flush()
+
+    def _write(
+        self, batch: List[models.Model]
+    ) -> Tuple[List[models.Model], List[Tuple[models.Model, Exception]], List[models.Model]]:
+        """Return the rows written, the rows rejected with their errors, and the rows to retry."""
+        by_model: Dict[type, List[models.Model]] = defaultdict(list)
+        for instance in batch:
+            by_model[type(instance)].append(instance)
+        written: List[models.Model] = []
+        rejected: List[Tuple[models.Model, Exception]] = []
+        pending = list(by_model.items())
+        while pending:
+            model_class, instances = pending.pop(0)
+            try:
+                with transaction.atomic():
+                    model_class.objects.bulk_create(instances, batch_size=self.flush_size)
+                    self._notify_in_transaction(instances)
+            except (IntegrityError, DataError) as exc:
+                if len(instances) == 1:
+                    rejected.append((instances[0], exc))
+                    continue
+                # Halve until the bad rows are isolated: about log2(n) inserts per bad row
+                middle = len(instances) // 2
+                pending[:0] = [(model_class, instances[:middle]), (model_class, instances[middle:])]
+                continue
+            except Exception:
+                unwritten = instances + [row for _, rows in pending for row in rows]
+                logger.exception("%s: flush of %d rows failed; requeueing", self.name, len(unwritten))
+                return written, rejected, unwritten
+            written.extend(instances)
+        return written, rejected, []
+
+    def _notify_in_transaction(self, instances: List[models.Model]) -> None:
+        for listener in self._transaction_listeners:
+            try:
+                listener(instances)
+            except Exception as exc:
+                # Never mistaken for a row error: the whole chunk is retried
+                raise FlushListenerError(f"{self.name}: flush listener {listener!r} failed") from exc
+
+    def _dead_letter(self, rejected: List[Tuple[models.Model, Exception]]) -> None:
+        from common.models import WriterDeadLetter
+
+        letters = [
+            WriterDeadLetter(
+                writer=self.name,
+                model=instance._meta.label,
+                payload=serializers.serialize("json", [instance]),
+                error=str(exc)[:2000],
+            )
+            for instance, exc in rejected
+        ]
+        self._count(dead_lettered=len(letters))
+        try:
+            WriterDeadLetter.objects.bulk_create(letters)
+        except Exception:
+            logger.exception("%s: could not store %d dead letters", self.name, len(letters))
+            for letter in letters:
+                logger.error("%s: rejected %s row %s (%s)", self.name, letter.model, letter.payload, letter.error)
+            return
+        logger.error("%s: %d rows rejected and dead-lettered", self.name, len(letters))
+
+    def _requeue(self, batch: List[models.Model]) -> None:
+        with self._lock:
+            room = max(self.capacity - len(self._buffer), 0)
+            kept = batch[-room:] if room else []
+            self._buffer.extendleft(reversed(kept))
+            dropped = len(batch) - len(kept)
+            self._counters["dropped"] += dropped
+        if dropped:
+            logger.error("%s: dropped %d rows after a failed flush", self.name, dropped)
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for key, value in increments.items():
+                self._counters[key] += value
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("%s: flush failed", self.name)
+            finally:
+                # After the listeners, which may use the connection too
+                close_old_connections()
+
+
+_writers: Dict[str, BufferedBulkWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(name: str, **options) -> BufferedBulkWriter:
+    """Return the process-wide writer registered under ``name``.
+
+    Options default to ``settings.BUFFERED_WRITERS[name]``.
+    """
+    with _writers_lock:
+        writer = _writers.get(name)
+        if writer is None:
+            configured = getattr(settings, "BUFFERED_WRITERS", {}).get(name, {})
+            writer = BufferedBulkWriter(name, **{**configured, **options})
+            _writers[name] = writer
+        return writer
+
+
+def record(instance: models.Model) -> None:
+    """Queue an audit row (e.g. an unsaved ``AuditLog``) for a buffered write."""
+    get_writer("audit").enqueue(instance)
+
+
+def flush_all() -> None:
+    for writer in list(_writers.values()):
+        writer.flush()
+
+
+def _flush_on_request_end(**kwargs) -> None:
+    # Only a signal: the request thread never writes another thread's rows
+    for writer in list(_writers.values()):
+        if writer.flush_on_request_end:
+            writer.wake()
+
+
+def close_all() -> None:
+    for writer in list(_writers.values()):
+        writer.close()
+
+
+def all_metrics() -> List[WriterMetrics]:
+    return [writer.metrics() for writer in list(_writers.values())]
+
+
+def install() -> None:
+    """Wake the writers after each request has been answered, and flush on interpreter shutdown."""
+    from django.core.signals import request_finished
+
+    if getattr(settings, "BUFFERED_WRITERS_FLUSH_ON_REQUEST_END", True):
+        request_finished.connect(_flush_on_request_end, dispatch_uid="common.audit.flush_on_request_end")
+    atexit.register(close_all)
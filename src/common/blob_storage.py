@@ -0,0 +1,257 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+from django.utils.module_loading import import_string
+
+DEFAULT_BLOB_STORAGE = {
+    "BACKEND": "django.core.files.storage.FileSystemStorage",
+    "OPTIONS": {},
+}
+# Objects larger than this are spooled to disk when assembled or hashed
+SPOOL_SIZE = 8 * 1024 * 1024
+# Read-ahead for object store reads; each seek costs one ranged GET
+READ_BUFFER_SIZE = 1024 * 1024
+DELETE_BATCH_SIZE = 1000
+
+_storage: Optional[Storage] = None
+_storage_lock = threading.Lock()
+
+
+def blob_name(digest: str, extension: str = "") -> str:
+    """Content address with two fanout levels, e.g. ``blobs/ab/cd/abcd….pdf``.
+
+    The fanout keeps directory sizes bounded on local filesystems and spreads
+    keys across prefixes on object stores.
+    """
+    return f"blobs/{digest[:2]}/{digest[2:4]}/{digest}{extension.lower()[:10]}"
+
+
+def get_blob_storage() -> Storage:
+    """Return the process-wide storage configured by ``settings.BLOB_STORAGE``."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            config = getattr(settings, "BLOB_STORAGE", DEFAULT_BLOB_STORAGE)
+            _storage = import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+        return _storage
+
+
+def blob_url(name: str) -> str:
+    return get_blob_storage().url(name)
+
+
+@deconstructible(path="common.blob_storage.S3CompatibleStorage")
+class S3CompatibleStorage(Storage):
+    """Storage over the subset of the S3 client API the blob store needs.
+
+    ``client`` is an object with ``upload_fileobj``, ``get_object``,
+    ``head_object``, ``list_objects_v2``, ``delete_objects`` and
+    ``generate_presigned_url``: a boto3 S3 client (built from
+    ``client_options`` when ``client`` is omitted), an instance, or the
+    dotted path of a stand-in such as ``LocalS3Client``.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        client=None,
+        client_options: Optional[dict] = None,
+        url_expiry: int = 3600,
+    ) -> None:
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.url_expiry = url_expiry
+        if isinstance(client, str):
+            client = import_string(client)(**(client_options or {}))
+        self.client = client if client is not None else _boto3_client(client_options or {})
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    def _open(self, name: str, mode: str = "rb") -> File:
+        # Seekable without downloading: a range request only fetches its bytes
+        reader = _ObjectReader(self.client, self.bucket, self._key(name))
+        return File(io.BufferedReader(reader, buffer_size=READ_BUFFER_SIZE), name=name)
+
+    def _save(self, name: str, content) -> str:
+        if hasattr(content, "seek"):
+            content.seek(0)
+        self.client.upload_fileobj(content, self.bucket, self._key(name))
+        return name
+
+    def get_available_name(self, name: str, max_length: Optional[int] = None) -> str:
+        # Keys are content addresses: rewriting one stores identical bytes
+        return name
+
+    def exists(self, name: str) -> bool:
+        key = self._key(name)
+        response = self.client.list_objects_v2(Bucket=self.bucket, Prefix=key, MaxKeys=1)
+        return any(item["Key"] == key for item in response.get("Contents", []))
+
+    def size(self, name: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=self._key(name))["ContentLength"]
+
+    def url(self, name: str) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._key(name)},
+            ExpiresIn=self.url_expiry,
+        )
+
+    def delete(self, name: str) -> None:
+        self.delete_many([name])
+
+    def delete_many(self, names: Iterable[str]) -> None:
+        keys = [self._key(name) for name in names]
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in keys[start:start + DELETE_BATCH_SIZE]], "Quiet": True},
+            )
+
+
+class _ObjectReader(io.RawIOBase):
+    """Seekable raw stream over one object.
+
+    Reads stream a ``Range: bytes=<position>-`` GET; seeking drops it and the
+    next read starts a new one from the new position.
+    """
+
+    def __init__(self, client, bucket: str, key: str) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self._position = 0
+        self._size: Optional[int] = None
+        self._body = None
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            self._size = self.client.head_object(Bucket=self.bucket, Key=self.key)["ContentLength"]
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        if offset != self._position:
+            self._drop_body()
+            self._position = offset
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        if self._body is None:
+            if self._position and self._position >= self.size:
+                return 0
+            options = {"Range": f"bytes={self._position}-"} if self._position else {}
+            self._body = self.client.get_object(Bucket=self.bucket, Key=self.key, **options)["Body"]
+        data = self._body.read(len(buffer))
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        self._drop_body()
+        super().close()
+
+    def _drop_body(self) -> None:
+        if self._body is not None:
+            self._body.close()
+            self._body = None
+
+
+class LocalS3Client:
+    """Directory-backed stand-in for the S3 client calls S3CompatibleStorage makes.
+
+    Buckets are directories under ``root``; uploads are written to a
+    temporary file and renamed, so readers never see a partial object.
+    """
+
+    def __init__(self, root: str, base_url: str = "") -> None:
+        self.root = os.path.abspath(root)
+        self.base_url = base_url
+
+    def upload_fileobj(self, Fileobj, Bucket: str, Key: str) -> None:
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".upload-")
+        try:
+            with os.fdopen(handle, "wb") as target:
+                shutil.copyfileobj(Fileobj, target)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def get_object(self, Bucket: str, Key: str, Range: str = "") -> dict:
+        body = open(self._path(Bucket, Key), "rb")
+        if Range:
+            # Only the open-ended "bytes=<start>-" form S3CompatibleStorage sends
+            body.seek(int(Range[len("bytes="):].rstrip("-")))
+        return {"Body": body}
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        return {"ContentLength": os.path.getsize(self._path(Bucket, Key))}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", MaxKeys: int = 1000) -> dict:
+        directory, _, start = Prefix.rpartition("/")
+        base = self._path(Bucket, directory) if directory else os.path.join(self.root, Bucket)
+        try:
+            names = sorted(name for name in os.listdir(base) if name.startswith(start) and not name.startswith("."))
+        except FileNotFoundError:
+            names = []
+        keys = [f"{directory}/{name}" if directory else name for name in names]
+        return {"Contents": [{"Key": key} for key in keys[:MaxKeys] if os.path.isfile(self._path(Bucket, key))]}
+
+    def delete_objects(self, Bucket: str, Delete: dict) -> dict:
+        deleted = []
+        for item in Delete["Objects"]:
+            try:
+                os.remove(self._path(Bucket, item["Key"]))
+            except FileNotFoundError:
+                pass
+            deleted.append({"Key": item["Key"]})
+        return {"Deleted": deleted}
+
+    def generate_presigned_url(self, ClientMethod: str, Params: dict, ExpiresIn: int = 3600) -> str:
+        return f"{self.base_url}{Params['Bucket']}/{Params['Key']}"
+
+    def _path(self, bucket: str, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, bucket, *key.split("/")))
+        if not path.startswith(os.path.join(self.root, bucket) + os.sep):
+            raise ValueError(f"Key {key!r} escapes the bucket")
+        return path
+
+
+def _boto3_client(options: dict):
+    try:
+        import boto3
+    except ImportError as exc:
+        raise ImproperlyConfigured(
+            "S3CompatibleStorage needs boto3 installed, or a client passed in explicitly."
+        ) from exc
+    return boto3.client("s3", **options)
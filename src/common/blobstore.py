@@ -0,0 +1,163 @@
+import hashlib
+import logging
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import BinaryIO, Dict, List, Optional
+
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from common.blob_storage import SPOOL_SIZE, blob_name, get_blob_storage
+from common.models import Blob
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 1024 * 1024
+# Unreferenced blobs are kept this long so a quick re-upload or re-attach can revive them
+GC_GRACE = timedelta(hours=1)
+
+
+@dataclass
+class GarbageCollectionResult:
+    blobs: int = 0
+    bytes: int = 0
+
+
+def store_file(content: BinaryIO, extension: str = "") -> Blob:
+    """Store ``content`` under its SHA-256 and return its Blob with one reference taken."""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+        hasher = hashlib.sha256()
+        size = 0
+        for block in iter(lambda: content.read(READ_SIZE), b""):
+            hasher.update(block)
+            spool.write(block)
+            size += len(block)
+        spool.seek(0)
+        return store_hashed(spool, hasher.hexdigest(), size, extension)
+
+
+def store_path(path: str, digest: str, size: int, extension: str = "") -> Blob:
+    """Like ``store_file`` for a local file whose digest is already known."""
+    with open(path, "rb") as stored:
+        return store_hashed(stored, digest, size, extension)
+
+
+def store_hashed(content: BinaryIO, digest: str, size: int, extension: str = "") -> Blob:
+    storage = get_blob_storage()
+    existing = Blob.objects.filter(sha256=digest).first()
+    if existing is not None and add_reference(existing):
+        # A collection that failed after deleting files leaves rows without bytes
+        if not storage.exists(existing.file.name):
+            content.seek(0)
+            storage.save(existing.file.name, File(content))
+        logger.info("Deduplicated %s bytes onto blob %s", size, digest)
+        return existing
+
+    name = blob_name(digest, extension)
+    if not (storage.exists(name) and storage.size(name) == size):
+        # Missing, or left truncated by an interrupted write
+        storage.delete(name)
+        content.seek(0)
+        saved = storage.save(name, File(content))
+        if saved != name:
+            # A concurrent store wrote the same bytes first
+            storage.delete(saved)
+
+    blob = Blob(sha256=digest, size=size, file=name, ref_count=1)
+    try:
+        with transaction.atomic():
+            blob.save()
+    except IntegrityError:
+        # Another store of the same content created the row first
+        return store_hashed(content, digest, size, extension)
+    return blob
+
+
+def add_reference(blob: Blob) -> bool:
+    """Take a reference; False if the blob was collected meanwhile."""
+    return Blob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1) == 1
+
+
+def add_references(counts: Dict[str, int]) -> None:
+    """Take several references at once, e.g. for a batch of copied rows."""
+    for blob_id, count in Counter(counts).items():
+        if blob_id and count:
+            Blob.objects.filter(pk=blob_id).update(ref_count=F("ref_count") + count)
+
+
+def release_reference(blob_id: Optional[str]) -> None:
+    if not blob_id:
+        return
+    Blob.objects.filter(pk=blob_id, ref_count__gt=0).update(
+        ref_count=F("ref_count") - 1,
+        released_at=timezone.now(),
+    )
+
+
+def release_references(counts: Dict[str, int]) -> None:
+    """Release several references at once, the counterpart of ``add_references``."""
+    for blob_id, count in Counter(counts).items():
+        if blob_id and count:
+            Blob.objects.filter(pk=blob_id, ref_count__gt=0).update(
+                ref_count=Greatest(F("ref_count") - count, 0),
+                released_at=timezone.now(),
+            )
+
+
+def release_on_delete(sender, instance, **kwargs) -> None:
+    """post_delete receiver for models with a ``blob`` foreign key."""
+    release_reference(instance.blob_id)
+
+
+def collect_garbage(batch_size: int = 500, grace: timedelta = GC_GRACE) -> GarbageCollectionResult:
+    """Delete unreferenced blobs and their files, one locked batch per transaction.
+
+    Files are deleted while the rows are still locked: a concurrent store of
+    the same content waits on the lock, then finds no row and writes the
+    file again.
+    """
+    result = GarbageCollectionResult()
+    storage = get_blob_storage()
+    cutoff = timezone.now() - grace
+    candidates = Blob.objects.filter(
+        Q(released_at__lt=cutoff) | Q(released_at__isnull=True, created_at__lt=cutoff),
+        ref_count=0,
+    )
+    # Rows still pointed at (after a count drifted) are never collected
+    for relation in _reverse_relations():
+        candidates = candidates.filter(
+            ~Exists(relation.related_model._base_manager.filter(**{relation.field.name: OuterRef("pk")}))
+        )
+
+    while True:
+        with transaction.atomic():
+            batch = list(candidates.select_for_update(skip_locked=True).order_by("created_at")[:batch_size])
+            if batch:
+                _delete_files(storage, [blob.file.name for blob in batch])
+                Blob.objects.filter(pk__in=[blob.pk for blob in batch]).delete()
+        result.blobs += len(batch)
+        result.bytes += sum(blob.size for blob in batch)
+        if len(batch) < batch_size:
+            return result
+
+
+def _reverse_relations() -> List:
+    return [
+        field
+        for field in Blob._meta.get_fields(include_hidden=True)
+        if field.is_relation and field.auto_created and not field.concrete
+    ]
+
+
+def _delete_files(storage, names: List[str]) -> None:
+    delete_many = getattr(storage, "delete_many", None)
+    if delete_many is not None:
+        delete_many(names)
+        return
+    for name in names:
+        storage.delete(name)
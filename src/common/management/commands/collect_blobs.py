@@ -0,0 +1,30 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from common.blobstore import GC_GRACE, collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Delete blobs no longer referenced by any record, message or upload, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--grace-minutes",
+            type=float,
+            default=GC_GRACE.total_seconds() / 60,
+            help="Keep unreferenced blobs at least this long.",
+        )
+        parser.add_argument("--interval", type=float, default=0, help="Keep collecting every N seconds.")
+
+    def handle(self, *args, **options):
+        grace = timedelta(minutes=options["grace_minutes"])
+        while True:
+            result = collect_garbage(batch_size=options["batch_size"], grace=grace)
+            if result.blobs:
+                self.stdout.write(f"Collected {result.blobs} blobs ({result.bytes} bytes).")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,57 @@
+import uuid
+
+from django.db import models
+
+from common.blob_storage import get_blob_storage
+
+
+class Blob(models.Model):
+    """A stored file, shared by every row that references the same content.
+
+    Managed through ``common.blobstore``: ``ref_count`` counts the rows and
+    pending uploads holding the blob, and blobs back at zero are removed by
+    ``collect_blobs`` after a grace period.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    file = models.FileField(upload_to="blobs/%Y/%m/", storage=get_blob_storage, max_length=255)
+    ref_count = models.PositiveIntegerField(default=0)
+    released_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Garbage collection candidates only
+            models.Index(
+                fields=["created_at"],
+                name="blob_unreferenced_idx",
+                condition=models.Q(ref_count=0),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Blob({self.sha256})"
+
+
+class WriterDeadLetter(models.Model):
+    """A row a buffered writer could not insert, kept for inspection and replay.
+
+    ``payload`` is the instance serialized with ``django.core.serializers``.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    writer = models.CharField(max_length=100)
+    model = models.CharField(max_length=100)
+    payload = models.TextField()
+    error = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["writer", "created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"WriterDeadLetter({self.writer}, {self.model})"
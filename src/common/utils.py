@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+
+
+@contextmanager
+def preserve_timestamps(*model_classes):
+    """Let bulk_create keep supplied auto_now/auto_now_add values.
+
+    The field flags are process-wide, so only use this in management
+    commands and batch jobs, never in request handlers.
+    """
+    fields = [
+        field
+        for model_class in model_classes
+        for field in model_class._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1 @@
+"""Dashboard app package."""
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from dashboard.domain.entities import TimelineEntry
+
+
+@dataclass(frozen=True)
+class PatientTimelineRequest:
+    user_id: str
+    user_role: str
+    patient_id: str
+    limit: int = 50
+    cursor: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PatientTimelineResult:
+    entries: List[TimelineEntry]
+    next_cursor: Optional[str]
+
+
+class DashboardError(Exception):
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        details: Optional[dict] = None,
+        status: int = 400,
+    ) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details or {}
+        self.status = status
@@ -0,0 +1,5 @@
+from dashboard.application.usecases.patient_timeline import GetPatientTimelineUseCase
+
+__all__ = [
+    "GetPatientTimelineUseCase",
+]
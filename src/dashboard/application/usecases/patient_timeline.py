@@ -0,0 +1,66 @@
+import base64
+import heapq
+import uuid
+from datetime import datetime
+from itertools import islice
+from typing import Optional
+
+from dashboard.application.dto import DashboardError, PatientTimelineRequest, PatientTimelineResult
+from dashboard.domain.entities import TimelineCursor
+from dashboard.domain.repositories import PatientTimelineRepository
+
+
+class GetPatientTimelineUseCase:
+    def __init__(self, timeline_repository: PatientTimelineRepository) -> None:
+        self.timeline_repository = timeline_repository
+
+    def execute(self, request: PatientTimelineRequest) -> PatientTimelineResult:
+        try:
+            uuid.UUID(request.patient_id)
+        except ValueError:
+            raise DashboardError(
+                code="patient_not_found",
+                message="Patient not found.",
+                details={"patientId": request.patient_id},
+                status=404,
+            )
+        if not self.timeline_repository.can_view(request.user_id, request.user_role, request.patient_id):
+            raise DashboardError(
+                code="forbidden",
+                message="You cannot view this patient's timeline.",
+                details={"patientId": request.patient_id},
+                status=403,
+            )
+        before = None
+        if request.cursor:
+            before = decode_cursor(request.cursor)
+            if before is None:
+                raise DashboardError(code="invalid_cursor", message="Invalid cursor.", details={}, status=400)
+
+        # Each source is already index-ordered; the heap only ever holds one head per source
+        sources = self.timeline_repository.sources(
+            request.user_id, request.user_role, request.patient_id, before, chunk_size=request.limit + 1
+        )
+        merged = heapq.merge(*sources, key=lambda entry: entry.sort_key, reverse=True)
+        entries = list(islice(merged, request.limit + 1))
+
+        next_cursor = None
+        if len(entries) > request.limit:
+            entries = entries[: request.limit]
+            last = entries[-1]
+            next_cursor = encode_cursor(TimelineCursor(occurred_at=last.occurred_at, kind=last.kind, id=last.id))
+        return PatientTimelineResult(entries=entries, next_cursor=next_cursor)
+
+
+def encode_cursor(cursor: TimelineCursor) -> str:
+    raw = f"{cursor.occurred_at.isoformat()}|{cursor.kind}|{cursor.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> Optional[TimelineCursor]:
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+        occurred_at, kind, entry_id = raw.split("|", 2)
+        return TimelineCursor(occurred_at=datetime.fromisoformat(occurred_at), kind=kind, id=str(uuid.UUID(entry_id)))
+    except (ValueError, UnicodeDecodeError):
+        return None
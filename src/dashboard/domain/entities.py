@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class TimelineCursor:
+    occurred_at: datetime
+    kind: str
+    id: str
+
+
+@dataclass(frozen=True)
+class TimelineEntry:
+    kind: str
+    id: str
+    occurred_at: datetime
+    title: str
+    details: dict = field(default_factory=dict)
+
+    @property
+    def sort_key(self):
+        return (self.occurred_at, self.kind, self.id)
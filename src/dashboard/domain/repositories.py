@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
+
+from dashboard.domain.entities import TimelineCursor, TimelineEntry
+
+
+class PatientTimelineRepository(ABC):
+    @abstractmethod
+    def can_view(self, user_id: str, user_role: str, patient_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def sources(
+        self, user_id: str, user_role: str, patient_id: str, before: Optional[TimelineCursor], chunk_size: int
+    ) -> List[Iterator[TimelineEntry]]:
+        """Lazy iterators, each yielding entries newest first by (occurred_at, kind, id).
+
+        Messages are limited to conversations the viewer may read.
+        """
+        raise NotImplementedError
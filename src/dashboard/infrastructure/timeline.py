@@ -0,0 +1,181 @@
+from typing import Callable, Iterator, List, Optional
+
+from django.db.models import Q, QuerySet
+
+from appointments.infrastructure.models import Appointment
+from chat.infrastructure.models import ConversationParticipant, Message
+from dashboard.domain.entities import TimelineCursor, TimelineEntry
+from dashboard.domain.repositories import PatientTimelineRepository
+from records.infrastructure.models import MedicalRecord, MedicalRecordStatus
+from video.infrastructure.models import VideoSession
+
+PREVIEW_LENGTH = 140
+# The merge primes every stream, but most contribute few rows to a page
+INITIAL_CHUNK = 4
+
+
+class DjangoPatientTimelineRepository(PatientTimelineRepository):
+    """One keyset-paged query stream per source, each walking an index newest first.
+
+    Appointments use (patient, start_time), medical records (patient,
+    created_at), and video sessions are ordered by their appointment's
+    start_time so they ride the appointment index too. Messages get one
+    stream per conversation, each walking (conversation, created_at); other
+    viewers only see the conversations they take part in.
+    """
+
+    def can_view(self, user_id: str, user_role: str, patient_id: str) -> bool:
+        if user_role == "admin" or user_id == patient_id:
+            return True
+        if user_role == "doctor":
+            return Appointment.objects.filter(doctor_id=user_id, patient_id=patient_id).exists()
+        return False
+
+    def sources(
+        self, user_id: str, user_role: str, patient_id: str, before: Optional[TimelineCursor], chunk_size: int
+    ) -> List[Iterator[TimelineEntry]]:
+        conversation_ids = ConversationParticipant.objects.filter(user_id=patient_id).values("conversation_id")
+        if user_role != "admin" and user_id != patient_id:
+            conversation_ids = conversation_ids.filter(
+                conversation_id__in=ConversationParticipant.objects.filter(user_id=user_id).values("conversation_id")
+            )
+        streams = [
+            _stream(
+                Appointment.objects.filter(patient_id=patient_id),
+                "start_time",
+                "appointment",
+                before,
+                chunk_size,
+                _appointment_entry,
+            ),
+            _stream(
+                MedicalRecord.objects.filter(patient_id=patient_id).exclude(status=MedicalRecordStatus.DELETED),
+                "created_at",
+                "medical_record",
+                before,
+                chunk_size,
+                _record_entry,
+            ),
+            _stream(
+                VideoSession.objects.filter(appointment__patient_id=patient_id).select_related("appointment"),
+                "appointment__start_time",
+                "video_session",
+                before,
+                chunk_size,
+                _video_entry,
+            ),
+        ]
+        # A single stream over all conversations would sort every message of
+        # the patient on each page; per conversation the index gives the order
+        for conversation_id in conversation_ids.values_list("conversation_id", flat=True):
+            streams.append(
+                _stream(
+                    Message.objects.filter(conversation_id=conversation_id),
+                    "created_at",
+                    "message",
+                    before,
+                    chunk_size,
+                    _message_entry,
+                )
+            )
+        return streams
+
+
+def _stream(
+    queryset: QuerySet,
+    time_field: str,
+    kind: str,
+    before: Optional[TimelineCursor],
+    chunk_size: int,
+    to_entry: Callable[[object], TimelineEntry],
+) -> Iterator[TimelineEntry]:
+    """Yield entries newest first, querying only on demand.
+
+    The first query reads ``INITIAL_CHUNK`` rows and each later one twice as
+    many, up to ``chunk_size``, so streams that lose the merge early load
+    little.
+    """
+    queryset = queryset.order_by(f"-{time_field}", "-id")
+    page = queryset.filter(_after_cursor(time_field, kind, before)) if before else queryset
+    size = min(INITIAL_CHUNK, chunk_size)
+    while True:
+        rows = list(page[:size])
+        entry = None
+        for row in rows:
+            entry = to_entry(row)
+            yield entry
+        if len(rows) < size or entry is None:
+            return
+        size = min(size * 2, chunk_size)
+        page = queryset.filter(
+            Q(**{f"{time_field}__lt": entry.occurred_at}) | Q(**{time_field: entry.occurred_at, "id__lt": entry.id})
+        )
+
+
+def _after_cursor(time_field: str, kind: str, before: TimelineCursor) -> Q:
+    """Rows of ``kind`` that sort after the cursor in (occurred_at, kind, id) DESC order."""
+    if kind < before.kind:
+        return Q(**{f"{time_field}__lte": before.occurred_at})
+    if kind > before.kind:
+        return Q(**{f"{time_field}__lt": before.occurred_at})
+    return Q(**{f"{time_field}__lt": before.occurred_at}) | Q(
+        **{time_field: before.occurred_at, "id__lt": before.id}
+    )
+
+
+def _appointment_entry(appointment: Appointment) -> TimelineEntry:
+    return TimelineEntry(
+        kind="appointment",
+        id=str(appointment.id),
+        occurred_at=appointment.start_time,
+        title="Appointment",
+        details={
+            "doctorId": str(appointment.doctor_id),
+            "status": appointment.status,
+            "endTime": appointment.end_time,
+        },
+    )
+
+
+def _record_entry(record: MedicalRecord) -> TimelineEntry:
+    return TimelineEntry(
+        kind="medical_record",
+        id=str(record.id),
+        occurred_at=record.created_at,
+        title=record.title,
+        details={
+            "recordTypeId": str(record.record_type_id),
+            "status": record.status,
+            "createdById": str(record.created_by_id),
+        },
+    )
+
+
+def _video_entry(session: VideoSession) -> TimelineEntry:
+    return TimelineEntry(
+        kind="video_session",
+        id=str(session.id),
+        occurred_at=session.appointment.start_time,
+        title="Video session",
+        details={
+            "appointmentId": str(session.appointment_id),
+            "status": session.status,
+            "startedAt": session.started_at,
+            "endedAt": session.ended_at,
+        },
+    )
+
+
+def _message_entry(message: Message) -> TimelineEntry:
+    return TimelineEntry(
+        kind="message",
+        id=str(message.id),
+        occurred_at=message.created_at,
+        title="Message",
+        details={
+            "conversationId": str(message.conversation_id),
+            "senderId": str(message.sender_id),
+            "messageType": message.message_type,
+            "preview": message.body[:PREVIEW_LENGTH],
+        },
+    )
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from dashboard.presentation.views import PatientTimelineView
+
+urlpatterns = [
+    path(
+        "patients/<str:patient_id>/timeline/",
+        PatientTimelineView.as_view(),
+        name="dashboard-patient-timeline",
+    ),
+]
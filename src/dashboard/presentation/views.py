@@ -0,0 +1,70 @@
+from dataclasses import asdict
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from dashboard.application.dto import DashboardError, PatientTimelineRequest
+from dashboard.application.usecases import GetPatientTimelineUseCase
+from dashboard.infrastructure.timeline import DjangoPatientTimelineRepository
+
+
+class PatientTimelineView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, patient_id: str):
+        try:
+            limit = _parse_int(request.query_params.get("limit"), default=50, min_value=1, max_value=200)
+        except ValueError as exc:
+            return _error_response(
+                code="invalid_pagination",
+                message=str(exc),
+                details={},
+                status=400,
+            )
+
+        usecase = GetPatientTimelineUseCase(DjangoPatientTimelineRepository())
+        try:
+            result = usecase.execute(
+                PatientTimelineRequest(
+                    user_id=str(request.user.id),
+                    user_role=_get_user_role(request.user),
+                    patient_id=str(patient_id),
+                    limit=limit,
+                    cursor=request.query_params.get("cursor"),
+                )
+            )
+        except DashboardError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response(
+            {
+                "data": [asdict(entry) for entry in result.entries],
+                "meta": {"nextCursor": result.next_cursor},
+            }
+        )
+
+
+def _get_user_role(user) -> str:
+    if getattr(user, "is_staff", False):
+        return "admin"
+    return str(getattr(user, "role", "") or "").lower()
+
+
+def _parse_int(value, default: int, min_value: int, max_value: int) -> int:
+    if value in (None, ""):
+        return default
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Pagination values must be integers.") from exc
+    if parsed < min_value or parsed > max_value:
+        raise ValueError("Pagination values are out of range.")
+    return parsed
+
+
+def _error_response(code: str, message: str, details: dict, status: int):
+    return Response(
+        {"error": {"code": code, "message": message, "details": details or {}}},
+        status=status,
+    )
@@ -0,0 +1 @@
+"""Doctors app package."""
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from doctors.domain.entities import RatedDoctor
+
+
+@dataclass(frozen=True)
+class ListDoctorsByRatingRequest:
+    min_reviews: int
+    limit: int
+    cursor: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DoctorListResult:
+    doctors: List[RatedDoctor]
+    next_cursor: Optional[str]
+
+
+class DoctorError(Exception):
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        details: Optional[dict] = None,
+        status: int = 400,
+    ) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details or {}
+        self.status = status
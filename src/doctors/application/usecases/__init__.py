@@ -0,0 +1,3 @@
+from doctors.application.usecases.list_doctors import ListDoctorsByRatingUseCase
+
+__all__ = ["ListDoctorsByRatingUseCase"]
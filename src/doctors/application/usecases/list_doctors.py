@@ -0,0 +1,49 @@
+import base64
+import uuid
+from typing import Optional, Tuple
+
+from doctors.application.dto import DoctorError, DoctorListResult, ListDoctorsByRatingRequest
+from doctors.domain.repositories import DoctorRatingRepository
+
+
+class ListDoctorsByRatingUseCase:
+    def __init__(self, rating_repository: DoctorRatingRepository) -> None:
+        self.rating_repository = rating_repository
+
+    def execute(self, request: ListDoctorsByRatingRequest) -> DoctorListResult:
+        if request.min_reviews < 0:
+            raise DoctorError(
+                code="invalid_query",
+                message="min_reviews cannot be negative.",
+                details={"min_reviews": request.min_reviews},
+                status=400,
+            )
+
+        after = None
+        if request.cursor:
+            after = _decode_cursor(request.cursor)
+            if after is None:
+                raise DoctorError(code="invalid_cursor", message="Invalid cursor.", details={}, status=400)
+
+        doctors = self.rating_repository.list_by_rating(request.min_reviews, request.limit + 1, after)
+        next_cursor = None
+        if len(doctors) > request.limit:
+            doctors = doctors[: request.limit]
+            last = doctors[-1]
+            next_cursor = _encode_cursor(last.average_rating, last.review_count, last.doctor_id)
+        return DoctorListResult(doctors=doctors, next_cursor=next_cursor)
+
+
+def _encode_cursor(average_rating: float, review_count: int, doctor_id: str) -> str:
+    # repr() round-trips the float exactly, so the next page starts after this row
+    raw = f"{average_rating!r}|{review_count}|{doctor_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[float, int, str]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        average_rating, review_count, doctor_id = raw.split("|", 2)
+        return float(average_rating), int(review_count), str(uuid.UUID(doctor_id))
+    except (ValueError, UnicodeDecodeError):
+        return None
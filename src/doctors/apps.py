@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+
+
+class DoctorsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "doctors"
+
+    def ready(self) -> None:
+        from django.db.models.signals import post_delete, post_save, pre_save
+
+        from doctors.infrastructure import models
+        from doctors.infrastructure.ratings import doctor_profile_saved, review_deleted, review_saved, review_saving
+        from users.infrastructure.models import DoctorProfile
+
+        # Review writes adjust the doctor's rating summary in the same transaction
+        pre_save.connect(review_saving, sender=models.DoctorReview, dispatch_uid="doctors.rating_before_save")
+        post_save.connect(review_saved, sender=models.DoctorReview, dispatch_uid="doctors.rating_save")
+        post_delete.connect(review_deleted, sender=models.DoctorReview, dispatch_uid="doctors.rating_delete")
+        post_save.connect(doctor_profile_saved, sender=DoctorProfile, dispatch_uid="doctors.rating_new_doctor")
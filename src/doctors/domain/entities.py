@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class RatedDoctor:
+    doctor_id: str
+    user_id: str
+    name: str
+    bio: str
+    experience_years: int
+    average_rating: float
+    review_count: int
+    # Review count per star, 1 to 5
+    rating_histogram: Dict[int, int]
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+from doctors.domain.entities import RatedDoctor
+
+
+class DoctorRatingRepository(ABC):
+    @abstractmethod
+    def list_by_rating(
+        self,
+        min_reviews: int,
+        limit: int,
+        after: Optional[Tuple[float, int, str]] = None,
+    ) -> List[RatedDoctor]:
+        """Verified doctors, best average first, then most reviewed.
+
+        ``after`` is the (average, count, doctor id) of the last doctor on the
+        previous page.
+        """
+        raise NotImplementedError
@@ -1,6 +1,6 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
 
 
 class Specialty(models.Model):
@@ -83,5 +83,47 @@ class DoctorReview(models.Model):
             models.Index(fields=["created_at"]),
         ]
 
+    def save(self, *args, **kwargs):
+        # The rating summary is adjusted by signal handlers, inside this transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"{self.doctor_id}:{self.rating}"
+
+
+class DoctorRatingSummary(models.Model):
+    """Running totals of a doctor's reviews, kept by ``doctors.infrastructure.ratings``.
+
+    Updated in the transaction that writes the review, so listings read one
+    row per doctor instead of aggregating the reviews table.
+    ``rebuild_doctor_ratings`` recomputes it from scratch.
+    """
+
+    doctor = models.OneToOneField(
+        "users.DoctorProfile",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_summary",
+    )
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    count_1 = models.PositiveIntegerField(default=0)
+    count_2 = models.PositiveIntegerField(default=0)
+    count_3 = models.PositiveIntegerField(default=0)
+    count_4 = models.PositiveIntegerField(default=0)
+    count_5 = models.PositiveIntegerField(default=0)
+    # rating_sum / rating_count, stored so listings can sort on an index
+    average_rating = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-average_rating", "-rating_count", "-doctor"],
+                name="doctor_rating_order_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.doctor_id}:{self.average_rating:.2f} ({self.rating_count})"
@@ -0,0 +1,170 @@
+import logging
+from collections import Counter
+from typing import Dict, List, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from doctors.infrastructure.models import DoctorRatingSummary, DoctorReview
+from users.infrastructure.models import DoctorProfile
+
+logger = logging.getLogger(__name__)
+
+RATINGS = range(1, 6)
+SUMMARY_FIELDS = [
+    "rating_sum",
+    "rating_count",
+    *(f"count_{rating}" for rating in RATINGS),
+    "average_rating",
+    "updated_at",
+]
+
+
+def apply_rating_change(doctor_id: str, added: Optional[int] = None, removed: Optional[int] = None) -> None:
+    """Fold one review's rating change into the doctor's summary.
+
+    Must run in the transaction that writes the review. The row is adjusted
+    with a single UPDATE, so concurrent reviews of the same doctor serialize
+    on its row lock rather than overwrite each other.
+    """
+    deltas = Counter()
+    if added is not None:
+        deltas[added] += 1
+    if removed is not None:
+        deltas[removed] -= 1
+    if not any(deltas.values()):
+        return
+
+    count_delta = sum(deltas.values())
+    sum_delta = sum(rating * change for rating, change in deltas.items())
+    values = {f"count_{rating}": F(f"count_{rating}") + change for rating, change in deltas.items() if change}
+    new_sum = F("rating_sum") + sum_delta
+    new_count = F("rating_count") + count_delta
+    values.update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        # Right-hand sides read the row as it was before this UPDATE
+        average_rating=Case(
+            When(rating_count__gt=-count_delta, then=Cast(new_sum, FloatField()) / Cast(new_count, FloatField())),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        updated_at=timezone.now(),
+    )
+    summaries = DoctorRatingSummary.objects.filter(doctor_id=doctor_id)
+    if summaries.update(**values):
+        return
+
+    # No summary yet: count the doctor's reviews, including the one being written
+    try:
+        with transaction.atomic():
+            _summaries([doctor_id])[0].save(force_insert=True)
+    except IntegrityError:
+        # Created concurrently from reviews that cannot see this one
+        summaries.update(**values)
+
+
+def rebuild_summaries(batch_size: int = 500) -> int:
+    """Recompute every doctor's summary from the reviews, one batch of doctors per transaction."""
+    rebuilt = 0
+    last_id = None
+    while True:
+        doctors = DoctorProfile.objects.order_by("pk")
+        if last_id is not None:
+            doctors = doctors.filter(pk__gt=last_id)
+        doctor_ids = list(doctors.values_list("pk", flat=True)[:batch_size])
+        if doctor_ids:
+            with transaction.atomic():
+                _rebuild(doctor_ids)
+            rebuilt += len(doctor_ids)
+            last_id = doctor_ids[-1]
+        if len(doctor_ids) < batch_size:
+            return rebuilt
+
+
+def review_saving(sender, instance: DoctorReview, raw: bool = False, **kwargs) -> None:
+    """pre_save receiver: remember the stored rating an update replaces."""
+    instance._previous_rating = None
+    if raw or instance._state.adding:
+        return
+    # Locked so two updates of the same review cannot both subtract the old rating
+    instance._previous_rating = (
+        DoctorReview.objects.select_for_update().filter(pk=instance.pk).values("doctor_id", "rating").first()
+    )
+
+
+def review_saved(sender, instance: DoctorReview, created: bool, raw: bool = False, **kwargs) -> None:
+    if raw:
+        return
+    previous = getattr(instance, "_previous_rating", None)
+    instance._previous_rating = None
+    if previous is None:
+        apply_rating_change(instance.doctor_id, added=instance.rating)
+    elif previous["doctor_id"] == instance.doctor_id:
+        apply_rating_change(instance.doctor_id, added=instance.rating, removed=previous["rating"])
+    else:
+        apply_rating_change(previous["doctor_id"], removed=previous["rating"])
+        apply_rating_change(instance.doctor_id, added=instance.rating)
+
+
+def review_deleted(sender, instance: DoctorReview, **kwargs) -> None:
+    apply_rating_change(instance.doctor_id, removed=instance.rating)
+
+
+def doctor_profile_saved(sender, instance: DoctorProfile, created: bool, raw: bool = False, **kwargs) -> None:
+    """Give new doctors an empty summary so rating listings include them."""
+    if created and not raw:
+        DoctorRatingSummary.objects.get_or_create(doctor_id=instance.pk)
+
+
+def _rebuild(doctor_ids: List[str]) -> None:
+    # Locking first makes in-flight review writes either land before the
+    # recount (and be included) or wait and apply their change on top of it
+    existing = set(
+        DoctorRatingSummary.objects.select_for_update()
+        .filter(doctor_id__in=doctor_ids)
+        .values_list("doctor_id", flat=True)
+    )
+    summaries = _summaries(doctor_ids)
+    DoctorRatingSummary.objects.bulk_update(
+        [summary for summary in summaries if summary.doctor_id in existing],
+        SUMMARY_FIELDS,
+    )
+    DoctorRatingSummary.objects.bulk_create(
+        [summary for summary in summaries if summary.doctor_id not in existing],
+        ignore_conflicts=True,
+    )
+    logger.info("Rebuilt rating summaries for %s doctors", len(doctor_ids))
+
+
+def _summaries(doctor_ids: List[str]) -> List[DoctorRatingSummary]:
+    totals: Dict[str, dict] = {
+        row.pop("doctor_id"): row
+        for row in DoctorReview.objects.filter(doctor_id__in=doctor_ids)
+        .order_by()
+        .values("doctor_id")
+        .annotate(
+            rating_sum=Sum("rating"),
+            rating_count=Count("id"),
+            **{f"count_{rating}": Count("id", filter=Q(rating=rating)) for rating in RATINGS},
+        )
+    }
+    now = timezone.now()
+    summaries = []
+    for doctor_id in doctor_ids:
+        row = totals.get(doctor_id, {})
+        rating_sum = row.get("rating_sum") or 0
+        rating_count = row.get("rating_count") or 0
+        summaries.append(
+            DoctorRatingSummary(
+                doctor_id=doctor_id,
+                rating_sum=rating_sum,
+                rating_count=rating_count,
+                average_rating=rating_sum / rating_count if rating_count else 0.0,
+                updated_at=now,
+                **{f"count_{rating}": row.get(f"count_{rating}", 0) for rating in RATINGS},
+            )
+        )
+    return summaries
@@ -0,0 +1,43 @@
+from typing import List, Optional, Tuple
+
+from django.db.models import Q
+
+from doctors.domain.entities import RatedDoctor
+from doctors.domain.repositories import DoctorRatingRepository
+from doctors.infrastructure.models import DoctorRatingSummary
+from doctors.infrastructure.ratings import RATINGS
+
+
+class DjangoDoctorRatingRepository(DoctorRatingRepository):
+    def list_by_rating(
+        self,
+        min_reviews: int,
+        limit: int,
+        after: Optional[Tuple[float, int, str]] = None,
+    ) -> List[RatedDoctor]:
+        # Walks doctor_rating_order_idx; no aggregate over the reviews
+        summaries = DoctorRatingSummary.objects.select_related("doctor__user").filter(doctor__is_verified=True)
+        if min_reviews:
+            summaries = summaries.filter(rating_count__gte=min_reviews)
+        if after is not None:
+            average_rating, review_count, doctor_id = after
+            summaries = summaries.filter(
+                Q(average_rating__lt=average_rating)
+                | Q(average_rating=average_rating, rating_count__lt=review_count)
+                | Q(average_rating=average_rating, rating_count=review_count, doctor_id__lt=doctor_id)
+            )
+        summaries = summaries.order_by("-average_rating", "-rating_count", "-doctor_id")[:limit]
+        return [self._to_entity(summary) for summary in summaries]
+
+    def _to_entity(self, summary: DoctorRatingSummary) -> RatedDoctor:
+        doctor = summary.doctor
+        return RatedDoctor(
+            doctor_id=str(doctor.pk),
+            user_id=str(doctor.user_id),
+            name=doctor.user.name,
+            bio=doctor.bio,
+            experience_years=doctor.experience_years,
+            average_rating=summary.average_rating,
+            review_count=summary.rating_count,
+            rating_histogram={rating: getattr(summary, f"count_{rating}") for rating in RATINGS},
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from doctors.infrastructure.ratings import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute every doctor's rating summary from their reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Doctors recounted per transaction.")
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_summaries(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating summaries for {rebuilt} doctors."))
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from doctors.presentation.views import DoctorListView
+
+urlpatterns = [
+    path("", DoctorListView.as_view(), name="doctors-list"),
+]
@@ -0,0 +1,60 @@
+from dataclasses import asdict
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from doctors.application.dto import DoctorError, ListDoctorsByRatingRequest
+from doctors.application.usecases import ListDoctorsByRatingUseCase
+from doctors.infrastructure.repositories import DjangoDoctorRatingRepository
+
+
+class DoctorListView(APIView):
+    """Verified doctors ordered by rating, read from the maintained summaries."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            limit = min(max(int(params.get("limit") or 20), 1), 100)
+            min_reviews = int(params.get("min_reviews") or 0)
+        except ValueError:
+            return _error_response(
+                code="invalid_query",
+                message="limit and min_reviews must be integers.",
+                details={},
+                status=400,
+            )
+
+        usecase = ListDoctorsByRatingUseCase(DjangoDoctorRatingRepository())
+        try:
+            result = usecase.execute(
+                ListDoctorsByRatingRequest(
+                    min_reviews=min_reviews,
+                    limit=limit,
+                    cursor=params.get("cursor"),
+                )
+            )
+        except DoctorError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response(
+            {
+                "data": [_doctor_data(doctor) for doctor in result.doctors],
+                "meta": {"nextCursor": result.next_cursor},
+            }
+        )
+
+
+def _doctor_data(doctor) -> dict:
+    data = asdict(doctor)
+    data["average_rating"] = round(doctor.average_rating, 2)
+    return data
+
+
+def _error_response(code: str, message: str, details: dict, status: int):
+    return Response(
+        {"error": {"code": code, "message": message, "details": details or {}}},
+        status=status,
+    )
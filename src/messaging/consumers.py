@@ -1,67 +1,152 @@
+import asyncio
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.db import transaction
 from django.utils import timezone
+from apps.messaging import protocol
 from apps.messaging.models import Conversation, Message
+from apps.messaging.search import get_search_backend
+from apps.messaging.sync import log_message_created
+from apps.messaging.unread import record_message_sent
 from apps.users.models import User
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Binary clients receive at most one frame per tick
+BATCH_TICK_SECONDS = 0.05
+# Channel layer alias for typing and presence, which must not be persisted
+EPHEMERAL_LAYER = 'ephemeral'
+
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.conversation_id = self.scope['url_route']['kwargs']['conversation_id']
         self.user = self.scope['user']
         self.room_group_name = f'chat_{self.conversation_id}'
+        self.binary = protocol.SUBPROTOCOL in self.scope.get('subprotocols', [])
+        self.pending_events = []
+        self.flush_task = None
+        self.known_senders = set()
+        self.joined = False
+        self.ephemeral_layer = get_channel_layer(EPHEMERAL_LAYER)
+        self.ephemeral_channel = None
+        self.ephemeral_task = None
         
-        # Verify user is part of conversation
+        # Verify user is part of conversation; anonymous users never are
         is_participant = await self.is_conversation_participant()
         if not is_participant:
             await self.close()
             return
+        # Resolved once per connection instead of once per message
+        self.sender_name = self.user.get_full_name()
         
         # Join room group
         await self.channel_layer.group_add(
             self.room_group_name,
             self.channel_name
         )
+        # Typing and presence travel on a separate, non-persistent layer
+        self.ephemeral_channel = await self.ephemeral_layer.new_channel()
+        await self.ephemeral_layer.group_add(self.room_group_name, self.ephemeral_channel)
+        self.ephemeral_task = asyncio.ensure_future(self.receive_ephemeral())
         
-        await self.accept()
+        await self.accept(subprotocol=protocol.SUBPROTOCOL if self.binary else None)
+        self.joined = True
+        await self.ephemeral_layer.group_send(
+            self.room_group_name,
+            {'type': 'chat_presence', 'sender_id': str(self.user.id), 'sender_name': self.sender_name, 'online': True}
+        )
         logger.info(f"User {self.user} connected to conversation {self.conversation_id}")
     
     async def disconnect(self, close_code):
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+        if self.joined:
+            await self.ephemeral_layer.group_send(
+                self.room_group_name,
+                {
+                    'type': 'chat_presence',
+                    'sender_id': str(self.user.id),
+                    'sender_name': self.sender_name,
+                    'online': False
+                }
+            )
+        if self.ephemeral_task is not None:
+            self.ephemeral_task.cancel()
+        if self.ephemeral_channel is not None:
+            await self.ephemeral_layer.group_discard(self.room_group_name, self.ephemeral_channel)
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
         )
         logger.info(f"User {self.user} disconnected from conversation {self.conversation_id}")
     
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
+        if bytes_data is not None:
+            if not self.binary:
+                return
+            try:
+                events = protocol.decode_client_frame(bytes_data)
+            except (protocol.ProtocolError, UnicodeDecodeError):
+                logger.error(f"Invalid binary frame from user {self.user}")
+                return
+            for event in events:
+                await self.handle_client_event(event)
+            return
+        
         try:
             data = json.loads(text_data)
-            message_type = data.get('type')
-            
-            if message_type == 'chat_message':
-                message = data.get('message')
-                
-                # Save message to database
-                db_message = await self.save_message(message)
-                
-                # Broadcast to group
-                await self.channel_layer.group_send(
-                    self.room_group_name,
-                    {
-                        'type': 'chat_message',
-                        'message': message,
-                        'sender_id': self.user.id,
-                        'sender_name': self.user.get_full_name(),
-                        'created_at': db_message.created_at.isoformat()
-                    }
-                )
+            await self.handle_client_event(data)
         except json.JSONDecodeError:
             logger.error(f"Invalid JSON from user {self.user}")
     
+    async def handle_client_event(self, data):
+        message_type = data.get('type')
+        
+        if message_type == 'chat_message':
+            message = data.get('message')
+            
+            # Save message to database
+            db_message = await self.save_message(message)
+            
+            # Broadcast to group
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                {
+                    'type': 'chat_message',
+                    'message': message,
+                    'message_id': str(db_message.id),
+                    'sender_id': self.user.id,
+                    'sender_name': self.sender_name,
+                    'created_at': db_message.created_at.isoformat()
+                }
+            )
+        elif message_type == 'typing':
+            # Ephemeral: reaches every worker but is never written to the database
+            await self.ephemeral_layer.group_send(
+                self.room_group_name,
+                {
+                    'type': 'chat_typing',
+                    'sender_id': str(self.user.id),
+                    'sender_name': self.sender_name,
+                    'is_typing': bool(data.get('is_typing', True))
+                }
+            )
+    
+    async def receive_ephemeral(self):
+        while True:
+            event = await self.ephemeral_layer.receive(self.ephemeral_channel)
+            try:
+                await self.dispatch(event)
+            except Exception:
+                logger.exception(f"Failed to deliver {event.get('type')} to user {self.user}")
+    
     async def chat_message(self, event):
+        if self.binary:
+            self.queue_event(event, protocol.encode_chat_message(event))
+            return
         await self.send(text_data=json.dumps({
             'type': 'chat_message',
             'message': event['message'],
@@ -70,6 +155,48 @@ class ChatConsumer(AsyncWebsocketConsumer):
             'created_at': event['created_at']
         }))
     
+    async def chat_typing(self, event):
+        if event['sender_id'] == str(self.user.id):
+            return
+        if self.binary:
+            self.queue_event(event, protocol.encode_typing(event))
+            return
+        await self.send(text_data=json.dumps({
+            'type': 'typing',
+            'sender_id': event['sender_id'],
+            'sender_name': event['sender_name'],
+            'is_typing': event['is_typing']
+        }))
+    
+    async def chat_presence(self, event):
+        if event['sender_id'] == str(self.user.id):
+            return
+        if self.binary:
+            self.queue_event(event, protocol.encode_presence(event))
+            return
+        await self.send(text_data=json.dumps({
+            'type': 'presence',
+            'sender_id': event['sender_id'],
+            'sender_name': event['sender_name'],
+            'online': event['online']
+        }))
+    
+    def queue_event(self, event, encoded):
+        sender_id = str(event['sender_id'])
+        if sender_id not in self.known_senders:
+            self.known_senders.add(sender_id)
+            self.pending_events.append(protocol.encode_sender(sender_id, event['sender_name']))
+        self.pending_events.append(encoded)
+        if self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self.flush_after_tick())
+    
+    async def flush_after_tick(self):
+        await asyncio.sleep(BATCH_TICK_SECONDS)
+        events, self.pending_events = self.pending_events, []
+        self.flush_task = None
+        if events:
+            await self.send(bytes_data=protocol.encode_frame(events))
+    
     @database_sync_to_async
     def is_conversation_participant(self):
         try:
@@ -81,9 +208,14 @@ class ChatConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def save_message(self, content):
         conversation = Conversation.objects.get(id=self.conversation_id)
-        message = Message.objects.create(
-            conversation=conversation,
-            sender=self.user,
-            content=content
-        )
+        # The message and its unread counters commit together
+        with transaction.atomic():
+            message = Message.objects.create(
+                conversation=conversation,
+                sender=self.user,
+                content=content
+            )
+            get_search_backend().index_message(message)
+            record_message_sent(message)
+            log_message_created(message)
         return message
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from apps.messaging.retention import apply_retention, get_policy
+
+
+class Command(BaseCommand):
+    help = 'Compact old messages into compressed per-conversation-day archive rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Override MESSAGE_RETENTION archive_after_days')
+        parser.add_argument('--all-conversations', action='store_true', help='Include conversations that are not archived')
+        parser.add_argument('--batch-size', type=int, default=500, help='Conversations per batch')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        policy = get_policy()
+        if options['days'] is not None:
+            policy['archive_after_days'] = options['days']
+        if options['all_conversations']:
+            policy['archived_conversations_only'] = False
+
+        def report(last_id, result):
+            self.stdout.write(
+                f'conversations up to {last_id}: {result.days} days, {result.messages} messages compacted'
+            )
+
+        result = apply_retention(policy, batch_size=options['batch_size'], dry_run=options['dry_run'], report=report)
+        verb = 'would compact' if options['dry_run'] else 'compacted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result.days} days from {result.conversations} conversations ({result.messages} messages)'
+        ))
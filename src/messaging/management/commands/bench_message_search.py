@@ -0,0 +1,98 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.messaging.models import Conversation, Message
+from apps.messaging.search import (
+    InvertedIndexMessageSearchBackend,
+    PostgresMessageSearchBackend,
+)
+from apps.users.models import User
+
+VOCABULARY = (
+    'appointment prescription dosage fever headache allergy referral insulin '
+    'pressure results follow report scan imaging cholesterol glucose therapy '
+    'symptoms nausea fatigue recovery clinic pharmacy refill schedule vaccine '
+    'cough rash infection antibiotic surgery discharge monitor sleep diet'
+).split()
+
+
+class Command(BaseCommand):
+    help = 'Compare icontains, inverted-index and Postgres full-text message search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=1_000_000)
+        parser.add_argument('--conversations', type=int, default=2_000)
+        parser.add_argument('--queries', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--skip-seed', action='store_true', help='Reuse previously seeded rows')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        user = self._seed(options, rng)
+        queries = [' '.join(rng.sample(VOCABULARY, 2)) for _ in range(options['queries'])]
+
+        self._report('icontains', [self._time(lambda q=q: list(self._icontains(user, q))) for q in queries])
+
+        inverted = InvertedIndexMessageSearchBackend()
+        started = time.perf_counter()
+        inverted.build()
+        self.stdout.write(f'inverted index build: {time.perf_counter() - started:.2f}s')
+        self._report('inverted_index', [self._time(lambda q=q: inverted.search(user, q)) for q in queries])
+
+        if connection.vendor == 'postgresql':
+            backend = PostgresMessageSearchBackend()
+            backend.install(concurrently=False)
+            self._report('postgres_fts', [self._time(lambda q=q: backend.search(user, q)) for q in queries])
+        else:
+            self.stdout.write('postgres_fts: skipped (not running on PostgreSQL)')
+
+    def _seed(self, options, rng):
+        user, _ = User.objects.get_or_create(email='bench-search@example.com')
+        if options['skip_seed']:
+            return user
+
+        conversations = list(Conversation.objects.filter(participants=user)[: options['conversations']])
+        if not conversations:
+            raise CommandError(
+                'Seed at least one conversation for bench-search@example.com before running this benchmark.'
+            )
+        remaining = options['messages']
+        while remaining > 0:
+            size = min(options['batch_size'], remaining)
+            Message.objects.bulk_create(
+                [
+                    Message(
+                        conversation=rng.choice(conversations),
+                        sender=user,
+                        content=' '.join(rng.choices(VOCABULARY, k=rng.randint(5, 30))),
+                    )
+                    for _ in range(size)
+                ],
+                batch_size=options['batch_size'],
+            )
+            remaining -= size
+            self.stdout.write(f'seeded {options["messages"] - remaining} messages')
+        return user
+
+    def _icontains(self, user, query):
+        # Same all-terms semantics as the indexed backends
+        messages = Message.objects.filter(conversation__participants=user)
+        for term in query.split():
+            messages = messages.filter(content__icontains=term)
+        return messages.order_by('-created_at')[:50]
+
+    def _time(self, fn):
+        started = time.perf_counter()
+        fn()
+        return (time.perf_counter() - started) * 1000
+
+    def _report(self, name, samples):
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) > 1 else samples[0]
+        self.stdout.write(
+            f'{name}: median {statistics.median(samples):.1f}ms p95 {p95:.1f}ms max {samples[-1]:.1f}ms'
+        )
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.messaging.uploads import UPLOAD_EXPIRY, expire_sessions
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned chunked uploads and release the blobs they hold'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, help='Idle time before a session is abandoned')
+        parser.add_argument('--batch-size', type=int, default=100, help='Sessions per transaction')
+
+    def handle(self, *args, **options):
+        expiry = timedelta(hours=options['hours']) if options['hours'] is not None else UPLOAD_EXPIRY
+        expired = expire_sessions(expiry, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'expired {expired} upload sessions'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.messaging.search import InvertedIndexMessageSearchBackend, PostgresMessageSearchBackend
+
+
+class Command(BaseCommand):
+    help = (
+        'Create the generated tsvector column and GIN index used by message search on Postgres, '
+        'or backfill the inverted index elsewhere'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-concurrently',
+            action='store_true',
+            help='Build the index inside a transaction instead of CONCURRENTLY',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            InvertedIndexMessageSearchBackend().build()
+            self.stdout.write(self.style.SUCCESS('Message search inverted index is built.'))
+            return
+        PostgresMessageSearchBackend().install(concurrently=not options['no_concurrently'])
+        self.stdout.write(self.style.SUCCESS('Message search column and index are installed.'))
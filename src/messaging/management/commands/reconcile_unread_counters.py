@@ -0,0 +1,136 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from apps.messaging.models import (
+    Conversation,
+    ConversationUnreadCounter,
+    Message,
+    UserUnreadCounter,
+)
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Backfill or repair unread counters from the messages table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Conversations per batch')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without writing')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        participants = Conversation.participants.through
+        fixed = 0
+        last_id = 0
+
+        while True:
+            conversation_ids = list(
+                Conversation.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not conversation_ids:
+                break
+            last_id = conversation_ids[-1]
+            fixed += self._reconcile_conversations(conversation_ids, participants, dry_run)
+            self.stdout.write(f'conversations up to {last_id}: {fixed} counters drifted so far')
+
+        totals_fixed = 0
+        last_user_id = None
+        while True:
+            users = User.objects.order_by('id')
+            if last_user_id is not None:
+                users = users.filter(id__gt=last_user_id)
+            user_ids = list(users.values_list('id', flat=True)[:batch_size])
+            if not user_ids:
+                break
+            last_user_id = user_ids[-1]
+            totals_fixed += self._reconcile_totals(user_ids, dry_run)
+        verb = 'would fix' if dry_run else 'fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {fixed} conversation counters and {totals_fixed} user totals'
+        ))
+
+    def _reconcile_conversations(self, conversation_ids, participants, dry_run):
+        unread = Message.objects.filter(conversation_id__in=conversation_ids, is_read=False).values(
+            'conversation_id', 'sender_id'
+        ).annotate(n=Count('id'))
+        per_sender = {}
+        for row in unread:
+            per_sender.setdefault(row['conversation_id'], {})[row['sender_id']] = row['n']
+
+        expected = {}
+        for conversation_id, user_id in participants.objects.filter(
+            conversation_id__in=conversation_ids
+        ).values_list('conversation_id', 'user_id'):
+            senders = per_sender.get(conversation_id, {})
+            expected[(user_id, conversation_id)] = sum(
+                n for sender_id, n in senders.items() if sender_id != user_id
+            )
+
+        existing = {
+            (counter.user_id, counter.conversation_id): counter
+            for counter in ConversationUnreadCounter.objects.filter(conversation_id__in=conversation_ids)
+        }
+        to_create, to_update = [], []
+        for (user_id, conversation_id), count in expected.items():
+            counter = existing.pop((user_id, conversation_id), None)
+            if counter is None:
+                if count:
+                    to_create.append(ConversationUnreadCounter(
+                        user_id=user_id, conversation_id=conversation_id, unread_count=count
+                    ))
+            elif counter.unread_count != count:
+                counter.unread_count = count
+                to_update.append(counter)
+        # Counters left over belong to users who are no longer participants
+        stale = [counter.pk for counter in existing.values()]
+
+        if not dry_run:
+            with transaction.atomic():
+                ConversationUnreadCounter.objects.bulk_create(to_create)
+                ConversationUnreadCounter.objects.bulk_update(to_update, ['unread_count'])
+                ConversationUnreadCounter.objects.filter(pk__in=stale).delete()
+        return len(to_create) + len(to_update) + len(stale)
+
+    def _reconcile_totals(self, user_ids, dry_run):
+        """Reset a batch of user totals from their conversation counters
+
+        The user counters are locked before the conversation counters are
+        summed, in the same transaction. A send or read that commits
+        meanwhile has to wait for the user lock, so it applies its delta on
+        top of the recomputed total instead of being overwritten by it.
+        """
+        with transaction.atomic():
+            if not dry_run:
+                # Rows to lock for users who have unread messages but no total yet
+                missing = (
+                    ConversationUnreadCounter.objects.filter(user_id__in=user_ids, unread_count__gt=0)
+                    .exclude(user_id__in=UserUnreadCounter.objects.filter(user_id__in=user_ids).values('user_id'))
+                    .values_list('user_id', flat=True)
+                    .distinct()
+                )
+                UserUnreadCounter.objects.bulk_create(
+                    [UserUnreadCounter(user_id=user_id, unread_count=0) for user_id in missing],
+                    ignore_conflicts=True
+                )
+            counters = UserUnreadCounter.objects.filter(user_id__in=user_ids).order_by('user_id')
+            if not dry_run:
+                counters = counters.select_for_update()
+            counters = list(counters)
+            expected = dict(
+                ConversationUnreadCounter.objects.filter(user_id__in=user_ids)
+                .values('user_id').annotate(total=Sum('unread_count'))
+                .values_list('user_id', 'total')
+            )
+            to_update = []
+            for counter in counters:
+                total = expected.pop(counter.user_id, 0) or 0
+                if counter.unread_count != total:
+                    counter.unread_count = total
+                    to_update.append(counter)
+            # Left over only on a dry run, where missing totals were not created
+            drifted = len(to_update) + sum(1 for total in expected.values() if total)
+            if not dry_run:
+                UserUnreadCounter.objects.bulk_update(to_update, ['unread_count'])
+        return drifted
@@ -1,5 +1,10 @@
+import uuid
+from collections import Counter
+
 from django.db import models
+from django.db.models.signals import post_delete
 from apps.users.models import User, Patient, Doctor
+from common.blobstore import release_on_delete, release_references
 
 class Conversation(models.Model):
     participants = models.ManyToManyField(User, related_name='conversations')
@@ -30,6 +35,9 @@ class Message(models.Model):
     
     content = models.TextField()
     attachment = models.FileField(upload_to='message_attachments/%Y/%m/%d/', blank=True, null=True)
+    # Set for attachments stored through chunked uploads; `attachment` then
+    # points at the shared blob file
+    blob = models.ForeignKey('common.Blob', on_delete=models.PROTECT, null=True, blank=True, related_name='messages')
     
     is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(blank=True, null=True)
@@ -42,12 +50,131 @@ class Message(models.Model):
         indexes = [
             models.Index(fields=['conversation', 'created_at']),
             models.Index(fields=['sender']),
+            models.Index(
+                fields=['conversation', '-created_at'],
+                name='messaging_msg_unread_idx',
+                condition=models.Q(is_read=False),
+            ),
         ]
         ordering = ['-created_at']
     
     def __str__(self):
         return f"Message from {self.sender} in conversation {self.conversation.id}"
 
+class MessageSearchTerm(models.Model):
+    """Inverted-index posting: how often `term` occurs in `message`
+
+    Used by the inverted-index search backend on databases without full-text
+    search; kept in the database so every worker searches the same index.
+    """
+    term = models.CharField(max_length=100)
+    message = models.ForeignKey(Message, on_delete=models.CASCADE, related_name='search_terms')
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='+')
+    frequency = models.PositiveIntegerField()
+    
+    class Meta:
+        db_table = 'messaging_message_search_term'
+        unique_together = ['term', 'message']
+        indexes = [
+            models.Index(fields=['term', 'conversation']),
+        ]
+
+class ConversationUnreadCounter(models.Model):
+    """Unread messages for one participant in one conversation"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='conversation_unread_counters')
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='unread_counters')
+    unread_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'messaging_unread_counter'
+        unique_together = ['user', 'conversation']
+
+class UserUnreadCounter(models.Model):
+    """Total unread messages for a user across all conversations"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='unread_counter')
+    unread_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'messaging_user_unread_counter'
+
+class MessageChangeSequence(models.Model):
+    """Counter row that hands out MessageChange.seq in commit order"""
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'messaging_message_change_sequence'
+
+class MessageChange(models.Model):
+    """Append-only change log; `seq` is the position clients sync from
+
+    `seq` comes from MessageChangeSequence, whose row stays locked until the
+    writing transaction commits, so a higher seq never becomes visible
+    before a lower one.
+    """
+    CREATED = 'created'
+    EDITED = 'edited'
+    READ = 'read'
+    
+    seq = models.BigIntegerField(primary_key=True)
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='changes')
+    message = models.ForeignKey(Message, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    kind = models.CharField(max_length=10, choices=[
+        (CREATED, 'Created'),
+        (EDITED, 'Edited'),
+        (READ, 'Read'),
+    ])
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'messaging_message_change'
+        indexes = [
+            models.Index(fields=['conversation', 'seq']),
+        ]
+
+class UploadSession(models.Model):
+    """A chunked, resumable attachment upload"""
+    IN_PROGRESS = 'in_progress'
+    COMPLETE = 'complete'
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    total_size = models.BigIntegerField()
+    received_size = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, default=IN_PROGRESS, choices=[
+        (IN_PROGRESS, 'In progress'),
+        (COMPLETE, 'Complete'),
+    ])
+    blob = models.ForeignKey('common.Blob', on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'messaging_upload_session'
+        indexes = [
+            models.Index(fields=['user', 'status']),
+        ]
+
+class ArchivedMessageDay(models.Model):
+    """One day of a conversation's messages, compacted out of the hot table
+
+    `payload` is zlib-compressed JSON: a list of message dicts ordered by
+    created_at.
+    """
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='archived_days')
+    day = models.DateField()
+    message_count = models.PositiveIntegerField()
+    payload = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'messaging_archived_message_day'
+        unique_together = ['conversation', 'day']
+
 class MessageNotification(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='message_notifications')
     message = models.ForeignKey(Message, on_delete=models.CASCADE)
@@ -64,3 +191,14 @@ class MessageNotification(models.Model):
     class Meta:
         db_table = 'messaging_notification'
         unique_together = ['user', 'message']
+
+
+def release_archived_blobs(sender, instance, **kwargs):
+    """An archived day holds one reference per attached message it keeps"""
+    from apps.messaging.retention import load_payload
+    release_references(Counter(entry['blob'] for entry in load_payload(instance.payload) if entry.get('blob')))
+
+
+# messaging has no AppConfig, so its receivers are connected with the models
+post_delete.connect(release_on_delete, sender=Message, dispatch_uid='messaging.message_blob_release')
+post_delete.connect(release_archived_blobs, sender=ArchivedMessageDay, dispatch_uid='messaging.archive_blob_release')
@@ -0,0 +1,138 @@
+"""Compact binary websocket protocol for ChatConsumer
+
+Negotiated with the `telemed.chat.bin.v1` subprotocol. Each binary frame
+carries one or more events:
+
+    frame  := varint(count) event*
+    event  := u8(kind) field*
+
+Fields are positional, so no keys are repeated. Strings are varint-length
+prefixed UTF-8, integers are unsigned LEB128 varints and timestamps are
+milliseconds since the epoch. A SENDER event introduces a sender's display
+name once per connection; later events only carry the sender id.
+"""
+from datetime import datetime
+
+SUBPROTOCOL = 'telemed.chat.bin.v1'
+
+CHAT_MESSAGE = 1
+TYPING = 2
+PRESENCE = 3
+SENDER = 4
+
+OFFLINE = 0
+ONLINE = 1
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def write_varint(out, value):
+    if value < 0:
+        raise ProtocolError('varints are unsigned')
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def write_str(out, value):
+    raw = str(value).encode('utf-8')
+    write_varint(out, len(raw))
+    out.extend(raw)
+
+
+def write_timestamp(out, value):
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    write_varint(out, int(value.timestamp() * 1000))
+
+
+class Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def u8(self):
+        if self.pos >= len(self.data):
+            raise ProtocolError('truncated frame')
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def varint(self):
+        shift = value = 0
+        while True:
+            byte = self.u8()
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+            if shift > 63:
+                raise ProtocolError('varint too long')
+
+    def str(self):
+        length = self.varint()
+        end = self.pos + length
+        if end > len(self.data):
+            raise ProtocolError('truncated string')
+        value = bytes(self.data[self.pos:end]).decode('utf-8')
+        self.pos = end
+        return value
+
+
+def encode_chat_message(event):
+    out = bytearray([CHAT_MESSAGE])
+    write_str(out, event['message_id'])
+    write_str(out, event['sender_id'])
+    write_timestamp(out, event['created_at'])
+    write_str(out, event['message'])
+    return bytes(out)
+
+
+def encode_typing(event):
+    out = bytearray([TYPING])
+    write_str(out, event['sender_id'])
+    out.append(1 if event['is_typing'] else 0)
+    return bytes(out)
+
+
+def encode_presence(event):
+    out = bytearray([PRESENCE])
+    write_str(out, event['sender_id'])
+    out.append(ONLINE if event['online'] else OFFLINE)
+    return bytes(out)
+
+
+def encode_sender(sender_id, sender_name):
+    out = bytearray([SENDER])
+    write_str(out, sender_id)
+    write_str(out, sender_name)
+    return bytes(out)
+
+
+def encode_frame(events):
+    out = bytearray()
+    write_varint(out, len(events))
+    for event in events:
+        out.extend(event)
+    return bytes(out)
+
+
+def decode_client_frame(data):
+    """Decode a client frame into a list of event dicts
+
+    Clients send CHAT_MESSAGE as (text) and TYPING as (u8 is_typing).
+    """
+    reader = Reader(data)
+    events = []
+    for _ in range(reader.varint()):
+        kind = reader.u8()
+        if kind == CHAT_MESSAGE:
+            events.append({'type': 'chat_message', 'message': reader.str()})
+        elif kind == TYPING:
+            events.append({'type': 'typing', 'is_typing': bool(reader.u8())})
+        else:
+            raise ProtocolError(f'unsupported client event {kind}')
+    return events
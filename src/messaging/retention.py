@@ -0,0 +1,173 @@
+import json
+import logging
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.messaging.models import ArchivedMessageDay, Conversation, Message
+from apps.messaging.unread import forget_unread_messages
+from common.blob_storage import blob_url
+from common.blobstore import add_references
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLICY = {
+    # Messages older than this many days are moved into ArchivedMessageDay
+    'archive_after_days': 180,
+    # Only conversations with is_archived=True are compacted
+    'archived_conversations_only': True,
+    'compression_level': 6,
+}
+
+
+def get_policy():
+    return {**DEFAULT_POLICY, **getattr(settings, 'MESSAGE_RETENTION', {})}
+
+
+@dataclass
+class RetentionResult:
+    conversations: int = 0
+    days: int = 0
+    messages: int = 0
+
+
+def retention_cutoff(days, now=None):
+    """Midnight `days` ago, so only whole days are ever compacted"""
+    now = now or timezone.now()
+    midnight = datetime.combine((now - timedelta(days=days)).date(), time.min)
+    return timezone.make_aware(midnight, timezone.get_current_timezone())
+
+
+def apply_retention(policy=None, batch_size=500, dry_run=False, report=None):
+    """Compact old messages conversation by conversation, one day per transaction"""
+    policy = policy or get_policy()
+    cutoff = retention_cutoff(policy['archive_after_days'])
+    conversations = Conversation.objects.all()
+    if policy['archived_conversations_only']:
+        conversations = conversations.filter(is_archived=True)
+
+    result = RetentionResult()
+    last_id = 0
+    while True:
+        batch = list(conversations.filter(id__gt=last_id).order_by('id')[:batch_size])
+        if not batch:
+            return result
+        last_id = batch[-1].id
+        for conversation in batch:
+            days = list(
+                conversation.messages.filter(created_at__lt=cutoff).order_by().dates('created_at', 'day')
+            )
+            if not days:
+                continue
+            result.conversations += 1
+            for day in days:
+                moved = 0 if dry_run else compact_day(conversation, day, policy['compression_level'])
+                result.days += 1
+                result.messages += moved
+        if report:
+            report(last_id, result)
+
+
+def compact_day(conversation, day, compression_level=6):
+    """Move one conversation-day of messages into its archive row and return how many moved"""
+    with transaction.atomic():
+        messages = list(
+            conversation.messages.filter(created_at__date=day).select_related('sender').order_by('created_at', 'id')
+        )
+        if not messages:
+            return 0
+
+        archive = ArchivedMessageDay.objects.select_for_update().filter(conversation=conversation, day=day).first()
+        entries = {entry['id']: entry for entry in (load_payload(archive.payload) if archive else [])}
+        for message in messages:
+            entries[message.id] = _to_archive_entry(message)
+        ordered = sorted(entries.values(), key=lambda entry: (entry['created_at'], entry['id']))
+        payload = dump_payload(ordered, compression_level)
+
+        if archive is None:
+            ArchivedMessageDay.objects.create(
+                conversation=conversation, day=day, message_count=len(ordered), payload=payload
+            )
+        else:
+            archive.message_count = len(ordered)
+            archive.payload = payload
+            archive.save(update_fields=['message_count', 'payload', 'updated_at'])
+
+        forget_unread_messages(conversation, messages)
+        # The archive entries keep pointing at the blobs, so they take over the
+        # references the deleted messages release
+        add_references(Counter(message.blob_id for message in messages if message.blob_id))
+        Message.objects.filter(id__in=[message.id for message in messages]).delete()
+    logger.info(
+        f"Compacted {len(messages)} messages of conversation {conversation.id} on {day} "
+        f"into an archive of {len(ordered)} ({len(payload)} bytes)"
+    )
+    return len(messages)
+
+
+def archived_history(conversation, before, limit, before_id=None):
+    """Rehydrate up to `limit` archived messages older than `before`, newest first
+
+    `before` must be aware. With `before_id`, messages at exactly `before`
+    with a smaller id are included, matching the (created_at, id) order.
+    """
+    days = ArchivedMessageDay.objects.filter(conversation=conversation).order_by('-day')
+    if before is not None:
+        days = days.filter(day__lte=timezone.localdate(before))
+    results = []
+    for archive in days.iterator(chunk_size=8):
+        for entry in reversed(load_payload(archive.payload)):
+            if before is not None:
+                created_at = parse_datetime(entry['created_at'])
+                if created_at > before or (
+                    created_at == before and (before_id is None or entry['id'] >= before_id)
+                ):
+                    continue
+            results.append(_to_response(entry))
+            if len(results) >= limit:
+                return results
+    return results
+
+
+def dump_payload(entries, compression_level=6):
+    raw = json.dumps(entries, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+    return zlib.compress(raw, compression_level)
+
+
+def load_payload(payload):
+    return json.loads(zlib.decompress(bytes(payload)))
+
+
+def _to_archive_entry(message):
+    return {
+        'id': message.id,
+        'sender': message.sender_id,
+        'sender_name': message.sender.get_full_name(),
+        'sender_email': message.sender.email,
+        'content': message.content,
+        'attachment': message.attachment.name or None,
+        'blob': message.blob_id,
+        'is_read': message.is_read,
+        'read_at': message.read_at.isoformat() if message.read_at else None,
+        'created_at': message.created_at.isoformat(),
+        'edited_at': message.edited_at.isoformat() if message.edited_at else None,
+    }
+
+
+def _to_response(entry):
+    """Shape an archive entry like MessageSerializer output"""
+    data = {key: value for key, value in entry.items() if key != 'blob'}
+    data['attachment'] = None
+    if entry['attachment']:
+        storage_url = blob_url if entry.get('blob') else default_storage.url
+        data['attachment'] = storage_url(entry['attachment'])
+    data['archived'] = True
+    return data
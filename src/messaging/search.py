@@ -0,0 +1,204 @@
+import math
+import re
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+
+from apps.messaging.cursors import decode_cursor, encode_cursor
+from apps.messaging.models import Conversation, Message, MessageSearchTerm
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+SEARCH_CONFIG = 'english'
+
+
+class InvalidCursor(ValueError):
+    """The search cursor was not produced by a previous page"""
+
+
+def _decode_rank_cursor(cursor):
+    """(rank, id) from a search cursor, None without one; raises InvalidCursor if malformed"""
+    if not cursor:
+        return None
+    values = decode_cursor(cursor, 2)
+    if values is None or any(isinstance(value, bool) for value in values):
+        raise InvalidCursor(cursor)
+    try:
+        rank, message_id = float(values[0]), int(values[1])
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+    if not math.isfinite(rank):
+        raise InvalidCursor(cursor)
+    return rank, message_id
+
+
+class MessageSearchBackend:
+    """Ranked message search restricted to the conversations of a user.
+
+    Results are ordered by (rank DESC, id DESC) and paginated with a keyset
+    cursor, so deep pages cost the same as the first one.
+    """
+
+    def index_message(self, message):
+        """Called after a message is written"""
+
+    def search(self, user, query, limit=50, cursor=None):
+        """Return (messages, next_cursor); raises InvalidCursor for a malformed cursor"""
+        raise NotImplementedError
+
+    def _load(self, ranked, limit):
+        page = ranked[:limit]
+        by_id = Message.objects.select_related('sender').in_bulk([message_id for _, message_id in page])
+        messages = [by_id[message_id] for _, message_id in page if message_id in by_id]
+        next_cursor = None
+        if len(ranked) > limit:
+            next_cursor = encode_cursor(*page[-1])
+        return messages, next_cursor
+
+
+class PostgresMessageSearchBackend(MessageSearchBackend):
+    """Full-text search over a generated tsvector column with a GIN index.
+
+    The column is a STORED generated column, so Postgres keeps it in sync on
+    every INSERT/UPDATE of ``content``. Run ``manage.py install_message_search``
+    once to create it.
+    """
+
+    column = 'search_vector'
+    index_name = 'messaging_message_search_gin'
+
+    def install(self, concurrently=True):
+        table = Message._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {self.column} tsvector '
+                f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', coalesce(content, ''))) STORED"
+            )
+            cursor.execute(
+                f'CREATE INDEX {"CONCURRENTLY " if concurrently else ""}IF NOT EXISTS '
+                f'{self.index_name} ON {table} USING gin ({self.column})'
+            )
+
+    def search(self, user, query, limit=50, cursor=None):
+        # ts_rank_cd is real; as float8 the rank round-trips through the
+        # cursor exactly, so ties at a page boundary are not skipped
+        message_table = Message._meta.db_table
+        participants_table = Conversation.participants.through._meta.db_table
+        params = [SEARCH_CONFIG, query, user.id]
+        keyset = ''
+        after = _decode_rank_cursor(cursor)
+        if after is not None:
+            keyset = 'WHERE (ranked.rank, ranked.id) < (%s, %s)'
+            params.extend(after)
+        params.append(limit + 1)
+
+        sql = f'''
+            SELECT ranked.rank, ranked.id FROM (
+                SELECT m.id, ts_rank_cd(m.{self.column}, q)::float8 AS rank
+                FROM {message_table} m
+                JOIN {participants_table} p ON p.conversation_id = m.conversation_id,
+                     websearch_to_tsquery(%s, %s) q
+                WHERE p.user_id = %s AND m.{self.column} @@ q
+            ) ranked
+            {keyset}
+            ORDER BY ranked.rank DESC, ranked.id DESC
+            LIMIT %s
+        '''
+        with connection.cursor() as db_cursor:
+            db_cursor.execute(sql, params)
+            ranked = [(float(rank), message_id) for rank, message_id in db_cursor.fetchall()]
+        return self._load(ranked, limit)
+
+
+class InvertedIndexMessageSearchBackend(MessageSearchBackend):
+    """Inverted index in the database, used where Postgres is not available.
+
+    Postings live in ``MessageSearchTerm`` and are written by
+    ``index_message``, so all workers share one index and searches never
+    load messages into memory. ``build`` backfills it from the messages
+    table. Ranking is summed term frequency; all query terms must match.
+    """
+
+    max_term_length = MessageSearchTerm._meta.get_field('term').max_length
+
+    @classmethod
+    def tokenize(cls, text):
+        return [term[: cls.max_term_length] for term in TOKEN_RE.findall((text or '').lower())]
+
+    def build(self, chunk_size=5000):
+        last_id = 0
+        while True:
+            rows = list(
+                Message.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'conversation_id', 'content')[:chunk_size]
+            )
+            if not rows:
+                return
+            with transaction.atomic():
+                MessageSearchTerm.objects.filter(message_id__in=[row[0] for row in rows]).delete()
+                MessageSearchTerm.objects.bulk_create(
+                    [posting for row in rows for posting in self._postings(*row)],
+                    batch_size=chunk_size,
+                )
+            last_id = rows[-1][0]
+
+    def index_message(self, message):
+        with transaction.atomic():
+            MessageSearchTerm.objects.filter(message_id=message.id).delete()
+            MessageSearchTerm.objects.bulk_create(
+                self._postings(message.id, message.conversation_id, message.content)
+            )
+
+    def search(self, user, query, limit=50, cursor=None):
+        after = _decode_rank_cursor(cursor)
+        terms = set(self.tokenize(query))
+        if not terms:
+            return [], None
+        ranked = (
+            MessageSearchTerm.objects.filter(term__in=terms, conversation__participants=user)
+            .values('message_id')
+            .annotate(rank=Sum('frequency'), matched=Count('term'))
+            .filter(matched=len(terms))
+        )
+        if after is not None:
+            ranked = ranked.filter(Q(rank__lt=after[0]) | Q(rank=after[0], message_id__lt=after[1]))
+        ranked = ranked.order_by('-rank', '-message_id')[: limit + 1]
+        return self._load([(float(row['rank']), row['message_id']) for row in ranked], limit)
+
+    def _postings(self, message_id, conversation_id, content):
+        return [
+            MessageSearchTerm(
+                term=term,
+                message_id=message_id,
+                conversation_id=conversation_id,
+                frequency=frequency,
+            )
+            for term, frequency in Counter(self.tokenize(content)).items()
+        ]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend():
+    """Return the configured backend, defaulting on the database vendor"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = getattr(settings, 'MESSAGE_SEARCH_BACKEND', None)
+                if name is None:
+                    name = 'postgres' if connection.vendor == 'postgresql' else 'inverted_index'
+                if name == 'postgres':
+                    _backend = PostgresMessageSearchBackend()
+                else:
+                    _backend = InvertedIndexMessageSearchBackend()
+                logger.info(f"Using message search backend {type(_backend).__name__}")
+    return _backend
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from apps.messaging.models import Conversation, Message, MessageNotification
 from apps.users.serializers import UserSerializer
+from common.blob_storage import blob_url
 
 class MessageSerializer(serializers.ModelSerializer):
     sender_name = serializers.CharField(source='sender.get_full_name', read_only=True)
@@ -12,6 +13,13 @@ class MessageSerializer(serializers.ModelSerializer):
                   'is_read', 'read_at', 'created_at', 'edited_at']
         read_only_fields = ['id', 'sender', 'sender_name', 'sender_email', 'created_at']
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.blob_id and instance.attachment:
+            # Blob files live in the blob store, which need not be the default storage
+            data['attachment'] = blob_url(instance.attachment.name)
+        return data
+
 class ConversationSerializer(serializers.ModelSerializer):
     last_message = serializers.SerializerMethodField()
     unread_count = serializers.SerializerMethodField()
@@ -31,8 +39,12 @@ class ConversationSerializer(serializers.ModelSerializer):
         return None
     
     def get_unread_count(self, obj):
+        unread = getattr(obj, 'unread_for_user', None)
+        if unread is not None:
+            return unread
         user = self.context['request'].user
-        return obj.messages.filter(is_read=False).exclude(sender=user).count()
+        counter = obj.unread_counters.filter(user=user).values_list('unread_count', flat=True).first()
+        return counter or 0
 
 class ConversationDetailSerializer(ConversationSerializer):
     messages = MessageSerializer(many=True, read_only=True)
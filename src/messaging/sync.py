@@ -0,0 +1,111 @@
+from django.core import signing
+from django.db import transaction
+from django.db.models import F, Max
+
+from apps.messaging.models import Conversation, Message, MessageChange, MessageChangeSequence
+
+TOKEN_SALT = 'messaging.sync'
+SEQUENCE_NAME = 'message_changes'
+
+
+class InvalidSyncToken(Exception):
+    pass
+
+
+def _append(**fields):
+    """Append a change with the next commit-ordered seq
+
+    The sequence row stays locked until the caller's transaction commits, so
+    concurrent writers take seqs in the order they commit and a sync token
+    never passes a change that is not yet visible. Call this last in the
+    transaction to keep that lock short.
+    """
+    with transaction.atomic():
+        updated = MessageChangeSequence.objects.filter(name=SEQUENCE_NAME).update(value=F('value') + 1)
+        if not updated:
+            # First change ever, or first since seq moved off the auto column
+            start = MessageChange.objects.aggregate(head=Max('seq'))['head'] or 0
+            MessageChangeSequence.objects.get_or_create(name=SEQUENCE_NAME, defaults={'value': start})
+            MessageChangeSequence.objects.filter(name=SEQUENCE_NAME).update(value=F('value') + 1)
+        seq = MessageChangeSequence.objects.values_list('value', flat=True).get(name=SEQUENCE_NAME)
+        return MessageChange.objects.create(seq=seq, **fields)
+
+
+def log_message_created(message):
+    _append(
+        conversation_id=message.conversation_id,
+        message=message,
+        actor_id=message.sender_id,
+        kind=MessageChange.CREATED
+    )
+
+
+def log_message_edited(message):
+    _append(
+        conversation_id=message.conversation_id,
+        message=message,
+        actor_id=message.sender_id,
+        kind=MessageChange.EDITED
+    )
+
+
+def log_conversation_read(conversation, user):
+    _append(
+        conversation=conversation,
+        actor=user,
+        kind=MessageChange.READ
+    )
+
+
+def issue_token(seq):
+    return signing.Signer(salt=TOKEN_SALT).sign(str(seq))
+
+
+def read_token(token):
+    try:
+        return int(signing.Signer(salt=TOKEN_SALT).unsign(token))
+    except (signing.BadSignature, ValueError) as exc:
+        raise InvalidSyncToken(token) from exc
+
+
+def current_token():
+    """Token for the head of the change log"""
+    head = MessageChange.objects.order_by('-seq').values_list('seq', flat=True).first()
+    return issue_token(head or 0)
+
+
+def changes_since(user, token, limit=500):
+    """Return (messages, reads, next_token, has_more) for the user's conversations
+
+    Each conversation is read as a range on the (conversation, seq) index, so
+    the cost depends on how much changed, not on history size.
+    """
+    since = read_token(token)
+    changes = list(
+        MessageChange.objects.filter(
+            conversation_id__in=Conversation.objects.filter(participants=user).values('id'),
+            seq__gt=since
+        ).order_by('seq').values('seq', 'conversation_id', 'message_id', 'actor_id', 'kind', 'created_at')[:limit + 1]
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if not changes:
+        return [], [], token, False
+
+    message_ids = {
+        change['message_id'] for change in changes
+        if change['kind'] in (MessageChange.CREATED, MessageChange.EDITED)
+    }
+    # Only the current state of each message is returned, however often it changed
+    messages = list(
+        Message.objects.filter(id__in=message_ids).select_related('sender').order_by('conversation_id', 'created_at')
+    )
+    reads = [
+        {
+            'conversation': change['conversation_id'],
+            'user': change['actor_id'],
+            'read_at': change['created_at'],
+        }
+        for change in changes if change['kind'] == MessageChange.READ
+    ]
+    return messages, reads, issue_token(changes[-1]['seq']), has_more
@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.messaging.models import (
+    ConversationUnreadCounter,
+    UserUnreadCounter,
+)
+from apps.messaging.sync import log_conversation_read
+
+
+def record_message_sent(message):
+    """Increment unread counters of every participant except the sender
+
+    Call inside the transaction that inserts the message.
+    """
+    recipient_ids = list(
+        message.conversation.participants.exclude(id=message.sender_id).values_list('id', flat=True)
+    )
+    with transaction.atomic():
+        # Counters are always locked conversation-first, then user, in id order
+        for user_id in sorted(recipient_ids):
+            _add(ConversationUnreadCounter, {'user_id': user_id, 'conversation_id': message.conversation_id}, 1)
+        for user_id in sorted(recipient_ids):
+            _add(UserUnreadCounter, {'user_id': user_id}, 1)
+
+
+def mark_conversation_read(conversation, user):
+    """Mark every message from other participants as read and return how many changed"""
+    with transaction.atomic():
+        # The total drops by what the conversation counter held, so the two stay in step
+        counter = ConversationUnreadCounter.objects.select_for_update().filter(
+            user=user,
+            conversation=conversation
+        ).first()
+        marked = conversation.messages.filter(is_read=False).exclude(sender=user).update(
+            is_read=True,
+            read_at=timezone.now()
+        )
+        if counter is not None and counter.unread_count:
+            previous = counter.unread_count
+            counter.unread_count = 0
+            counter.save(update_fields=['unread_count'])
+            _add(UserUnreadCounter, {'user_id': user.id}, -previous)
+        if marked:
+            log_conversation_read(conversation, user)
+    return marked
+
+
+def get_unread_total(user):
+    """Badge count for a user: a single primary-key lookup"""
+    total = UserUnreadCounter.objects.filter(pk=user.id).values_list('unread_count', flat=True).first()
+    return total or 0
+
+
+def _add(model, key, delta):
+    queryset = model.objects.filter(**key)
+    updated = queryset.update(unread_count=Greatest(F('unread_count') + delta, Value(0)))
+    if updated or delta < 0:
+        return
+    _, created = model.objects.get_or_create(**key, defaults={'unread_count': delta})
+    if not created:
+        queryset.update(unread_count=F('unread_count') + delta)
+
+
+def forget_unread_messages(conversation, messages):
+    """Drop unread messages that are leaving the hot table from the counters"""
+    unread_by_sender = {}
+    for message in messages:
+        if not message.is_read:
+            unread_by_sender[message.sender_id] = unread_by_sender.get(message.sender_id, 0) + 1
+    if not unread_by_sender:
+        return
+    participant_ids = sorted(conversation.participants.values_list('id', flat=True))
+    deltas = {
+        user_id: sum(n for sender_id, n in unread_by_sender.items() if sender_id != user_id)
+        for user_id in participant_ids
+    }
+    with transaction.atomic():
+        for user_id, delta in deltas.items():
+            if delta:
+                _add(ConversationUnreadCounter, {'user_id': user_id, 'conversation_id': conversation.id}, -delta)
+        for user_id, delta in deltas.items():
+            if delta:
+                _add(UserUnreadCounter, {'user_id': user_id}, -delta)
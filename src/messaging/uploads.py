@@ -0,0 +1,252 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from apps.messaging.models import UploadSession
+from common.blob_storage import SPOOL_SIZE, get_blob_storage
+from common.blobstore import add_reference, release_reference, store_file, store_hashed
+READ_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = getattr(settings, 'MESSAGE_UPLOAD_MAX_CHUNK_SIZE', 8 * 1024 * 1024)
+MAX_UPLOAD_SIZE = getattr(settings, 'MESSAGE_UPLOAD_MAX_SIZE', 200 * 1024 * 1024)
+# Sessions untouched this long are abandoned: in progress, or complete but never attached
+UPLOAD_EXPIRY = timedelta(hours=getattr(settings, 'MESSAGE_UPLOAD_EXPIRY_HOURS', 24))
+# Received chunks are kept in the blob storage, so any host can take the next one
+CHUNK_PREFIX = 'uploads/partial'
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.offset = offset
+
+
+class _HasherCache:
+    """Running SHA-256 per session, keyed by the offset it has consumed
+
+    A worker that did not see the previous chunks (or restarted) has no
+    state; rather than re-reading every stored chunk, the hash is left
+    pending and computed while the blob is assembled on completion.
+    """
+
+    def __init__(self, max_entries=256):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+
+    def take(self, session, offset):
+        """The hasher that has consumed exactly `offset` bytes, or None if the hash is pending"""
+        if offset == 0:
+            return hashlib.sha256()
+        with self._lock:
+            entry = self._entries.pop(session.id, None)
+        if entry is not None and entry[0] == offset:
+            return entry[1]
+        return None
+
+    def put(self, session_id, offset, hasher):
+        with self._lock:
+            self._entries[session_id] = (offset, hasher)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, session_id):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+
+_hashers = _HasherCache()
+
+
+def chunk_name(session, offset):
+    return f'{CHUNK_PREFIX}/{session.id}/{offset:012d}'
+
+
+def create_session(user, filename, total_size, content_type=''):
+    if total_size <= 0 or total_size > MAX_UPLOAD_SIZE:
+        raise UploadError(f'size must be between 1 and {MAX_UPLOAD_SIZE} bytes')
+    return UploadSession.objects.create(
+        user=user,
+        filename=os.path.basename(filename)[:255] or 'attachment',
+        content_type=content_type[:100],
+        total_size=total_size
+    )
+
+
+def append_chunk(session, offset, length, stream):
+    """Stream `length` bytes from `stream` onto the session at `offset`
+
+    The session row stays locked while the chunk is written, so a second
+    request for the same offset is turned away instead of overwriting it.
+    """
+    with transaction.atomic():
+        locked = _lock_session(session)
+        if locked.status != UploadSession.IN_PROGRESS:
+            raise UploadError('Upload is already complete', status=409, offset=locked.received_size)
+        if offset != locked.received_size:
+            raise UploadError('Chunk does not start at the current offset', status=409, offset=locked.received_size)
+        if length <= 0 or length > MAX_CHUNK_SIZE or offset + length > locked.total_size:
+            raise UploadError('Invalid chunk length', offset=locked.received_size)
+
+        hasher = _hashers.take(locked, offset)
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as chunk:
+            written = 0
+            while written < length:
+                block = stream.read(min(READ_SIZE, length - written))
+                if not block:
+                    break
+                chunk.write(block)
+                if hasher is not None:
+                    hasher.update(block)
+                written += len(block)
+            if written != length:
+                raise UploadError('Chunk body is shorter than declared', offset=locked.received_size)
+            storage = get_blob_storage()
+            name = chunk_name(locked, offset)
+            # Drop bytes from an earlier attempt that never got committed
+            storage.delete(name)
+            chunk.seek(0)
+            storage.save(name, File(chunk))
+
+        locked.received_size = offset + length
+        locked.save(update_fields=['received_size', 'updated_at'])
+    session.received_size = locked.received_size
+    if hasher is not None:
+        _hashers.put(session.id, session.received_size, hasher)
+    return session
+
+
+def complete_session(session, expected_sha256=None):
+    """Finish an upload onto a (possibly existing) blob, holding one reference until it is attached"""
+    with transaction.atomic():
+        locked = _lock_session(session)
+        if locked.status == UploadSession.COMPLETE:
+            session.blob, session.status = locked.blob, locked.status
+            return session
+        if locked.received_size != locked.total_size:
+            raise UploadError('Upload is incomplete', status=409, offset=locked.received_size)
+
+        hasher = _hashers.take(locked, locked.received_size)
+        pending = hasher is None
+        if pending:
+            hasher = hashlib.sha256()
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as assembled:
+            # One pass over the stored chunks assembles the blob and, if it
+            # is still pending, computes the hash
+            for block in _read_chunks(locked, locked.total_size):
+                assembled.write(block)
+                if pending:
+                    hasher.update(block)
+            digest = hasher.hexdigest()
+            if expected_sha256 and expected_sha256.lower() != digest:
+                raise UploadError('Content hash does not match sha256')
+            blob = store_hashed(assembled, digest, locked.total_size, os.path.splitext(locked.filename)[1])
+        locked.blob = blob
+        locked.status = UploadSession.COMPLETE
+        locked.save(update_fields=['blob', 'status', 'updated_at'])
+
+    session.blob, session.status = locked.blob, locked.status
+    _hashers.discard(session.id)
+    delete_chunks(session)
+    return session
+
+
+def delete_chunks(session):
+    storage = get_blob_storage()
+    offset = 0
+    names = []
+    while offset < session.total_size:
+        name = chunk_name(session, offset)
+        if not storage.exists(name):
+            break
+        names.append(name)
+        offset += storage.size(name)
+    for name in names:
+        storage.delete(name)
+
+
+def expire_sessions(expiry=UPLOAD_EXPIRY, batch_size=100):
+    """Delete abandoned sessions, releasing their blob reference and stored chunks; returns how many"""
+    cutoff = timezone.now() - expiry
+    expired = 0
+    while True:
+        with transaction.atomic():
+            # Skips sessions a request is completing or attaching right now
+            sessions = list(
+                UploadSession.objects.select_for_update(skip_locked=True)
+                .filter(updated_at__lt=cutoff).order_by('updated_at')[:batch_size]
+            )
+            for session in sessions:
+                release_reference(session.blob_id)
+            UploadSession.objects.filter(pk__in=[session.pk for session in sessions]).delete()
+        for session in sessions:
+            _hashers.discard(session.id)
+            if session.status == UploadSession.IN_PROGRESS:
+                delete_chunks(session)
+        expired += len(sessions)
+        if len(sessions) < batch_size:
+            return expired
+
+
+def _lock_session(session):
+    try:
+        return UploadSession.objects.select_for_update(nowait=True).select_related('blob').get(pk=session.pk)
+    except UploadSession.DoesNotExist:
+        raise UploadError('Upload not found', status=404)
+    except DatabaseError:
+        raise UploadError('Another request is writing this upload', status=409, offset=session.received_size)
+
+
+def _read_chunks(session, up_to):
+    """Yield the stored bytes of `session` from offset 0 to `up_to`, chunk by chunk"""
+    storage = get_blob_storage()
+    offset = 0
+    while offset < up_to:
+        with storage.open(chunk_name(session, offset), 'rb') as chunk:
+            size = 0
+            for block in iter(lambda: chunk.read(READ_SIZE), b''):
+                size += len(block)
+                yield block
+        offset += size
+
+
+def attach_upload(message, session):
+    """Attach a completed upload to a message; the session's blob reference moves to the message"""
+    with transaction.atomic():
+        # Deleted first: a session expired meanwhile no longer owns a reference to hand over
+        if not UploadSession.objects.filter(pk=session.pk).delete()[0]:
+            raise UploadError('Upload has expired', status=410)
+        message.blob = session.blob
+        message.attachment.name = session.blob.file.name
+        message.save(update_fields=['blob', 'attachment'])
+    return message
+
+
+def attach_blob(message, blob):
+    """Point a message at an existing blob (e.g. when forwarding) and take a reference on it"""
+    with transaction.atomic():
+        add_reference(blob)
+        message.blob = blob
+        message.attachment.name = blob.file.name
+        message.save(update_fields=['blob', 'attachment'])
+    return message
+
+
+def attach_file(message, uploaded):
+    """Store a directly uploaded attachment in the blob store; the message takes the new reference"""
+    blob = store_file(uploaded, os.path.splitext(uploaded.name or '')[1])
+    message.blob = blob
+    message.attachment.name = blob.file.name
+    message.save(update_fields=['blob', 'attachment'])
+    return message
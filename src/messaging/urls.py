@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from apps.messaging.views import ConversationViewSet, MessageViewSet
+from apps.messaging.views import ConversationViewSet, MessageViewSet, UploadViewSet
 
 router = DefaultRouter()
 router.register(r'conversations', ConversationViewSet, basename='conversation')
 router.register(r'messages', MessageViewSet, basename='message')
+router.register(r'uploads', UploadViewSet, basename='upload')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -2,37 +2,56 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.db.models import OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 import logging
+import re
 
-from apps.messaging.models import Conversation, Message, MessageNotification
+from apps.messaging.cursors import decode_cursor, encode_cursor
+from apps.messaging.models import Conversation, ConversationUnreadCounter, Message, MessageNotification, UploadSession
+from apps.messaging.retention import archived_history
+from apps.messaging.search import InvalidCursor, get_search_backend
+from apps.messaging.sync import InvalidSyncToken, changes_since, current_token, log_message_created, log_message_edited
+from apps.messaging.unread import get_unread_total, mark_conversation_read, record_message_sent
+from apps.messaging.uploads import (
+    UploadError, append_chunk, attach_blob, attach_file, attach_upload, complete_session, create_session
+)
 from apps.messaging.serializers import (
     ConversationSerializer, ConversationDetailSerializer, MessageSerializer,
     CreateMessageSerializer, MessageNotificationSerializer
 )
 from apps.users.models import Patient, Doctor
 from apps.compliance.models import AuditLog
+from common import audit
 
 logger = logging.getLogger(__name__)
 
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
 class ConversationViewSet(viewsets.ModelViewSet):
     serializer_class = ConversationSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
-        return Conversation.objects.filter(participants=user).order_by('-last_message_at')
+        unread = ConversationUnreadCounter.objects.filter(
+            user=user,
+            conversation=OuterRef('pk')
+        ).values('unread_count')[:1]
+        return Conversation.objects.filter(participants=user).annotate(
+            unread_for_user=Coalesce(Subquery(unread), 0)
+        ).order_by('-last_message_at')
     
     def retrieve(self, request, *args, **kwargs):
         """Get conversation with all messages"""
         conversation = self.get_object()
         
         # Mark all messages as read
-        conversation.messages.filter(is_read=False).exclude(sender=request.user).update(
-            is_read=True,
-            read_at=timezone.now()
-        )
+        mark_conversation_read(conversation, request.user)
+        conversation.unread_for_user = 0
         
         serializer = ConversationDetailSerializer(conversation, context={'request': request})
         return Response(serializer.data)
@@ -81,16 +100,54 @@ class ConversationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        # Attachments can come from a finished chunked upload or be forwarded
+        # from a message the user can already see; both reuse the stored blob
+        upload = None
+        forwarded = None
+        if request.data.get('upload_id'):
+            upload = UploadSession.objects.select_related('blob').filter(
+                id=request.data['upload_id'],
+                user=request.user,
+                status=UploadSession.COMPLETE
+            ).first()
+            if upload is None:
+                return Response({'error': 'Upload not found or not complete'}, status=status.HTTP_400_BAD_REQUEST)
+        elif request.data.get('forward_message_id'):
+            forwarded = Message.objects.select_related('blob').filter(
+                id=request.data['forward_message_id'],
+                conversation__participants=request.user,
+                blob__isnull=False
+            ).first()
+            if forwarded is None:
+                return Response({'error': 'Message to forward not found'}, status=status.HTTP_400_BAD_REQUEST)
+        
         serializer = CreateMessageSerializer(data=request.data)
         if serializer.is_valid():
-            message = serializer.save(
-                sender=request.user,
-                conversation=conversation
-            )
-            
-            # Update conversation last message time
-            conversation.last_message_at = timezone.now()
-            conversation.save()
+            # Direct uploads are stored through the blob store as well, so repeats are deduplicated
+            uploaded = serializer.validated_data.pop('attachment', None)
+            # The message and its unread counters commit together
+            try:
+                with transaction.atomic():
+                    message = serializer.save(
+                        sender=request.user,
+                        conversation=conversation
+                    )
+                    if upload is not None:
+                        attach_upload(message, upload)
+                    elif forwarded is not None:
+                        attach_blob(message, forwarded.blob)
+                    elif uploaded is not None:
+                        attach_file(message, uploaded)
+                    get_search_backend().index_message(message)
+                    record_message_sent(message)
+                    
+                    # Update conversation last message time
+                    conversation.last_message_at = timezone.now()
+                    conversation.save()
+                    # Last, so the change sequence row is locked only briefly
+                    log_message_created(message)
+            except UploadError as exc:
+                return Response({'error': exc.message}, status=exc.status)
             
             # Create notifications for other participants
             for participant in conversation.participants.exclude(id=request.user.id):
@@ -102,7 +159,7 @@ class ConversationViewSet(viewsets.ModelViewSet):
                 )
             
             # Log message
-            AuditLog.objects.create(
+            audit.record(AuditLog(
                 user=request.user,
                 action='modify_phi',
                 resource_type='Message',
@@ -110,7 +167,7 @@ class ConversationViewSet(viewsets.ModelViewSet):
                 description=f'Sent message in conversation {conversation.id}',
                 ip_address=self._get_client_ip(request),
                 user_agent=request.META.get('HTTP_USER_AGENT', '')
-            )
+            ))
             
             return Response(
                 MessageSerializer(message, context={'request': request}).data,
@@ -118,6 +175,50 @@ class ConversationViewSet(viewsets.ModelViewSet):
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """Page backwards through messages, including compacted archive days"""
+        conversation = self.get_object()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 50)), 1), 200)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        # `cursor` continues from the last message returned, ties on created_at
+        # included; `before` starts from a point in time
+        before, before_id = None, None
+        if request.query_params.get('cursor'):
+            after = _decode_unread_cursor(request.query_params['cursor'])
+            if after is None:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            before, before_id = after
+        elif request.query_params.get('before'):
+            before = _parse_aware_datetime(request.query_params['before'])
+            if before is None:
+                return Response({'error': 'before must be an ISO 8601 datetime'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        messages = conversation.messages.select_related('sender').order_by('-created_at', '-id')
+        if before_id is not None:
+            messages = messages.filter(Q(created_at__lt=before) | Q(created_at=before, id__lt=before_id))
+        elif before is not None:
+            messages = messages.filter(created_at__lt=before)
+        page = list(messages[:limit])
+        results = list(MessageSerializer(page, many=True, context={'request': request}).data)
+        last = (page[-1].created_at, page[-1].id) if page else (before, before_id)
+        
+        # Archived days are only decompressed once the hot table is exhausted
+        if len(results) < limit:
+            archived = archived_history(conversation, last[0], limit - len(results), before_id=last[1])
+            results += archived
+            if archived:
+                last = (parse_datetime(archived[-1]['created_at']), archived[-1]['id'])
+        
+        next_cursor = None
+        next_before = None
+        if len(results) == limit:
+            next_cursor = encode_cursor(last[0].isoformat(), last[1])
+            next_before = results[-1]['created_at']
+        return Response({'results': results, 'next_cursor': next_cursor, 'next_before': next_before})
+    
     @action(detail=True, methods=['post'])
     def archive(self, request, pk=None):
         """Archive a conversation"""
@@ -151,11 +252,7 @@ class ConversationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get total unread message count"""
-        unread_count = Message.objects.filter(
-            conversation__participants=request.user,
-            is_read=False
-        ).exclude(sender=request.user).count()
-        return Response({'unread_count': unread_count})
+        return Response({'unread_count': get_unread_total(request.user)})
     
     def _get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -168,26 +265,223 @@ class MessageViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'])
     def unread(self, request):
-        """Get all unread messages"""
+        """Get unread messages, newest first, with keyset pagination via `cursor`"""
+        try:
+            limit = min(max(int(request.query_params.get('limit', 50)), 1), 100)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Only conversations with a non-zero counter are visited, each through
+        # the partial index on unread messages
+        conversations_with_unread = ConversationUnreadCounter.objects.filter(
+            user=request.user,
+            unread_count__gt=0
+        ).values('conversation_id')
         messages = Message.objects.filter(
-            conversation__participants=request.user,
+            conversation_id__in=conversations_with_unread,
             is_read=False
-        ).exclude(sender=request.user).order_by('-created_at')
+        ).exclude(sender=request.user).select_related('sender').order_by('-created_at', '-id')
         
-        serializer = MessageSerializer(messages, many=True, context={'request': request})
-        return Response(serializer.data)
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            after = _decode_unread_cursor(cursor)
+            if after is None:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            created_at, message_id = after
+            messages = messages.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=message_id)
+            )
+        
+        page = list(messages[:limit + 1])
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1].created_at.isoformat(), page[-1].id)
+        
+        serializer = MessageSerializer(page, many=True, context={'request': request})
+        return Response({'results': serializer.data, 'next_cursor': next_cursor})
     
     @action(detail=False, methods=['get'])
     def search(self, request):
-        """Search messages"""
+        """Search messages, ranked, with keyset pagination via `cursor`"""
         query = request.query_params.get('q', '')
         if not query or len(query) < 3:
             return Response({'error': 'Search query must be at least 3 characters'})
         
-        messages = Message.objects.filter(
-            conversation__participants=request.user,
-            content__icontains=query
-        ).order_by('-created_at')[:50]
+        try:
+            limit = min(max(int(request.query_params.get('limit', 50)), 1), 100)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            messages, next_cursor = get_search_backend().search(
+                request.user,
+                query,
+                limit=limit,
+                cursor=request.query_params.get('cursor')
+            )
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = MessageSerializer(messages, many=True, context={'request': request})
-        return Response(serializer.data)
+        return Response({'results': serializer.data, 'next_cursor': next_cursor})
+    
+    @action(detail=True, methods=['patch'])
+    def edit(self, request, pk=None):
+        """Edit the content of one of your own messages"""
+        try:
+            message = Message.objects.select_related('sender').get(pk=pk, sender=request.user)
+        except Message.DoesNotExist:
+            return Response({'error': 'Message not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        content = (request.data.get('content') or '').strip()
+        if not content:
+            return Response({'error': 'content is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # The edit, its search postings and its sync change commit together;
+        # the change is logged last to keep the sequence row locked briefly
+        with transaction.atomic():
+            message.content = content
+            message.edited_at = timezone.now()
+            message.save(update_fields=['content', 'edited_at'])
+            get_search_backend().index_message(message)
+            log_message_edited(message)
+        return Response(MessageSerializer(message, context={'request': request}).data)
+    
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """Changes across all conversations since a server-issued sync token
+        
+        Without `since`, only the current token is returned; clients fetch
+        their conversations once and then keep calling sync with it.
+        """
+        since = request.query_params.get('since')
+        if not since:
+            return Response({'sync_token': current_token(), 'has_more': False, 'messages': [], 'reads': []})
+        
+        try:
+            messages, reads, token, has_more = changes_since(request.user, since)
+        except InvalidSyncToken:
+            return Response(
+                {'error': 'Invalid sync token; fetch conversations again'},
+                status=status.HTTP_410_GONE
+            )
+        
+        serialized = []
+        for message in messages:
+            data = MessageSerializer(message, context={'request': request}).data
+            data['conversation'] = message.conversation_id
+            serialized.append(data)
+        return Response({'sync_token': token, 'has_more': has_more, 'messages': serialized, 'reads': reads})
+
+class UploadViewSet(viewsets.ViewSet):
+    """Chunked, resumable attachment uploads
+
+    POST creates a session, PUT appends a chunk described by Content-Range,
+    GET returns the offset to resume from and POST complete finalizes it.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def create(self, request):
+        """Start an upload"""
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({'error': 'size must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            session = create_session(
+                request.user,
+                request.data.get('filename', ''),
+                size,
+                request.data.get('content_type', '')
+            )
+        except UploadError as exc:
+            return self._upload_error(exc)
+        return Response(self._state(session), status=status.HTTP_201_CREATED)
+    
+    def retrieve(self, request, pk=None):
+        """Get the offset to resume from"""
+        session = self._get_session(request, pk)
+        if session is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self._state(session))
+    
+    def update(self, request, pk=None):
+        """Append one chunk; the body is streamed into the shared upload storage"""
+        session = self._get_session(request, pk)
+        if session is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        match = CONTENT_RANGE_RE.match(request.META.get('HTTP_CONTENT_RANGE', ''))
+        if not match:
+            return Response(
+                {'error': 'Content-Range: bytes <start>-<end>/<total> is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        start, end, total = (int(value) for value in match.groups())
+        if total != session.total_size or end < start:
+            return Response({'error': 'Content-Range does not match this upload'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            append_chunk(session, start, end - start + 1, request.stream)
+        except UploadError as exc:
+            return self._upload_error(exc)
+        return Response(self._state(session))
+    
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """Finish the upload, deduplicating by content hash"""
+        session = self._get_session(request, pk)
+        if session is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            complete_session(session, expected_sha256=request.data.get('sha256'))
+        except UploadError as exc:
+            return self._upload_error(exc)
+        return Response(self._state(session))
+    
+    def _get_session(self, request, pk):
+        return UploadSession.objects.select_related('blob').filter(id=pk, user=request.user).first()
+    
+    def _state(self, session):
+        return {
+            'id': session.id,
+            'filename': session.filename,
+            'size': session.total_size,
+            'offset': session.received_size,
+            'status': session.status,
+            'sha256': session.blob.sha256 if session.blob else None,
+        }
+    
+    def _upload_error(self, exc):
+        body = {'error': exc.message}
+        if exc.offset is not None:
+            body['offset'] = exc.offset
+        return Response(body, status=exc.status)
+
+
+def _decode_unread_cursor(cursor):
+    """(created_at, id) from a message-page cursor, or None if it is malformed"""
+    values = decode_cursor(cursor, 2)
+    if values is None or not isinstance(values[0], str) or isinstance(values[1], bool):
+        return None
+    try:
+        message_id = int(values[1])
+    except (TypeError, ValueError):
+        return None
+    created_at = _parse_aware_datetime(values[0])
+    if created_at is None:
+        return None
+    return created_at, message_id
+
+
+def _parse_aware_datetime(value):
+    """Parse an ISO 8601 datetime; naive values are taken in the current time zone"""
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
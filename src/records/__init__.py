@@ -0,0 +1 @@
+"""Records app package."""
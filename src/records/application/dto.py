@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from records.domain.entities import AccessEvent, AccessSummaryRow, RecordSearchHit
+
+
+@dataclass(frozen=True)
+class DownloadRecordRequest:
+    user_id: str
+    user_role: str
+    record_id: str
+
+
+@dataclass(frozen=True)
+class AccessReportRequest:
+    user_id: str
+    user_role: str
+    patient_id: str
+    start: date
+    end: date
+    by_day: bool = False
+
+
+@dataclass(frozen=True)
+class AccessReportResult:
+    rows: List[AccessSummaryRow]
+    rolled_up_through: Optional[datetime]
+
+
+@dataclass(frozen=True)
+class AccessEventsRequest:
+    user_id: str
+    user_role: str
+    patient_id: str
+    start: datetime
+    end: datetime
+    limit: int = 100
+    cursor: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class AccessEventsResult:
+    events: List[AccessEvent]
+    next_cursor: Optional[str]
+
+
+@dataclass(frozen=True)
+class HealthSummaryRequest:
+    user_id: str
+    user_role: str
+    patient_id: str
+
+
+@dataclass(frozen=True)
+class RecordSearchRequest:
+    user_id: str
+    user_role: str
+    patient_id: str
+    text: str = ""
+    record_type: str = ""
+    metadata: Optional[Dict[str, Any]] = None
+    limit: int = 50
+    cursor: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RecordSearchResult:
+    records: List[RecordSearchHit]
+    next_cursor: Optional[str]
+
+
+class RecordError(Exception):
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        details: Optional[dict] = None,
+        status: int = 400,
+    ) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details or {}
+        self.status = status
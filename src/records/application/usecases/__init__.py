@@ -0,0 +1,12 @@
+from records.application.usecases.access_report import GetAccessEventsUseCase, GetAccessReportUseCase
+from records.application.usecases.download_record import DownloadRecordUseCase
+from records.application.usecases.health_summary import GetHealthSummaryUseCase
+from records.application.usecases.search_records import SearchRecordsUseCase
+
+__all__ = [
+    "DownloadRecordUseCase",
+    "GetAccessEventsUseCase",
+    "GetAccessReportUseCase",
+    "GetHealthSummaryUseCase",
+    "SearchRecordsUseCase",
+]
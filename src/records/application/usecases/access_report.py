@@ -0,0 +1,87 @@
+import base64
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from records.application.dto import (
+    AccessEventsRequest,
+    AccessEventsResult,
+    AccessReportRequest,
+    AccessReportResult,
+    RecordError,
+)
+from records.domain.repositories import RecordAccessReportRepository
+
+MAX_REPORT_DAYS = 400
+# Drill-down reads the raw log, so keep its window narrow
+MAX_EVENTS_WINDOW = timedelta(days=7)
+
+
+class GetAccessReportUseCase:
+    def __init__(self, report_repository: RecordAccessReportRepository) -> None:
+        self.report_repository = report_repository
+
+    def execute(self, request: AccessReportRequest) -> AccessReportResult:
+        _authorize(request.user_id, request.user_role, request.patient_id)
+        if request.end < request.start or (request.end - request.start).days > MAX_REPORT_DAYS:
+            raise RecordError(
+                code="invalid_range",
+                message=f"Report range must be ordered and at most {MAX_REPORT_DAYS} days.",
+                details={},
+                status=400,
+            )
+        rows = self.report_repository.summarize(request.patient_id, request.start, request.end, request.by_day)
+        return AccessReportResult(rows=rows, rolled_up_through=self.report_repository.rolled_up_through())
+
+
+class GetAccessEventsUseCase:
+    def __init__(self, report_repository: RecordAccessReportRepository) -> None:
+        self.report_repository = report_repository
+
+    def execute(self, request: AccessEventsRequest) -> AccessEventsResult:
+        _authorize(request.user_id, request.user_role, request.patient_id)
+        if request.end <= request.start or request.end - request.start > MAX_EVENTS_WINDOW:
+            raise RecordError(
+                code="invalid_range",
+                message="Drill-down windows must be ordered and at most 7 days.",
+                details={},
+                status=400,
+            )
+        after = None
+        if request.cursor:
+            after = _decode_cursor(request.cursor)
+            if after is None:
+                raise RecordError(code="invalid_cursor", message="Invalid cursor.", details={}, status=400)
+
+        events = self.report_repository.events(
+            request.patient_id, request.start, request.end, request.limit + 1, after
+        )
+        next_cursor = None
+        if len(events) > request.limit:
+            events = events[: request.limit]
+            next_cursor = _encode_cursor(events[-1].created_at, events[-1].id)
+        return AccessEventsResult(events=events, next_cursor=next_cursor)
+
+
+def _authorize(user_id: str, user_role: str, patient_id: str) -> None:
+    if user_role != "admin" and user_id != patient_id:
+        raise RecordError(
+            code="forbidden",
+            message="You cannot view access reports for this patient.",
+            details={"patientId": patient_id},
+            status=403,
+        )
+
+
+def _encode_cursor(created_at: datetime, event_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[datetime, str]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, event_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), str(uuid.UUID(event_id))
+    except (ValueError, UnicodeDecodeError):
+        return None
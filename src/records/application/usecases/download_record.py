@@ -0,0 +1,65 @@
+from records.application.dto import DownloadRecordRequest, RecordError
+from records.domain.entities import MedicalRecord, RecordAccess
+from records.domain.repositories import MedicalRecordRepository, RecordAccessLogger
+from records.domain.value_objects import MedicalRecordStatus, RecordAccessAction
+
+
+class DownloadRecordUseCase:
+    def __init__(
+        self,
+        record_repository: MedicalRecordRepository,
+        access_logger: RecordAccessLogger,
+    ) -> None:
+        self.record_repository = record_repository
+        self.access_logger = access_logger
+
+    def execute(self, request: DownloadRecordRequest) -> MedicalRecord:
+        record = self.record_repository.get_by_id(request.record_id)
+        if record is None or record.status == MedicalRecordStatus.DELETED:
+            raise RecordError(
+                code="record_not_found",
+                message="Medical record not found.",
+                details={"recordId": request.record_id},
+                status=404,
+            )
+        # The record's author, or anyone who may view the patient's records
+        if request.user_id != record.created_by_id and not self.record_repository.can_view(
+            request.user_id, request.user_role, record.patient_id
+        ):
+            raise RecordError(
+                code="forbidden",
+                message="You cannot access this medical record.",
+                details={"recordId": record.id},
+                status=403,
+            )
+        if not record.file_name and not record.file_url:
+            raise RecordError(
+                code="file_not_found",
+                message="This medical record has no file.",
+                details={"recordId": record.id},
+                status=404,
+            )
+
+        if record.file_name and record.file_size is None:
+            # Not yet backfilled; storage metadata is enough to serve ranges
+            sized = self.record_repository.with_file_size(record)
+            if sized is None:
+                raise stored_file_missing(record)
+            record = sized
+        return record
+
+    def log_download(self, request: DownloadRecordRequest, record: MedicalRecord) -> None:
+        """Record one DOWNLOAD access; call it for a full or initial fetch, not for every range or 304."""
+        # Queued, not written: the download never waits on the access log
+        self.access_logger.log(
+            RecordAccess(record_id=record.id, user_id=request.user_id, action=RecordAccessAction.DOWNLOAD)
+        )
+
+
+def stored_file_missing(record: MedicalRecord) -> RecordError:
+    return RecordError(
+        code="file_not_found",
+        message="The file for this medical record is no longer available.",
+        details={"recordId": record.id},
+        status=410,
+    )
@@ -0,0 +1,37 @@
+import uuid
+
+from records.application.dto import HealthSummaryRequest, RecordError
+from records.domain.entities import PatientHealthSummary
+from records.domain.repositories import HealthSummaryRepository
+
+
+class GetHealthSummaryUseCase:
+    def __init__(self, summary_repository: HealthSummaryRepository) -> None:
+        self.summary_repository = summary_repository
+
+    def execute(self, request: HealthSummaryRequest) -> PatientHealthSummary:
+        try:
+            uuid.UUID(request.patient_id)
+        except ValueError:
+            raise RecordError(
+                code="patient_not_found",
+                message="Patient not found.",
+                details={"patientId": request.patient_id},
+                status=404,
+            )
+        if not self.summary_repository.can_view(request.user_id, request.user_role, request.patient_id):
+            raise RecordError(
+                code="forbidden",
+                message="You cannot view this patient's health summary.",
+                details={"patientId": request.patient_id},
+                status=403,
+            )
+        summary = self.summary_repository.get_for_patient(request.patient_id)
+        if summary is None:
+            return PatientHealthSummary(
+                patient_id=request.patient_id,
+                summary_text="",
+                updated_at=None,
+                is_stale=False,
+            )
+        return summary
@@ -0,0 +1,91 @@
+import base64
+import re
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from records.application.dto import RecordError, RecordSearchRequest, RecordSearchResult
+from records.domain.entities import RecordSearchCriteria
+from records.domain.repositories import RecordSearchRepository
+
+# Shorter fragments have no trigram to look up and would scan the patient's records
+MIN_TEXT_LENGTH = 3
+MAX_TEXT_LENGTH = 255
+MAX_METADATA_KEYS = 10
+METADATA_KEY_RE = re.compile(r"^(?!.*__)[A-Za-z0-9_.-]{1,64}$")
+
+
+class SearchRecordsUseCase:
+    def __init__(self, search_repository: RecordSearchRepository) -> None:
+        self.search_repository = search_repository
+
+    def execute(self, request: RecordSearchRequest) -> RecordSearchResult:
+        try:
+            uuid.UUID(request.patient_id)
+        except ValueError:
+            raise RecordError(
+                code="patient_not_found",
+                message="Patient not found.",
+                details={"patientId": request.patient_id},
+                status=404,
+            )
+        if not self.search_repository.can_view(request.user_id, request.user_role, request.patient_id):
+            raise RecordError(
+                code="forbidden",
+                message="You cannot search this patient's records.",
+                details={"patientId": request.patient_id},
+                status=403,
+            )
+
+        text = request.text.strip()
+        if text and not MIN_TEXT_LENGTH <= len(text) <= MAX_TEXT_LENGTH:
+            raise RecordError(
+                code="invalid_query",
+                message=f"Search text must be {MIN_TEXT_LENGTH} to {MAX_TEXT_LENGTH} characters.",
+                details={"q": text},
+                status=400,
+            )
+        if request.metadata is not None and (
+            not isinstance(request.metadata, dict)
+            or not 0 < len(request.metadata) <= MAX_METADATA_KEYS
+            or not all(METADATA_KEY_RE.match(key) for key in request.metadata)
+        ):
+            raise RecordError(
+                code="invalid_query",
+                message=f"metadata must be a JSON object with 1 to {MAX_METADATA_KEYS} simple keys.",
+                details={},
+                status=400,
+            )
+
+        after = None
+        if request.cursor:
+            after = _decode_cursor(request.cursor)
+            if after is None:
+                raise RecordError(code="invalid_cursor", message="Invalid cursor.", details={}, status=400)
+
+        criteria = RecordSearchCriteria(
+            patient_id=request.patient_id,
+            text=text,
+            record_type=request.record_type.strip(),
+            metadata=request.metadata,
+        )
+        records = self.search_repository.search(criteria, request.limit + 1, after)
+        next_cursor = None
+        if len(records) > request.limit:
+            records = records[: request.limit]
+            next_cursor = _encode_cursor(records[-1].created_at, records[-1].id)
+        return RecordSearchResult(records=records, next_cursor=next_cursor)
+
+
+def _encode_cursor(created_at: datetime, record_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{record_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[datetime, str]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, record_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), str(uuid.UUID(record_id))
+    except (ValueError, UnicodeDecodeError):
+        return None
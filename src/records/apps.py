@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+
+
+class RecordsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "records"
+
+    def ready(self) -> None:
+        from django.db.models.signals import post_delete, post_save, pre_save
+
+        from common.blobstore import release_on_delete
+        from records.infrastructure import models
+        from records.infrastructure.file_digest import stamp_file_digest
+        from records.infrastructure.health_summary import record_changed
+
+        # Record writes only flag the patient's summary; the batch job recomputes it
+        post_save.connect(record_changed, sender=models.MedicalRecord, dispatch_uid="records.summary_dirty_save")
+        post_delete.connect(record_changed, sender=models.MedicalRecord, dispatch_uid="records.summary_dirty_delete")
+        post_delete.connect(release_on_delete, sender=models.MedicalRecord, dispatch_uid="records.blob_release")
+        # Digests are computed when a file is written, never on the download path
+        pre_save.connect(stamp_file_digest, sender=models.MedicalRecord, dispatch_uid="records.file_digest")
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from records.domain.value_objects import MedicalRecordStatus, RecordAccessAction
+
+
+@dataclass(frozen=True)
+class MedicalRecord:
+    id: str
+    patient_id: str
+    created_by_id: str
+    title: str
+    status: MedicalRecordStatus
+    file_name: str
+    file_url: str
+    file_size: Optional[int]
+    file_sha256: str
+    updated_at: datetime
+    in_blob_store: bool = False
+
+
+@dataclass(frozen=True)
+class RecordAccess:
+    record_id: str
+    user_id: str
+    action: RecordAccessAction
+
+
+@dataclass(frozen=True)
+class AccessSummaryRow:
+    accessed_by_id: str
+    accessed_by_name: str
+    action: RecordAccessAction
+    count: int
+    first_at: datetime
+    last_at: datetime
+    day: Optional[date] = None
+
+
+@dataclass(frozen=True)
+class AccessEvent:
+    id: str
+    record_id: str
+    record_title: str
+    accessed_by_id: str
+    action: RecordAccessAction
+    created_at: datetime
+
+
+@dataclass(frozen=True)
+class PatientHealthSummary:
+    patient_id: str
+    summary_text: str
+    updated_at: Optional[datetime]
+    is_stale: bool
+
+
+@dataclass(frozen=True)
+class RecordSearchCriteria:
+    patient_id: str
+    text: str = ""
+    record_type: str = ""
+    metadata: Optional[Dict[str, Any]] = None
+
+
+@dataclass(frozen=True)
+class RecordSearchHit:
+    id: str
+    title: str
+    record_type: str
+    metadata: Dict[str, Any]
+    created_at: datetime
@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from records.domain.entities import (
+    AccessEvent,
+    AccessSummaryRow,
+    MedicalRecord,
+    PatientHealthSummary,
+    RecordAccess,
+    RecordSearchCriteria,
+    RecordSearchHit,
+)
+
+
+class MedicalRecordRepository(ABC):
+    @abstractmethod
+    def get_by_id(self, record_id: str) -> Optional[MedicalRecord]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def with_file_size(self, record: MedicalRecord) -> Optional[MedicalRecord]:
+        """Return the record with file_size read from storage metadata, or None if the file is missing."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def can_view(self, user_id: str, user_role: str, patient_id: str) -> bool:
+        raise NotImplementedError
+
+
+class RecordAccessLogger(ABC):
+    @abstractmethod
+    def log(self, access: RecordAccess) -> None:
+        raise NotImplementedError
+
+
+class RecordAccessReportRepository(ABC):
+    @abstractmethod
+    def summarize(self, patient_id: str, start: date, end: date, by_day: bool) -> List[AccessSummaryRow]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def events(
+        self,
+        patient_id: str,
+        start: datetime,
+        end: datetime,
+        limit: int,
+        after: Optional[Tuple[datetime, str]],
+    ) -> List[AccessEvent]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def rolled_up_through(self) -> Optional[datetime]:
+        raise NotImplementedError
+
+
+class HealthSummaryRepository(ABC):
+    @abstractmethod
+    def get_for_patient(self, patient_id: str) -> Optional[PatientHealthSummary]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def can_view(self, user_id: str, user_role: str, patient_id: str) -> bool:
+        raise NotImplementedError
+
+
+class RecordSearchRepository(ABC):
+    @abstractmethod
+    def search(
+        self,
+        criteria: RecordSearchCriteria,
+        limit: int,
+        after: Optional[Tuple[datetime, str]],
+    ) -> List[RecordSearchHit]:
+        """ACTIVE records matching every given criterion, newest first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def can_view(self, user_id: str, user_role: str, patient_id: str) -> bool:
+        raise NotImplementedError
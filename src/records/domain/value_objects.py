@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class MedicalRecordStatus(str, Enum):
+    ACTIVE = "ACTIVE"
+    ARCHIVED = "ARCHIVED"
+    DELETED = "DELETED"
+
+
+class RecordAccessAction(str, Enum):
+    VIEW = "VIEW"
+    DOWNLOAD = "DOWNLOAD"
+    EDIT = "EDIT"
+    DELETE = "DELETE"
@@ -0,0 +1,23 @@
+from common.audit import BufferedBulkWriter, get_writer
+from records.domain.entities import RecordAccess
+from records.domain.repositories import RecordAccessLogger
+from records.infrastructure.models import RecordAccessLog
+
+WRITER_NAME = "record_access"
+
+
+def record_access_writer() -> BufferedBulkWriter:
+    return get_writer(WRITER_NAME)
+
+
+class BufferedRecordAccessLogger(RecordAccessLogger):
+    """Queues RecordAccessLog rows in the record_access writer; they are bulk inserted off the request path."""
+
+    def log(self, access: RecordAccess) -> None:
+        record_access_writer().enqueue(
+            RecordAccessLog(
+                record_id=access.record_id,
+                accessed_by_id=access.user_id,
+                action=access.action.value,
+            )
+        )
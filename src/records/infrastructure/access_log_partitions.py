@@ -0,0 +1,245 @@
+import csv
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timezone as dt_timezone
+from typing import BinaryIO, List, Optional, TextIO
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from records.infrastructure.models import RecordAccessLog
+
+logger = logging.getLogger(__name__)
+
+TABLE = RecordAccessLog._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+EXPORT_COLUMNS = ["id", "record_id", "accessed_by_id", "action", "created_at"]
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    month: date
+
+
+def is_supported() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def install_partitioning(months_ahead: int = 3) -> None:
+    """Rebuild the single table as a monthly RANGE-partitioned table (PostgreSQL).
+
+    Existing rows are copied into their month partitions. The table is
+    locked for the duration, so run it in a maintenance window.
+    """
+    if is_partitioned():
+        ensure_partitions(months_ahead)
+        return
+
+    legacy = f"{TABLE}_unpartitioned"
+    record_field = RecordAccessLog._meta.get_field("record")
+    user_field = RecordAccessLog._meta.get_field("accessed_by")
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(f"SELECT min(created_at), max(created_at) FROM {TABLE}")
+        oldest, newest = cursor.fetchone()
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {legacy}")
+        cursor.execute(f"CREATE TABLE {TABLE} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+
+        current = _utc_month(timezone.now())
+        month = _utc_month(oldest) if oldest else current
+        last = max(add_months(current, months_ahead), _utc_month(newest) if newest else current)
+        while month <= last:
+            _create_partition(cursor, month)
+            month = add_months(month, 1)
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {legacy}")
+        cursor.execute(f"DROP TABLE {legacy}")
+
+        # The partition key must be part of the primary key
+        cursor.execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, created_at)")
+        for field in (record_field, user_field):
+            target = field.related_model._meta
+            cursor.execute(
+                f"ALTER TABLE {TABLE} ADD FOREIGN KEY ({field.column}) "
+                f"REFERENCES {target.db_table} ({target.pk.column}) DEFERRABLE INITIALLY DEFERRED"
+            )
+        cursor.execute(f"CREATE INDEX {TABLE}_record_created ON {TABLE} (record_id, created_at)")
+        cursor.execute(f"CREATE INDEX {TABLE}_user_created ON {TABLE} (accessed_by_id, created_at)")
+        # Tiny on an append-only table; serves the time-window scans of the rollup job
+        cursor.execute(f"CREATE INDEX {TABLE}_created_brin ON {TABLE} USING brin (created_at)")
+    logger.info("Partitioned %s by month", TABLE)
+
+
+def ensure_partitions(months_ahead: int = 3, now: Optional[datetime] = None) -> List[str]:
+    """Create partitions for the current month and ``months_ahead`` after it."""
+    current = _utc_month(now or timezone.now())
+    existing = {partition.month for partition in list_partitions()}
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month not in existing:
+                _create_partition(cursor, month)
+                created.append(partition_name(month))
+    return created
+
+
+def list_partitions() -> List[Partition]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE parent.relname = %s ORDER BY child.relname",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    prefix = f"{TABLE}_p"
+    return [
+        Partition(name=name, month=date(int(name[-6:-2]), int(name[-2:]), 1))
+        for name in names
+        if name.startswith(prefix) and name[len(prefix):].isdigit()
+    ]
+
+
+def export_partition(partition: Partition, stream: BinaryIO) -> None:
+    """Stream one partition as CSV with COPY."""
+    _copy_out(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM {partition.name} ORDER BY created_at", stream)
+
+
+def has_default_rows_before(month: date) -> bool:
+    """Whether rows older than ``month`` are stranded in the default partition."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [DEFAULT_PARTITION])
+        if cursor.fetchone()[0] is None:
+            return False
+        cursor.execute(f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at < {_bound(month)} LIMIT 1")
+        return cursor.fetchone() is not None
+
+
+def export_default_before(month: date, stream: BinaryIO) -> None:
+    """Stream the default partition's rows older than ``month`` as CSV with COPY."""
+    _copy_out(
+        f"SELECT {', '.join(EXPORT_COLUMNS)} FROM {DEFAULT_PARTITION} "
+        f"WHERE created_at < {_bound(month)} ORDER BY created_at",
+        stream,
+    )
+
+
+def delete_default_before(month: date, batch_size: int = 5000) -> int:
+    """Delete the default partition's rows older than ``month`` in short batched transactions.
+
+    Months that never had a partition of their own (written before
+    ``ensure_partitions`` reached them) have nothing to drop, so their rows
+    are retired here.
+    """
+    deleted = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {DEFAULT_PARTITION} WHERE ctid IN "
+                f"(SELECT ctid FROM {DEFAULT_PARTITION} WHERE created_at < {_bound(month)} LIMIT %s)",
+                [batch_size],
+            )
+            if not cursor.rowcount:
+                return deleted
+            deleted += cursor.rowcount
+
+
+def drop_partition(partition: Partition) -> None:
+    """Detach and drop a month; metadata-only, independent of its row count."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {partition.name}")
+        cursor.execute(f"DROP TABLE {partition.name}")
+
+
+def partitions_before(month: date) -> List[Partition]:
+    return [partition for partition in list_partitions() if partition.month < month]
+
+
+def export_rows_before(cutoff: datetime, stream: TextIO, chunk_size: int = 5000) -> int:
+    """Single-table fallback for exports."""
+    writer = csv.writer(stream)
+    writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    rows = RecordAccessLog.objects.filter(created_at__lt=cutoff).order_by("created_at").values_list(*EXPORT_COLUMNS)
+    for row in rows.iterator(chunk_size=chunk_size):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def delete_rows_before(cutoff: datetime, batch_size: int = 5000) -> int:
+    """Single-table fallback for retention, in short batched transactions."""
+    deleted = 0
+    while True:
+        ids = list(RecordAccessLog.objects.filter(created_at__lt=cutoff).values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += RecordAccessLog.objects.filter(pk__in=ids).delete()[0]
+
+
+def _create_partition(cursor, month: date) -> None:
+    name = partition_name(month)
+    lower, upper = _bound(month), _bound(add_months(month, 1))
+    cursor.execute("SELECT to_regclass(%s)", [DEFAULT_PARTITION])
+    rows_in_default = False
+    if cursor.fetchone()[0] is not None:
+        cursor.execute(
+            f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= {lower} AND created_at < {upper} LIMIT 1"
+        )
+        rows_in_default = cursor.fetchone() is not None
+    if not rows_in_default:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE} FOR VALUES FROM ({lower}) TO ({upper})"
+        )
+        return
+
+    # Rows for this month already landed in the default partition: move them over
+    cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+    cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM ({lower}) TO ({upper})")
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= {lower} AND created_at < {upper} "
+        f"RETURNING *) INSERT INTO {TABLE} SELECT * FROM moved"
+    )
+    cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+
+
+def _copy_out(query: str, stream: BinaryIO) -> None:
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)") as copy:
+            for block in copy:
+                stream.write(block)
+
+
+def _utc_month(value: datetime) -> date:
+    return month_start(value.astimezone(dt_timezone.utc).date())
+
+
+def _bound(month: date) -> str:
+    # Formatted from a date, so safe to inline into DDL
+    return f"'{month.isoformat()} 00:00:00+00'"
@@ -0,0 +1,87 @@
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max, Min, Q, Sum
+
+from records.domain.entities import AccessEvent, AccessSummaryRow
+from records.domain.repositories import RecordAccessReportRepository
+from records.domain.value_objects import RecordAccessAction
+from records.infrastructure.access_rollup import CHECKPOINT
+from records.infrastructure.models import (
+    MedicalRecord,
+    RecordAccessDaily,
+    RecordAccessLog,
+    RecordAccessRollupCheckpoint,
+)
+
+
+class DjangoRecordAccessReportRepository(RecordAccessReportRepository):
+    def summarize(self, patient_id: str, start: date, end: date, by_day: bool) -> List[AccessSummaryRow]:
+        # Served entirely by the daily rollup (patient, day) index
+        keys = ["accessed_by_id", "action"] + (["day"] if by_day else [])
+        rows = list(
+            RecordAccessDaily.objects.filter(patient_id=patient_id, day__gte=start, day__lte=end)
+            .values(*keys)
+            .annotate(total=Sum("count"), first=Min("first_at"), last=Max("last_at"))
+            .order_by(*(["day"] if by_day else []), "-total", "accessed_by_id", "action")
+        )
+        users = get_user_model().objects.only("id", "name", "email").in_bulk(
+            {row["accessed_by_id"] for row in rows}
+        )
+        return [
+            AccessSummaryRow(
+                accessed_by_id=str(row["accessed_by_id"]),
+                accessed_by_name=_display_name(users.get(row["accessed_by_id"])),
+                action=RecordAccessAction(row["action"]),
+                count=row["total"],
+                first_at=row["first"],
+                last_at=row["last"],
+                day=row.get("day"),
+            )
+            for row in rows
+        ]
+
+    def events(
+        self,
+        patient_id: str,
+        start: datetime,
+        end: datetime,
+        limit: int,
+        after: Optional[Tuple[datetime, str]],
+    ) -> List[AccessEvent]:
+        # record_id IN (...) plus the time range lets each record use (record, created_at)
+        logs = RecordAccessLog.objects.filter(
+            record_id__in=MedicalRecord.objects.filter(patient_id=patient_id).values("pk"),
+            created_at__gte=start,
+            created_at__lt=end,
+        )
+        if after is not None:
+            logs = logs.filter(Q(created_at__gt=after[0]) | Q(created_at=after[0], id__gt=after[1]))
+        logs = logs.select_related("record").only(
+            "id", "record_id", "record__title", "accessed_by_id", "action", "created_at"
+        ).order_by("created_at", "id")[:limit]
+        return [
+            AccessEvent(
+                id=str(log.id),
+                record_id=str(log.record_id),
+                record_title=log.record.title,
+                accessed_by_id=str(log.accessed_by_id),
+                action=RecordAccessAction(log.action),
+                created_at=log.created_at,
+            )
+            for log in logs
+        ]
+
+    def rolled_up_through(self) -> Optional[datetime]:
+        return (
+            RecordAccessRollupCheckpoint.objects.filter(name=CHECKPOINT)
+            .values_list("last_created_at", flat=True)
+            .first()
+        )
+
+
+def _display_name(user) -> str:
+    if user is None:
+        return ""
+    return user.name or user.email
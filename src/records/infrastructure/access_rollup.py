@@ -0,0 +1,155 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min
+from django.db.models.functions import Greatest, Least, TruncDate
+from django.utils import timezone
+
+from records.infrastructure.models import (
+    RecordAccessDaily,
+    RecordAccessLog,
+    RecordAccessRollupCheckpoint,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT = "record_access_daily"
+# Buffered writers stamp created_at at flush time; give in-flight batches time to commit
+SETTLE_DELAY = timedelta(seconds=60)
+# created_at is stamped at INSERT, not commit, so a slow flush can become
+# visible behind the watermark; groups seen this far behind it are recounted
+RECOUNT_WINDOW = timedelta(minutes=15)
+
+
+@dataclass
+class RollupResult:
+    windows: int = 0
+    groups: int = 0
+    rows: int = 0
+    recounted: int = 0
+
+
+def rollup_access_logs(
+    window: timedelta = timedelta(hours=1),
+    now: Optional[datetime] = None,
+    recount: timedelta = RECOUNT_WINDOW,
+) -> RollupResult:
+    """Fold new RecordAccessLog rows into RecordAccessDaily.
+
+    Rows are consumed in (watermark, watermark + window] slices, each grouped
+    by the database and applied in the same transaction that advances the
+    watermark. The watermark is app-clock ``created_at``, which is stamped
+    before the row commits, so a row committed more than ``SETTLE_DELAY``
+    after it was stamped can fall behind it. To catch those, every run then
+    recounts, absolutely and for the whole day, each group with rows in the
+    ``recount`` window behind the watermark. A row whose commit lags its
+    ``created_at`` by more than ``SETTLE_DELAY + recount`` is still missed.
+    """
+    horizon = (now or timezone.now()) - SETTLE_DELAY
+    result = RollupResult()
+    while True:
+        with transaction.atomic():
+            checkpoint, _ = RecordAccessRollupCheckpoint.objects.select_for_update().get_or_create(name=CHECKPOINT)
+            start = checkpoint.last_created_at or _before_next_log(None, horizon)
+            if start is None or start >= horizon:
+                if checkpoint.last_created_at is not None and recount:
+                    result.recounted = _recount_trailing(checkpoint.last_created_at, recount)
+                return result
+            end = min(start + window, horizon)
+            groups = list(
+                RecordAccessLog.objects.filter(created_at__gt=start, created_at__lte=end)
+                .annotate(day=TruncDate("created_at"))
+                .values("record_id", "record__patient_id", "accessed_by_id", "action", "day")
+                .annotate(count=Count("id"), first_at=Min("created_at"), last_at=Max("created_at"))
+                .order_by()
+            )
+            for group in groups:
+                _apply(group)
+                result.rows += group["count"]
+            if not groups:
+                # Skip quiet periods in one step
+                end = _before_next_log(end, horizon) or horizon
+            checkpoint.last_created_at = end
+            checkpoint.save(update_fields=["last_created_at", "updated_at"])
+        result.windows += 1
+        result.groups += len(groups)
+
+
+def _before_next_log(after: Optional[datetime], horizon: datetime) -> Optional[datetime]:
+    logs = RecordAccessLog.objects.filter(created_at__lte=horizon)
+    if after is not None:
+        logs = logs.filter(created_at__gt=after)
+    following = logs.order_by("created_at").values_list("created_at", flat=True).first()
+    # Windows are open on the left, so stop just before that row
+    return following - timedelta(microseconds=1) if following else None
+
+
+def _recount_trailing(through: datetime, recount: timedelta) -> int:
+    """Reset the day counts of groups with rows in (through - recount, through]; returns how many."""
+    recent = (
+        RecordAccessLog.objects.filter(created_at__gt=through - recount, created_at__lte=through)
+        .annotate(day=TruncDate("created_at"))
+        .values_list("day", "record_id")
+        .distinct()
+        .order_by()
+    )
+    records_by_day = defaultdict(set)
+    for day, record_id in recent:
+        records_by_day[day].add(record_id)
+
+    recounted = 0
+    for day, record_ids in records_by_day.items():
+        day_start = timezone.make_aware(datetime.combine(day, time.min))
+        next_day = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+        # Whole day up to the watermark, read through the (record, created_at) index
+        groups = (
+            RecordAccessLog.objects.filter(
+                record_id__in=record_ids,
+                created_at__gte=day_start,
+                created_at__lt=next_day,
+                created_at__lte=through,
+            )
+            .annotate(day=TruncDate("created_at"))
+            .values("record_id", "record__patient_id", "accessed_by_id", "action", "day")
+            .annotate(count=Count("id"), first_at=Min("created_at"), last_at=Max("created_at"))
+            .order_by()
+        )
+        for group in groups:
+            _apply(group, absolute=True)
+            recounted += 1
+    return recounted
+
+
+def _apply(group: dict, absolute: bool = False) -> None:
+    key = {
+        "record_id": group["record_id"],
+        "accessed_by_id": group["accessed_by_id"],
+        "action": group["action"],
+        "day": group["day"],
+    }
+    if absolute:
+        # An exact recount of the group; safe to repeat
+        updates = {"count": group["count"], "first_at": group["first_at"], "last_at": group["last_at"]}
+    else:
+        updates = {
+            "count": F("count") + group["count"],
+            "first_at": Least(F("first_at"), group["first_at"]),
+            "last_at": Greatest(F("last_at"), group["last_at"]),
+        }
+    if RecordAccessDaily.objects.filter(**key).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            RecordAccessDaily.objects.create(
+                **key,
+                patient_id=group["record__patient_id"],
+                count=group["count"],
+                first_at=group["first_at"],
+                last_at=group["last_at"],
+            )
+    except IntegrityError:
+        RecordAccessDaily.objects.filter(**key).update(**updates)
@@ -0,0 +1,49 @@
+import os
+from dataclasses import dataclass
+
+from common.blobstore import release_reference, store_file
+from records.infrastructure.models import MedicalRecord
+
+
+@dataclass
+class AdoptionResult:
+    records: int = 0
+    bytes_freed: int = 0
+
+
+def adopt_record_files(batch_size: int = 200) -> AdoptionResult:
+    """Move per-record files into the blob store, deduplicating identical content.
+
+    Each record switches to its blob with a conditional UPDATE, so a record
+    whose file changed meanwhile is left for the next run. ``updated_at`` is
+    untouched: the bytes, and so the download ETag, stay the same.
+    """
+    result = AdoptionResult()
+    storage = MedicalRecord._meta.get_field("file").storage
+    last_pk = None
+    while True:
+        records = MedicalRecord.objects.filter(blob__isnull=True).exclude(file="").order_by("pk")
+        if last_pk is not None:
+            records = records.filter(pk__gt=last_pk)
+        batch = list(records.only("pk", "file")[:batch_size])
+        if not batch:
+            return result
+        last_pk = batch[-1].pk
+
+        for record in batch:
+            name = record.file.name
+            with storage.open(name, "rb") as stored:
+                blob = store_file(stored, os.path.splitext(name)[1])
+            moved = MedicalRecord.objects.filter(pk=record.pk, file=name, blob__isnull=True).update(
+                blob=blob,
+                file="",
+                file_size=blob.size,
+                file_sha256=blob.sha256,
+            )
+            if not moved:
+                release_reference(blob.pk)
+                continue
+            result.records += 1
+            if not MedicalRecord.objects.filter(file=name).exists():
+                storage.delete(name)
+                result.bytes_freed += blob.size
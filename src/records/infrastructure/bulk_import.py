@@ -0,0 +1,236 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from common.utils import preserve_timestamps
+from records.infrastructure import import_validation
+from records.infrastructure.health_summary import mark_patients_dirty
+from records.infrastructure.models import MedicalRecord, RecordType
+from users.infrastructure.models import UserRole
+
+
+class ImportFormatError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class RowError:
+    row: int
+    field: str
+    message: str
+
+
+@dataclass
+class ChunkReport:
+    index: int
+    first_row: int
+    last_row: int
+    imported: int
+    errors: List[RowError]
+    total_rows: int
+    total_imported: int
+    rows_per_second: float
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    resumed_from: int = 0
+    chunks: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+
+def iter_csv_rows(stream: TextIO) -> Iterator[dict]:
+    yield from csv.DictReader(stream)
+
+
+def iter_json_array(stream: TextIO, read_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield the items of a top-level JSON array without loading the whole document."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    while "[" not in buffer:
+        chunk = stream.read(read_size)
+        if not chunk:
+            raise ImportFormatError("Expected a JSON array of records.")
+        buffer += chunk
+    buffer = buffer[buffer.index("[") + 1:]
+    position = 0
+    eof = False
+    while True:
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            chunk = stream.read(read_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+        if position >= len(buffer):
+            raise ImportFormatError("Unterminated JSON array.")
+        if buffer[position] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as exc:
+            if eof:
+                raise ImportFormatError(f"Invalid JSON near character {exc.pos}.") from exc
+            # The item continues past the buffer: read more and retry
+            chunk = stream.read(read_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield item
+        position = end
+
+
+def build_lookups() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Record type slugs and patient ids/emails, loaded once per import."""
+    record_types = {slug: str(pk) for slug, pk in RecordType.objects.values_list("slug", "pk")}
+    patients = {}
+    users = get_user_model().objects.filter(role=UserRole.PATIENT).values_list("pk", "email")
+    for pk, email in users.iterator(chunk_size=10000):
+        patients[str(pk)] = str(pk)
+        patients[email.lower()] = str(pk)
+    return record_types, patients
+
+
+class MedicalRecordImporter:
+    """Validates rows in a process pool and writes them with chunked bulk_create.
+
+    Record ids derive from (batch_id, row number), and the checkpoint file
+    records how many rows are done, so an interrupted import resumes where
+    it stopped and a re-run chunk is not duplicated.
+    """
+
+    def __init__(
+        self,
+        created_by_id: str,
+        batch_id: str,
+        chunk_size: int = 2000,
+        workers: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        report: Callable[[ChunkReport], None] = lambda report: None,
+    ) -> None:
+        self.created_by_id = created_by_id
+        self.batch_id = batch_id
+        self.chunk_size = chunk_size
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.checkpoint_path = checkpoint_path
+        self.report = report
+
+    def run(self, rows: Iterable[dict]) -> ImportResult:
+        result = ImportResult(resumed_from=self._load_checkpoint())
+        result.rows = result.resumed_from
+        numbered = islice(enumerate(rows, start=1), result.resumed_from, None)
+        chunks = self._chunks(numbered)
+        record_types, patients = build_lookups()
+        started = time.perf_counter()
+
+        if self.workers <= 0:
+            import_validation.init_worker(record_types, patients)
+            for first_row, last_row, numbered_chunk in chunks:
+                outcome = import_validation.validate_chunk(self.batch_id, numbered_chunk)
+                self._write(result, first_row, last_row, outcome, started)
+            return result
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=import_validation.init_worker,
+            initargs=(record_types, patients),
+        ) as pool:
+            # Bounded in-flight work keeps memory flat; chunks are written in input order
+            pending: Deque[Tuple[int, int, Future]] = deque()
+            for first_row, last_row, numbered_chunk in chunks:
+                pending.append(
+                    (first_row, last_row, pool.submit(import_validation.validate_chunk, self.batch_id, numbered_chunk))
+                )
+                if len(pending) >= self.workers * 2:
+                    first, last, future = pending.popleft()
+                    self._write(result, first, last, future.result(), started)
+            while pending:
+                first, last, future = pending.popleft()
+                self._write(result, first, last, future.result(), started)
+        return result
+
+    def _chunks(self, numbered: Iterator[Tuple[int, dict]]):
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk[0][0], chunk[-1][0], chunk
+
+    def _write(self, result: ImportResult, first_row: int, last_row: int, outcome, started: float) -> None:
+        valid, raw_errors = outcome
+        now = timezone.now()
+        records = [
+            MedicalRecord(
+                id=values["id"],
+                patient_id=values["patient_id"],
+                created_by_id=self.created_by_id,
+                record_type_id=values["record_type_id"],
+                title=values["title"],
+                file_url=values["file_url"],
+                metadata=values["metadata"],
+                status=values["status"],
+                created_at=values["created_at"] or now,
+                updated_at=now,
+            )
+            for values in valid
+        ]
+        with preserve_timestamps(MedicalRecord), transaction.atomic():
+            MedicalRecord.objects.bulk_create(records, batch_size=1000, ignore_conflicts=True)
+        # bulk_create sends no signals, so flag the affected summaries here
+        mark_patients_dirty({values["patient_id"] for values in valid})
+
+        errors = [RowError(row=row, field=field_name, message=message) for row, field_name, message in raw_errors]
+        result.chunks += 1
+        result.rows = last_row
+        result.imported += len(records)
+        result.rejected += len({error.row for error in errors})
+        result.errors.extend(errors)
+        self._save_checkpoint(last_row)
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        self.report(
+            ChunkReport(
+                index=result.chunks,
+                first_row=first_row,
+                last_row=last_row,
+                imported=len(records),
+                errors=errors,
+                total_rows=result.rows,
+                total_imported=result.imported,
+                rows_per_second=(result.rows - result.resumed_from) / elapsed,
+            )
+        )
+
+    def _load_checkpoint(self) -> int:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path) as handle:
+            checkpoint = json.load(handle)
+        if checkpoint.get("batch_id") != self.batch_id:
+            raise ImportFormatError(
+                f"Checkpoint {self.checkpoint_path} belongs to batch {checkpoint.get('batch_id')!r}."
+            )
+        return int(checkpoint.get("rows_done", 0))
+
+    def _save_checkpoint(self, rows_done: int) -> None:
+        if not self.checkpoint_path:
+            return
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w") as handle:
+            json.dump({"batch_id": self.batch_id, "rows_done": rows_done}, handle)
+        os.replace(temporary, self.checkpoint_path)
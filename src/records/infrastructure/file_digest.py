@@ -0,0 +1,64 @@
+import hashlib
+from dataclasses import dataclass
+
+from records.infrastructure.models import MedicalRecord
+
+READ_SIZE = 1024 * 1024
+
+
+@dataclass
+class DigestBackfillResult:
+    records: int = 0
+    missing: int = 0
+
+
+def stamp_file_digest(sender, instance: MedicalRecord, **kwargs) -> None:
+    """pre_save receiver: hash a newly assigned file before it is stored.
+
+    Only uncommitted uploads are read, so saves that do not touch the file
+    cost nothing; older records are filled in by ``backfill_file_digests``.
+    """
+    file = instance.file
+    if not file or getattr(file, "_committed", True):
+        return
+    hasher = hashlib.sha256()
+    size = 0
+    for block in file.chunks(READ_SIZE):
+        hasher.update(block)
+        size += len(block)
+    file.seek(0)
+    instance.file_sha256 = hasher.hexdigest()
+    instance.file_size = size
+
+
+def backfill_file_digests(batch_size: int = 200) -> DigestBackfillResult:
+    """Hash stored files of records that have no digest yet, outside any request."""
+    result = DigestBackfillResult()
+    storage = MedicalRecord._meta.get_field("file").storage
+    last_pk = None
+    while True:
+        records = MedicalRecord.objects.filter(blob__isnull=True, file_sha256="").exclude(file="").order_by("pk")
+        if last_pk is not None:
+            records = records.filter(pk__gt=last_pk)
+        batch = list(records.only("pk", "file")[:batch_size])
+        if not batch:
+            return result
+        last_pk = batch[-1].pk
+
+        for record in batch:
+            name = record.file.name
+            hasher = hashlib.sha256()
+            size = 0
+            try:
+                with storage.open(name, "rb") as stored:
+                    for block in iter(lambda: stored.read(READ_SIZE), b""):
+                        hasher.update(block)
+                        size += len(block)
+            except FileNotFoundError:
+                result.missing += 1
+                continue
+            # Conditional on the file, so a record re-uploaded meanwhile keeps its own digest
+            result.records += MedicalRecord.objects.filter(pk=record.pk, file=name).update(
+                file_sha256=hasher.hexdigest(),
+                file_size=size,
+            )
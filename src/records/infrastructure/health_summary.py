@@ -0,0 +1,168 @@
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from records.infrastructure.models import HealthSummary, MedicalRecord, MedicalRecordStatus
+
+logger = logging.getLogger(__name__)
+
+# Metadata keys folded into the summary; list values are merged, vitals keep the latest reading
+LIST_KEYS = ("conditions", "diagnoses", "allergies", "medications", "procedures")
+VITAL_KEYS = ("blood_pressure", "heart_rate", "temperature", "weight", "height", "bmi", "spo2")
+# A record saved while a summary was being recomputed may carry an older
+# updated_at than the new watermark; re-reading this overlap is harmless
+# because contributions are replaced by record id.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+@dataclass
+class RecomputeResult:
+    summaries: int = 0
+    records: int = 0
+
+
+def mark_patients_dirty(patient_ids: Iterable[str]) -> None:
+    """Flag summaries for recomputation, keeping the earliest ``dirty_since``.
+
+    The UPDATE is unconditional so it waits on a recompute holding the row: a
+    summary marked while being recomputed is dirty again once that commits,
+    and a change the recompute did not see is folded in by the next one.
+    """
+    now = timezone.now()
+    for patient_id in set(patient_ids):
+        if HealthSummary.objects.filter(patient_id=patient_id).update(
+            is_dirty=True,
+            dirty_since=Coalesce("dirty_since", Value(now)),
+        ):
+            continue
+        try:
+            with transaction.atomic():
+                HealthSummary.objects.get_or_create(
+                    patient_id=patient_id,
+                    defaults={"is_dirty": True, "dirty_since": now},
+                )
+        except IntegrityError:
+            pass
+
+
+def record_changed(sender, instance: MedicalRecord, **kwargs) -> None:
+    """post_save/post_delete receiver for MedicalRecord."""
+    mark_patients_dirty([instance.patient_id])
+
+
+def recompute_dirty_summaries(batch_size: int = 100) -> RecomputeResult:
+    """Recompute dirty summaries oldest first, one batch per transaction."""
+    result = RecomputeResult()
+    while True:
+        with transaction.atomic():
+            batch = list(
+                HealthSummary.objects.select_for_update(skip_locked=True)
+                .filter(is_dirty=True)
+                .order_by("dirty_since")[:batch_size]
+            )
+            for summary in batch:
+                result.records += fold_changes(summary)
+        result.summaries += len(batch)
+        if len(batch) < batch_size:
+            return result
+
+
+def fold_changes(summary: HealthSummary) -> int:
+    """Fold records changed since the summary's watermark into it and re-render the text."""
+    records = MedicalRecord.objects.filter(patient_id=summary.patient_id).select_related("record_type")
+    if summary.records_through is not None:
+        records = records.filter(updated_at__gte=summary.records_through - WATERMARK_OVERLAP)
+    contributions = dict(summary.summary_data.get("records", {}))
+
+    changed = 0
+    watermark = summary.records_through
+    for record in records.order_by("updated_at").iterator(chunk_size=500):
+        changed += 1
+        watermark = record.updated_at if watermark is None else max(watermark, record.updated_at)
+        if record.status == MedicalRecordStatus.DELETED:
+            contributions.pop(str(record.id), None)
+        else:
+            contributions[str(record.id)] = _contribution(record)
+
+    if contributions:
+        # Hard-deleted records leave no row behind; drop their contributions
+        existing = {
+            str(pk) for pk in MedicalRecord.objects.filter(patient_id=summary.patient_id).values_list("pk", flat=True)
+        }
+        contributions = {key: value for key, value in contributions.items() if key in existing}
+
+    summary.summary_data = {"records": contributions}
+    summary.summary_text = render_summary(contributions.values())
+    summary.records_through = watermark
+    summary.is_dirty = False
+    summary.dirty_since = None
+    summary.save(
+        update_fields=["summary_data", "summary_text", "records_through", "is_dirty", "dirty_since", "updated_at"]
+    )
+    return changed
+
+
+def render_summary(contributions: Iterable[dict]) -> str:
+    contributions = sorted(contributions, key=lambda item: item["updated_at"])
+    if not contributions:
+        return ""
+
+    lists = {key: [] for key in LIST_KEYS}
+    vitals = {}
+    types = Counter()
+    for item in contributions:
+        types[item["type"]] += 1
+        for key in LIST_KEYS:
+            for value in item["facts"].get(key, []):
+                if value not in lists[key]:
+                    lists[key].append(value)
+        for key, value in item["facts"].get("vitals", {}).items():
+            # Later records overwrite earlier readings
+            vitals[key] = (value, item["updated_at"])
+
+    lines = []
+    for key in LIST_KEYS:
+        if lists[key]:
+            lines.append(f"{key.replace('_', ' ').capitalize()}: {', '.join(lists[key])}")
+    if vitals:
+        readings = ", ".join(
+            f"{key.replace('_', ' ')} {value} ({_date(at)})" for key, (value, at) in sorted(vitals.items())
+        )
+        lines.append(f"Latest vitals: {readings}")
+    record_counts = ", ".join(f"{count} {name}" for name, count in sorted(types.items()))
+    lines.append(f"Records: {record_counts}; last updated {_date(contributions[-1]['updated_at'])}")
+    return "\n".join(lines)
+
+
+def _contribution(record: MedicalRecord) -> dict:
+    metadata = record.metadata if isinstance(record.metadata, dict) else {}
+    facts = {}
+    for key in LIST_KEYS:
+        value = metadata.get(key)
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            facts[key] = [str(item) for item in value if item not in (None, "")]
+    vitals = metadata.get("vitals") if isinstance(metadata.get("vitals"), dict) else metadata
+    readings = {key: vitals[key] for key in VITAL_KEYS if vitals.get(key) not in (None, "")}
+    if readings:
+        facts["vitals"] = readings
+    return {
+        "type": record.record_type.name,
+        "title": record.title,
+        "updated_at": record.updated_at.isoformat(),
+        "facts": facts,
+    }
+
+
+def _date(value: Optional[str]) -> str:
+    parsed = parse_datetime(value) if isinstance(value, str) else value
+    return parsed.date().isoformat() if isinstance(parsed, datetime) else ""
@@ -0,0 +1,115 @@
+"""Row validation for bulk record imports.
+
+This module runs inside worker processes, so it must not import Django
+models or touch the database: lookups arrive once per worker through
+``init_worker``.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+IMPORT_NAMESPACE = uuid.UUID("0b6f5d0e-8a63-4c8c-9b1e-7f4a2d9c3e51")
+STATUSES = ("ACTIVE", "ARCHIVED", "DELETED")
+TITLE_MAX_LENGTH = 255
+URL_MAX_LENGTH = 200
+
+_record_types: Dict[str, str] = {}
+_patients: Dict[str, str] = {}
+
+
+def init_worker(record_types: Dict[str, str], patients: Dict[str, str]) -> None:
+    global _record_types, _patients
+    _record_types = record_types
+    _patients = patients
+
+
+def record_id(batch_id: str, row_number: int) -> str:
+    """Stable per input row, so a re-run of a chunk never duplicates it."""
+    return str(uuid.uuid5(IMPORT_NAMESPACE, f"{batch_id}:{row_number}"))
+
+
+def validate_chunk(batch_id: str, numbered_rows: List[Tuple[int, dict]]) -> Tuple[List[dict], List[Tuple[int, str, str]]]:
+    """Return (values for valid rows, (row, field, message) for rejected ones)."""
+    valid = []
+    errors = []
+    for row_number, row in numbered_rows:
+        values, row_errors = _validate_row(row)
+        if row_errors:
+            errors.extend((row_number, field, message) for field, message in row_errors)
+        else:
+            values["id"] = record_id(batch_id, row_number)
+            valid.append(values)
+    return valid, errors
+
+
+def _validate_row(row) -> Tuple[dict, List[Tuple[str, str]]]:
+    if not isinstance(row, dict):
+        return {}, [("row", "Each record must be an object.")]
+    errors = []
+
+    patient_key = str(row.get("patient_id") or "").strip() or str(row.get("patient_email") or "").strip().lower()
+    patient_id = _patients.get(patient_key)
+    if not patient_key:
+        errors.append(("patient", "patient_id or patient_email is required."))
+    elif patient_id is None:
+        errors.append(("patient", f"Unknown patient {patient_key!r}."))
+
+    slug = str(row.get("record_type") or "").strip()
+    record_type_id = _record_types.get(slug)
+    if record_type_id is None:
+        errors.append(("record_type", f"Unknown record type {slug!r}."))
+
+    title = str(row.get("title") or "").strip()
+    if not title:
+        errors.append(("title", "Title is required."))
+    elif len(title) > TITLE_MAX_LENGTH:
+        errors.append(("title", f"Title is longer than {TITLE_MAX_LENGTH} characters."))
+
+    file_url = str(row.get("file_url") or "").strip()
+    if file_url:
+        parsed = urlparse(file_url)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc or len(file_url) > URL_MAX_LENGTH:
+            errors.append(("file_url", "file_url must be an http(s) URL of at most 200 characters."))
+
+    status = str(row.get("status") or "ACTIVE").strip().upper()
+    if status not in STATUSES:
+        errors.append(("status", f"Status must be one of {', '.join(STATUSES)}."))
+
+    metadata = row.get("metadata")
+    if metadata in (None, ""):
+        metadata = {}
+    elif isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except ValueError:
+            metadata = None
+    if not isinstance(metadata, dict):
+        errors.append(("metadata", "metadata must be a JSON object."))
+
+    created_at = _parse_timestamp(row.get("created_at"))
+    if row.get("created_at") not in (None, "") and created_at is None:
+        errors.append(("created_at", "created_at must be an ISO 8601 timestamp."))
+
+    return {
+        "patient_id": patient_id,
+        "record_type_id": record_type_id,
+        "title": title,
+        "file_url": file_url,
+        "status": status,
+        "metadata": metadata,
+        "created_at": created_at,
+    }, errors
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    # Naive timestamps in historical exports are taken as UTC
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
@@ -46,6 +46,18 @@ class MedicalRecord(models.Model):
     )
     title = models.CharField(max_length=255)
     file_url = models.URLField(blank=True)
+    # Locally stored copy; file_url remains for externally hosted files
+    file = models.FileField(upload_to="records/%Y/%m/", blank=True)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    file_sha256 = models.CharField(max_length=64, blank=True)
+    # Content-addressed copy shared with identical uploads; takes precedence over ``file``
+    blob = models.ForeignKey(
+        "common.Blob",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="medical_records",
+    )
     metadata = models.JSONField(default=dict, blank=True)
     status = models.CharField(
         max_length=20,
@@ -58,8 +70,15 @@ class MedicalRecord(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["patient", "created_at"]),
+            models.Index(fields=["patient", "updated_at"]),
             models.Index(fields=["record_type"]),
             models.Index(fields=["status"]),
+            # Search only ever reads ACTIVE rows, newest first within a patient
+            models.Index(
+                fields=["patient", "-created_at", "-id"],
+                name="records_active_patient_idx",
+                condition=models.Q(status=MedicalRecordStatus.ACTIVE),
+            ),
         ]
 
     def __str__(self) -> str:
@@ -74,16 +93,25 @@ class RecordAccessAction(models.TextChoices):
 
 
 class RecordAccessLog(models.Model):
+    """Append-only access trail.
+
+    On PostgreSQL the table is range-partitioned by month on ``created_at``
+    (see ``manage_record_access_log``); elsewhere it is a single table.
+    Only the two composite indexes below are maintained on insert.
+    """
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     record = models.ForeignKey(
         MedicalRecord,
         on_delete=models.PROTECT,
         related_name="access_logs",
+        db_index=False,
     )
     accessed_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.PROTECT,
         related_name="record_access_logs",
+        db_index=False,
     )
     action = models.CharField(max_length=20, choices=RecordAccessAction.choices)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -91,8 +119,7 @@ class RecordAccessLog(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["record", "created_at"]),
-            models.Index(fields=["accessed_by"]),
-            models.Index(fields=["action"]),
+            models.Index(fields=["accessed_by", "created_at"]),
         ]
 
     def __str__(self) -> str:
@@ -107,7 +134,76 @@ class HealthSummary(models.Model):
         related_name="health_summary",
     )
     summary_text = models.TextField(blank=True)
+    # Per-record contributions, so a recompute only reads records that changed
+    summary_data = models.JSONField(default=dict, blank=True)
+    records_through = models.DateTimeField(null=True, blank=True)
+    is_dirty = models.BooleanField(default=False)
+    dirty_since = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["dirty_since"],
+                name="records_summary_dirty_idx",
+                condition=models.Q(is_dirty=True),
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"HealthSummary({self.patient_id})"
+
+
+class RecordAccessDaily(models.Model):
+    """Per-day access counts keyed by (record, accessor, action, day).
+
+    ``patient`` is copied from the record so reports filter on one table.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    record = models.ForeignKey(
+        MedicalRecord,
+        on_delete=models.PROTECT,
+        related_name="access_rollups",
+        db_index=False,
+    )
+    patient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name="+",
+        db_index=False,
+    )
+    accessed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name="+",
+        db_index=False,
+    )
+    action = models.CharField(max_length=20, choices=RecordAccessAction.choices)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    first_at = models.DateTimeField()
+    last_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["patient", "day"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["record", "accessed_by", "action", "day"],
+                name="uniq_record_access_daily",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.record_id}:{self.accessed_by_id}:{self.action}:{self.day.isoformat()}"
+
+
+class RecordAccessRollupCheckpoint(models.Model):
+    name = models.CharField(max_length=50, primary_key=True)
+    last_created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name}@{self.last_created_at}"
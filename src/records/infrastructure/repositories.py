@@ -0,0 +1,89 @@
+import uuid
+from dataclasses import replace
+from typing import Optional
+
+from appointments.infrastructure.models import Appointment
+from records.domain.entities import MedicalRecord, PatientHealthSummary
+from records.domain.repositories import HealthSummaryRepository, MedicalRecordRepository
+from records.domain.value_objects import MedicalRecordStatus
+from records.infrastructure.models import HealthSummary as HealthSummaryModel
+from records.infrastructure.models import MedicalRecord as MedicalRecordModel
+
+
+class DjangoMedicalRecordRepository(MedicalRecordRepository):
+    def get_by_id(self, record_id: str) -> Optional[MedicalRecord]:
+        try:
+            uuid.UUID(str(record_id))
+        except ValueError:
+            return None
+        record = MedicalRecordModel.objects.select_related("blob").filter(pk=record_id).first()
+        return self._to_entity(record) if record else None
+
+    def with_file_size(self, record: MedicalRecord) -> Optional[MedicalRecord]:
+        storage = MedicalRecordModel._meta.get_field("file").storage
+        try:
+            size = storage.size(record.file_name)
+        except FileNotFoundError:
+            return None
+        return replace(record, file_size=size)
+
+    def can_view(self, user_id: str, user_role: str, patient_id: str) -> bool:
+        return can_view_patient_records(user_id, user_role, patient_id)
+
+    def _to_entity(self, record: MedicalRecordModel) -> MedicalRecord:
+        if record.blob is not None:
+            return MedicalRecord(
+                id=str(record.pk),
+                patient_id=str(record.patient_id),
+                created_by_id=str(record.created_by_id),
+                title=record.title,
+                status=MedicalRecordStatus(record.status),
+                file_name=record.blob.file.name,
+                file_url=record.file_url,
+                file_size=record.blob.size,
+                file_sha256=record.blob.sha256,
+                updated_at=record.updated_at,
+                in_blob_store=True,
+            )
+        return MedicalRecord(
+            id=str(record.pk),
+            patient_id=str(record.patient_id),
+            created_by_id=str(record.created_by_id),
+            title=record.title,
+            status=MedicalRecordStatus(record.status),
+            file_name=record.file.name or "",
+            file_url=record.file_url,
+            file_size=record.file_size,
+            file_sha256=record.file_sha256,
+            updated_at=record.updated_at,
+        )
+
+
+class DjangoHealthSummaryRepository(HealthSummaryRepository):
+    def get_for_patient(self, patient_id: str) -> Optional[PatientHealthSummary]:
+        # One lookup on the unique patient index; summaries are precomputed
+        summary = (
+            HealthSummaryModel.objects.filter(patient_id=patient_id)
+            .only("patient_id", "summary_text", "updated_at", "is_dirty")
+            .first()
+        )
+        if summary is None:
+            return None
+        return PatientHealthSummary(
+            patient_id=str(summary.patient_id),
+            summary_text=summary.summary_text,
+            updated_at=summary.updated_at,
+            is_stale=summary.is_dirty,
+        )
+
+    def can_view(self, user_id: str, user_role: str, patient_id: str) -> bool:
+        return can_view_patient_records(user_id, user_role, patient_id)
+
+
+def can_view_patient_records(user_id: str, user_role: str, patient_id: str) -> bool:
+    """Admins, the patient, and doctors who have seen the patient."""
+    if user_role == "admin" or user_id == patient_id:
+        return True
+    if user_role == "doctor":
+        return Appointment.objects.filter(doctor_id=user_id, patient_id=patient_id).exists()
+    return False
@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db import connection
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+from records.domain.entities import RecordSearchCriteria, RecordSearchHit
+from records.domain.repositories import RecordSearchRepository
+from records.infrastructure.models import MedicalRecord, MedicalRecordStatus
+from records.infrastructure.repositories import can_view_patient_records
+
+TABLE = MedicalRecord._meta.db_table
+METADATA_INDEX = "records_metadata_path_gin"
+TITLE_INDEX = "records_title_trgm"
+# Same predicate as records_active_patient_idx: archived and deleted rows are never indexed
+ACTIVE_PREDICATE = f"status = '{MedicalRecordStatus.ACTIVE.value}'"
+
+
+def is_supported() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def install_search_indexes(concurrently: bool = True) -> None:
+    """Create the GIN indexes behind record search (PostgreSQL).
+
+    ``jsonb_path_ops`` serves ``metadata @> ...`` containment and is a
+    fraction of the size of the default jsonb opclass; the trigram index
+    serves ``title ILIKE '%...%'``.
+    """
+    option = "CONCURRENTLY " if concurrently else ""
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(
+            f"CREATE INDEX {option}IF NOT EXISTS {METADATA_INDEX} ON {TABLE} "
+            f"USING gin (metadata jsonb_path_ops) WHERE {ACTIVE_PREDICATE}"
+        )
+        cursor.execute(
+            f"CREATE INDEX {option}IF NOT EXISTS {TITLE_INDEX} ON {TABLE} "
+            f"USING gin (title gin_trgm_ops) WHERE {ACTIVE_PREDICATE}"
+        )
+        cursor.execute(f"ANALYZE {TABLE}")
+
+
+def drop_search_indexes() -> None:
+    with connection.cursor() as cursor:
+        for name in (METADATA_INDEX, TITLE_INDEX):
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class DjangoRecordSearchRepository(RecordSearchRepository):
+    def search(
+        self,
+        criteria: RecordSearchCriteria,
+        limit: int,
+        after: Optional[Tuple[datetime, str]],
+    ) -> List[RecordSearchHit]:
+        records = MedicalRecord.objects.filter(
+            patient_id=criteria.patient_id,
+            status=MedicalRecordStatus.ACTIVE,
+        ).select_related("record_type")
+        if criteria.record_type:
+            records = records.filter(record_type__slug=criteria.record_type)
+        if criteria.metadata:
+            records = records.filter(_metadata_filter(criteria.metadata))
+        if criteria.text:
+            records = records.filter(_title_filter(criteria.text))
+        if after is not None:
+            records = records.filter(Q(created_at__lt=after[0]) | Q(created_at=after[0], id__lt=after[1]))
+
+        records = records.only(
+            "id", "title", "metadata", "created_at", "record_type__slug"
+        ).order_by("-created_at", "-id")[:limit]
+        return [
+            RecordSearchHit(
+                id=str(record.pk),
+                title=record.title,
+                record_type=record.record_type.slug,
+                metadata=record.metadata,
+                created_at=record.created_at,
+            )
+            for record in records
+        ]
+
+    def can_view(self, user_id: str, user_role: str, patient_id: str) -> bool:
+        return can_view_patient_records(user_id, user_role, patient_id)
+
+
+def _metadata_filter(metadata: dict) -> Q:
+    if is_supported():
+        # Compiles to metadata @> '{...}'::jsonb, which jsonb_path_ops serves
+        return Q(metadata__contains=metadata)
+    # Other backends have no containment operator; compare top-level keys instead
+    return Q(**{f"metadata__{key}": value for key, value in metadata.items()})
+
+
+def _title_filter(text: str):
+    if not is_supported():
+        return Q(title__icontains=text)
+    # Django's icontains compiles to UPPER(title::text) LIKE ..., which the
+    # trigram index on the bare column cannot serve; ILIKE can.
+    pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return RawSQL(f'"{TABLE}"."title" ILIKE %s', [pattern], output_field=BooleanField())
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from records.infrastructure.blob_adoption import adopt_record_files
+
+
+class Command(BaseCommand):
+    help = "Move medical record files into the shared content-addressed blob store."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        result = adopt_record_files(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Moved {result.records} record files into the blob store; "
+                f"removed {result.bytes_freed} bytes of per-record copies."
+            )
+        )
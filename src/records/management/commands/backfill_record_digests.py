@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from records.infrastructure.file_digest import backfill_file_digests
+
+
+class Command(BaseCommand):
+    help = "Compute SHA-256 digests and sizes for stored medical record files that have none."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        result = backfill_file_digests(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Hashed {result.records} record files."))
+        if result.missing:
+            self.stdout.write(self.style.WARNING(f"{result.missing} records point at files that no longer exist."))
@@ -0,0 +1,173 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from records.domain.entities import RecordSearchCriteria
+from records.infrastructure import search
+from records.infrastructure.models import RecordType
+from users.infrastructure.models import UserRole
+
+VOCABULARY = (
+    "blood panel lipid glucose thyroid liver kidney function culture biopsy "
+    "xray mri ultrasound ecg referral discharge summary vaccination allergy "
+    "prescription followup consult cardiology dermatology pathology screening"
+).split()
+RECORD_TYPES = ("bench-lab", "bench-imaging", "bench-note", "bench-prescription", "bench-referral")
+LAB_CODES = 2000
+DAYS = 3650
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic medical records (10M by default) and time record search "
+        "without and with the GIN search indexes (PostgreSQL only)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--records", type=int, default=10_000_000)
+        parser.add_argument("--patients", type=int, default=5_000)
+        parser.add_argument("--queries", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=500_000)
+        parser.add_argument("--skip-seed", action="store_true", help="Reuse previously seeded rows.")
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError("The record search benchmark needs PostgreSQL.")
+        rng = random.Random(42)
+        patient_ids = self._seed(options)
+        workload = self._workload(rng, patient_ids, options["queries"])
+        repository = search.DjangoRecordSearchRepository()
+
+        search.drop_search_indexes()
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {search.TABLE}")
+        self._run("without GIN", repository, workload)
+
+        started = time.perf_counter()
+        search.install_search_indexes(concurrently=False)
+        self.stdout.write(f"index build: {time.perf_counter() - started:.1f}s ({self._index_sizes()})")
+        self._run("with GIN", repository, workload)
+
+    def _seed(self, options):
+        User = get_user_model()
+        author, _ = User.objects.get_or_create(
+            email="bench-records-author@example.com",
+            defaults={"role": UserRole.DOCTOR},
+        )
+        emails = [f"bench-records-{index}@example.com" for index in range(options["patients"])]
+        existing = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+        User.objects.bulk_create(
+            [User(email=email, role=UserRole.PATIENT) for email in emails if email not in existing],
+            batch_size=1000,
+        )
+        patients = User.objects.filter(email__in=emails).order_by("email")
+        patient_ids = [str(pk) for pk in patients.values_list("pk", flat=True)]
+        if options["skip_seed"]:
+            return patient_ids
+
+        type_ids = []
+        for slug in RECORD_TYPES:
+            record_type, _ = RecordType.objects.get_or_create(
+                slug=slug,
+                defaults={"name": slug.replace("-", " ").title()},
+            )
+            type_ids.append(str(record_type.pk))
+
+        # Generated server-side: shipping 10M rows through bulk_create would dominate the run
+        total = options["records"]
+        for start in range(0, total, options["batch_size"]):
+            end = min(start + options["batch_size"], total) - 1
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    INSERT INTO {search.TABLE} (id, patient_id, created_by_id, record_type_id, title, file_url,
+                        file, file_size, file_sha256, metadata, status, created_at, updated_at)
+                    SELECT gen_random_uuid(),
+                        (%(patients)s::uuid[])[1 + (i * 7919) %% %(patient_count)s],
+                        %(author)s::uuid,
+                        (%(types)s::uuid[])[1 + i %% %(type_count)s],
+                        (%(words)s::text[])[1 + i %% %(word_count)s] || ' '
+                            || (%(words)s::text[])[1 + (i / 7) %% %(word_count)s] || ' ' || (i %% 997)::text,
+                        '', '', NULL, '',
+                        jsonb_build_object(
+                            'lab_code', 'LC' || lpad((i %% {LAB_CODES})::text, 4, '0'),
+                            'collected_on', (date '2015-01-01' + (i %% {DAYS}))::text,
+                            'value', i %% 300
+                        ),
+                        CASE i %% 10 WHEN 0 THEN 'DELETED' WHEN 1 THEN 'ARCHIVED' ELSE 'ACTIVE' END,
+                        now() - (i %% {DAYS}) * interval '1 day',
+                        now() - (i %% {DAYS}) * interval '1 day'
+                    FROM generate_series(%(start)s, %(end)s) AS i
+                    """,
+                    {
+                        "patients": patient_ids,
+                        "patient_count": len(patient_ids),
+                        "author": str(author.pk),
+                        "types": type_ids,
+                        "type_count": len(type_ids),
+                        "words": VOCABULARY,
+                        "word_count": len(VOCABULARY),
+                        "start": start,
+                        "end": end,
+                    },
+                )
+            self.stdout.write(f"seeded {end + 1} records")
+        return patient_ids
+
+    def _workload(self, rng, patient_ids, count):
+        workload = []
+        for _ in range(count):
+            patient_id = rng.choice(patient_ids)
+            workload.append(("title", RecordSearchCriteria(patient_id=patient_id, text=rng.choice(VOCABULARY))))
+            workload.append(
+                (
+                    "metadata",
+                    RecordSearchCriteria(
+                        patient_id=patient_id,
+                        metadata={"lab_code": f"LC{rng.randrange(LAB_CODES):04d}"},
+                    ),
+                )
+            )
+            workload.append(
+                ("type", RecordSearchCriteria(patient_id=patient_id, record_type=rng.choice(RECORD_TYPES)))
+            )
+            workload.append(
+                (
+                    "combined",
+                    RecordSearchCriteria(
+                        patient_id=patient_id,
+                        text=rng.choice(VOCABULARY),
+                        record_type=rng.choice(RECORD_TYPES),
+                        metadata={"collected_on": f"2019-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"},
+                    ),
+                )
+            )
+        return workload
+
+    def _run(self, label, repository, workload):
+        samples = {}
+        for kind, criteria in workload:
+            started = time.perf_counter()
+            repository.search(criteria, 51, None)
+            samples.setdefault(kind, []).append((time.perf_counter() - started) * 1000)
+        for kind, values in samples.items():
+            self._report(f"{label} / {kind}", values)
+
+    def _index_sizes(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relname, pg_size_pretty(pg_relation_size(oid)) FROM pg_class WHERE relname IN (%s, %s)",
+                [search.METADATA_INDEX, search.TITLE_INDEX],
+            )
+            return ", ".join(f"{name} {size}" for name, size in cursor.fetchall())
+
+    def _report(self, name, samples):
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) > 1 else samples[0]
+        self.stdout.write(
+            f"{name}: median {statistics.median(samples):.1f}ms p95 {p95:.1f}ms max {samples[-1]:.1f}ms"
+        )
@@ -0,0 +1,94 @@
+import csv
+import os
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from records.infrastructure.bulk_import import (
+    ImportFormatError,
+    MedicalRecordImporter,
+    iter_csv_rows,
+    iter_json_array,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import historical medical records from a CSV manifest or a JSON array. "
+        "Rows are validated in worker processes and written in chunks; pass "
+        "--checkpoint and --batch-id to resume an interrupted import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "json"], help="Defaults to the file extension.")
+        parser.add_argument("--created-by", required=True, help="Email of the user the records are attributed to.")
+        parser.add_argument("--batch-id", help="Stable id for this import; required to resume.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--workers", type=int, help="Validation processes; 0 validates in-process.")
+        parser.add_argument("--checkpoint", help="Progress file for resuming.")
+        parser.add_argument("--errors", help="Write rejected rows to this CSV file.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist.")
+        file_format = options["format"] or os.path.splitext(path)[1].lstrip(".").lower()
+        if file_format not in ("csv", "json"):
+            raise CommandError("Pass --format csv or --format json.")
+        if options["checkpoint"] and not options["batch_id"]:
+            raise CommandError("--checkpoint needs a --batch-id so resumed rows keep their ids.")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+        try:
+            created_by = get_user_model().objects.get(email__iexact=options["created_by"])
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"No user with email {options['created_by']}.") from exc
+
+        batch_id = options["batch_id"] or uuid.uuid4().hex
+        error_file = open(options["errors"], "a", newline="") if options["errors"] else None
+        error_writer = csv.writer(error_file) if error_file else None
+        if error_file and error_file.tell() == 0:
+            error_writer.writerow(["row", "field", "message"])
+
+        def report(chunk):
+            self.stdout.write(
+                f"rows {chunk.first_row}-{chunk.last_row}: {chunk.imported} imported, "
+                f"{len({error.row for error in chunk.errors})} rejected "
+                f"({chunk.total_rows} rows, {chunk.rows_per_second:.0f} rows/s)"
+            )
+            for error in chunk.errors:
+                if error_writer:
+                    error_writer.writerow([error.row, error.field, error.message])
+                else:
+                    self.stderr.write(f"  row {error.row} {error.field}: {error.message}")
+            if error_file:
+                error_file.flush()
+
+        importer = MedicalRecordImporter(
+            created_by_id=str(created_by.pk),
+            batch_id=batch_id,
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            checkpoint_path=options["checkpoint"],
+            report=report,
+        )
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as stream:
+                rows = iter_csv_rows(stream) if file_format == "csv" else iter_json_array(stream)
+                result = importer.run(rows)
+        except ImportFormatError as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            if error_file:
+                error_file.close()
+
+        if result.resumed_from:
+            self.stdout.write(f"Resumed after row {result.resumed_from}.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Batch {batch_id}: {result.imported} records imported, {result.rejected} rows rejected "
+                f"in {result.chunks} chunks."
+            )
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from records.infrastructure import search
+
+
+class Command(BaseCommand):
+    help = "Create the jsonb_path_ops and trigram GIN indexes used by record search (PostgreSQL only)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-concurrently",
+            action="store_true",
+            help="Build the indexes inside a transaction instead of CONCURRENTLY.",
+        )
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError("Record search indexes are only used on PostgreSQL.")
+        search.install_search_indexes(concurrently=not options["no_concurrently"])
+        self.stdout.write(self.style.SUCCESS("Record search indexes are installed."))
@@ -0,0 +1,76 @@
+import os
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from records.infrastructure import access_log_partitions as partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintain the RecordAccessLog store: partition it by month (PostgreSQL), "
+        "create upcoming partitions, and export/drop old months."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--install", action="store_true", help="Convert the table to monthly partitions.")
+        parser.add_argument("--months-ahead", type=int, default=3)
+        parser.add_argument("--retire-before", metavar="YYYY-MM", help="Export (optionally) and drop older months.")
+        parser.add_argument("--export-dir", help="Write retired months as CSV files here first.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Batch size for row-by-row deletes.")
+
+    def handle(self, *args, **options):
+        retire_before = self._parse_month(options["retire_before"]) if options["retire_before"] else None
+        if options["export_dir"]:
+            os.makedirs(options["export_dir"], exist_ok=True)
+
+        if not partitions.is_supported() or not (options["install"] or partitions.is_partitioned()):
+            if options["install"]:
+                raise CommandError("Partitioning requires PostgreSQL.")
+            if retire_before:
+                self._retire_rows(retire_before, options)
+            return
+
+        if options["install"]:
+            partitions.install_partitioning(options["months_ahead"])
+            self.stdout.write(self.style.SUCCESS("RecordAccessLog is partitioned by month."))
+        for name in partitions.ensure_partitions(options["months_ahead"]):
+            self.stdout.write(f"Created partition {name}")
+
+        if retire_before:
+            for partition in partitions.partitions_before(retire_before.date()):
+                if options["export_dir"]:
+                    path = os.path.join(options["export_dir"], f"{partition.name}.csv")
+                    with open(path, "wb") as stream:
+                        partitions.export_partition(partition, stream)
+                    self.stdout.write(f"Exported {partition.name} to {path}")
+                partitions.drop_partition(partition)
+                self.stdout.write(f"Dropped {partition.name}")
+            self._retire_default(retire_before, options)
+
+    def _retire_default(self, cutoff: datetime, options) -> None:
+        month = cutoff.date()
+        if not partitions.has_default_rows_before(month):
+            return
+        if options["export_dir"]:
+            path = os.path.join(options["export_dir"], f"{partitions.DEFAULT_PARTITION}_before_{cutoff:%Y%m}.csv")
+            with open(path, "wb") as stream:
+                partitions.export_default_before(month, stream)
+            self.stdout.write(f"Exported {partitions.DEFAULT_PARTITION} rows to {path}")
+        deleted = partitions.delete_default_before(month, batch_size=options["batch_size"])
+        self.stdout.write(f"Deleted {deleted} rows older than {cutoff:%Y-%m} from {partitions.DEFAULT_PARTITION}")
+
+    def _retire_rows(self, cutoff: datetime, options) -> None:
+        if options["export_dir"]:
+            path = os.path.join(options["export_dir"], f"record_access_before_{cutoff:%Y%m}.csv")
+            with open(path, "w", newline="") as stream:
+                exported = partitions.export_rows_before(cutoff, stream)
+            self.stdout.write(f"Exported {exported} rows to {path}")
+        deleted = partitions.delete_rows_before(cutoff, batch_size=options["batch_size"])
+        self.stdout.write(f"Deleted {deleted} rows older than {cutoff:%Y-%m}")
+
+    def _parse_month(self, value: str) -> datetime:
+        try:
+            return datetime.strptime(value, "%Y-%m").replace(tzinfo=dt_timezone.utc)
+        except ValueError as exc:
+            raise CommandError("--retire-before must look like YYYY-MM") from exc
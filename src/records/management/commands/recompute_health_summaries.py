@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from records.infrastructure.health_summary import recompute_dirty_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute health summaries flagged dirty by medical record changes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--interval", type=float, default=0, help="Keep recomputing every N seconds.")
+
+    def handle(self, *args, **options):
+        while True:
+            result = recompute_dirty_summaries(batch_size=options["batch_size"])
+            if result.summaries:
+                self.stdout.write(f"Recomputed {result.summaries} summaries from {result.records} changed records.")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
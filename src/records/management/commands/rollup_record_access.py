@@ -0,0 +1,35 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from records.infrastructure.access_rollup import RECOUNT_WINDOW, rollup_access_logs
+
+
+class Command(BaseCommand):
+    help = "Fold new RecordAccessLog rows into the daily access rollup."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--window-minutes", type=int, default=60, help="Log time consumed per transaction.")
+        parser.add_argument("--interval", type=float, default=0, help="Keep rolling up every N seconds.")
+        parser.add_argument(
+            "--recount-minutes",
+            type=float,
+            default=RECOUNT_WINDOW.total_seconds() / 60,
+            help="Recount groups with rows this far behind the watermark, to catch late commits.",
+        )
+
+    def handle(self, *args, **options):
+        window = timedelta(minutes=options["window_minutes"])
+        recount = timedelta(minutes=options["recount_minutes"])
+        while True:
+            result = rollup_access_logs(window=window, recount=recount)
+            if result.rows:
+                self.stdout.write(
+                    f"Rolled up {result.rows} accesses into {result.groups} groups over {result.windows} windows."
+                )
+            if result.recounted:
+                self.stdout.write(f"Recounted {result.recounted} recent groups.")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,146 @@
+import mimetypes
+import os
+import re
+from typing import Optional, Tuple
+
+from django.http import FileResponse, HttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _RangeReader:
+    """File-like view of ``length`` bytes from the current position.
+
+    It deliberately has no ``fileno``: servers fall back to plain reads for
+    partial content instead of sendfile-ing the rest of the file.
+    """
+
+    block_size = 64 * 1024
+
+    def __init__(self, file, length: int) -> None:
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def stored_file_response(request, storage, name: str, size: int, etag: str, last_modified, filename: str):
+    """Serve a stored file with ETag, conditional GET and single-range support.
+
+    Full responses hand the open file to FileResponse, so the WSGI server
+    can use sendfile.
+    """
+    quoted_etag = f'"{etag}"'
+    modified = int(last_modified.timestamp())
+    if _etag_matches(request.headers.get("If-None-Match"), quoted_etag):
+        response = HttpResponse(status=304)
+        _set_validators(response, quoted_etag, modified)
+        return response
+
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    byte_range = _requested_range(request, size, quoted_etag, modified)
+    if byte_range == "unsatisfiable":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        _set_validators(response, quoted_etag, modified)
+        return response
+
+    stored = storage.open(name, "rb")
+    if byte_range is None:
+        response = FileResponse(stored, as_attachment=True, filename=filename, content_type=content_type)
+        response["Content-Length"] = str(size)
+    else:
+        start, end = byte_range
+        stored.seek(start)
+        response = FileResponse(
+            _RangeReader(stored, end - start + 1),
+            status=206,
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type,
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = "private, no-cache"
+    _set_validators(response, quoted_etag, modified)
+    return response
+
+
+def is_initial_fetch(response) -> bool:
+    """True for a full response or a range starting at byte 0; False for resumed ranges, 304 and 416."""
+    if response.status_code == 206:
+        return response["Content-Range"].startswith("bytes 0-")
+    return response.status_code in (200, 302)
+
+
+def download_filename(title: str, name: str) -> str:
+    extension = os.path.splitext(name)[1]
+    base = re.sub(r"[^\w.-]+", "_", title).strip("._") or "record"
+    return f"{base[:100]}{extension}"
+
+
+def _requested_range(request, size: int, quoted_etag: str, modified: int):
+    header = request.headers.get("Range")
+    if not header or request.method != "GET":
+        return None
+    if_range = request.headers.get("If-Range")
+    if if_range and not _if_range_matches(if_range.strip(), quoted_etag, modified):
+        # The client's partial copy is stale: send the whole file
+        return None
+    parsed = _parse_range(header.strip(), size)
+    return "unsatisfiable" if parsed is False else parsed
+
+
+def _parse_range(header: str, size: int):
+    """Return (start, end) for one range, None to ignore the header, False if unsatisfiable."""
+    match = RANGE_RE.match(header)
+    if not match:
+        # Multiple or malformed ranges: a full 200 response is always allowed
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            return False
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return False
+    return start, end
+
+
+def _if_range_matches(value: str, quoted_etag: str, modified: int) -> bool:
+    if value.startswith('"') or value.startswith("W/"):
+        # If-Range requires a strong comparison
+        return value == quoted_etag
+    since = parse_http_date_safe(value)
+    return since is not None and since == modified
+
+
+def _etag_matches(header: Optional[str], quoted_etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates: Tuple[str, ...] = tuple(tag.strip().removeprefix("W/") for tag in header.split(","))
+    return quoted_etag in candidates
+
+
+def _set_validators(response, quoted_etag: str, modified: int) -> None:
+    response["ETag"] = quoted_etag
+    response["Last-Modified"] = http_date(modified)
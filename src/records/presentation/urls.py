@@ -0,0 +1,37 @@
+from django.urls import path
+
+from records.presentation.views import (
+    HealthSummaryView,
+    RecordAccessEventsView,
+    RecordAccessReportView,
+    RecordDownloadView,
+    RecordSearchView,
+)
+
+urlpatterns = [
+    path(
+        "patients/<str:patient_id>/summary/",
+        HealthSummaryView.as_view(),
+        name="records-health-summary",
+    ),
+    path(
+        "patients/<str:patient_id>/search/",
+        RecordSearchView.as_view(),
+        name="records-search",
+    ),
+    path(
+        "access-report/",
+        RecordAccessReportView.as_view(),
+        name="records-access-report",
+    ),
+    path(
+        "access-report/events/",
+        RecordAccessEventsView.as_view(),
+        name="records-access-events",
+    ),
+    path(
+        "<str:record_id>/download/",
+        RecordDownloadView.as_view(),
+        name="records-download",
+    ),
+]
@@ -0,0 +1,296 @@
+import json
+import uuid
+from dataclasses import asdict
+from datetime import datetime, time
+
+from django.http import HttpResponseRedirect
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.blob_storage import get_blob_storage
+from records.application.dto import (
+    AccessEventsRequest,
+    AccessReportRequest,
+    DownloadRecordRequest,
+    HealthSummaryRequest,
+    RecordError,
+    RecordSearchRequest,
+)
+from records.application.usecases import (
+    DownloadRecordUseCase,
+    GetAccessEventsUseCase,
+    GetAccessReportUseCase,
+    GetHealthSummaryUseCase,
+    SearchRecordsUseCase,
+)
+from records.application.usecases.download_record import stored_file_missing
+from records.infrastructure.access_log import BufferedRecordAccessLogger
+from records.infrastructure.access_report import DjangoRecordAccessReportRepository
+from records.infrastructure.models import MedicalRecord as MedicalRecordModel
+from records.infrastructure.repositories import DjangoHealthSummaryRepository, DjangoMedicalRecordRepository
+from records.infrastructure.search import DjangoRecordSearchRepository
+from records.presentation.downloads import download_filename, is_initial_fetch, stored_file_response
+
+
+class RecordDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, record_id: str):
+        usecase = DownloadRecordUseCase(
+            DjangoMedicalRecordRepository(),
+            BufferedRecordAccessLogger(),
+        )
+        download = DownloadRecordRequest(
+            user_id=str(request.user.id),
+            user_role=_get_user_role(request.user),
+            record_id=str(record_id),
+        )
+        try:
+            record = usecase.execute(download)
+        except RecordError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        if not record.file_name:
+            # Externally hosted file: the client fetches it from its origin
+            response = HttpResponseRedirect(record.file_url)
+        else:
+            try:
+                response = stored_file_response(
+                    request,
+                    storage=get_blob_storage() if record.in_blob_store else MedicalRecordModel._meta.get_field("file").storage,
+                    name=record.file_name,
+                    size=record.file_size,
+                    etag=record.file_sha256 or _unhashed_etag(record),
+                    last_modified=record.updated_at,
+                    filename=download_filename(record.title, record.file_name),
+                )
+            except FileNotFoundError:
+                exc = stored_file_missing(record)
+                return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        if is_initial_fetch(response):
+            # Resumed ranges and 304 revalidations are not new downloads
+            usecase.log_download(download, record)
+        return response
+
+
+class HealthSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, patient_id: str):
+        usecase = GetHealthSummaryUseCase(DjangoHealthSummaryRepository())
+        try:
+            summary = usecase.execute(
+                HealthSummaryRequest(
+                    user_id=str(request.user.id),
+                    user_role=_get_user_role(request.user),
+                    patient_id=str(patient_id),
+                )
+            )
+        except RecordError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response({"data": asdict(summary), "meta": {}})
+
+
+class RecordSearchView(APIView):
+    """Search a patient's active records by title text, record type and metadata values."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, patient_id: str):
+        params = request.query_params
+        metadata = None
+        if params.get("metadata"):
+            try:
+                metadata = json.loads(params["metadata"])
+            except ValueError:
+                return _error_response(
+                    code="invalid_query",
+                    message="metadata must be a JSON object.",
+                    details={},
+                    status=400,
+                )
+        try:
+            limit = min(max(int(params.get("limit") or 50), 1), 200)
+        except ValueError:
+            return _error_response(
+                code="invalid_pagination",
+                message="limit must be an integer.",
+                details={},
+                status=400,
+            )
+
+        usecase = SearchRecordsUseCase(DjangoRecordSearchRepository())
+        try:
+            result = usecase.execute(
+                RecordSearchRequest(
+                    user_id=str(request.user.id),
+                    user_role=_get_user_role(request.user),
+                    patient_id=str(patient_id),
+                    text=params.get("q") or "",
+                    record_type=params.get("type") or "",
+                    metadata=metadata,
+                    limit=limit,
+                    cursor=params.get("cursor"),
+                )
+            )
+        except RecordError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response(
+            {
+                "data": [asdict(record) for record in result.records],
+                "meta": {"nextCursor": result.next_cursor},
+            }
+        )
+
+
+class RecordAccessReportView(APIView):
+    """Who accessed a patient's records, grouped by accessor and action (optionally per day)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        patient_id = _parse_uuid(params.get("patient_id"))
+        start = _parse_day(params.get("start"))
+        end = _parse_day(params.get("end")) if params.get("end") else timezone.localdate()
+        if patient_id is None or start is None or end is None:
+            return _error_response(
+                code="invalid_query",
+                message="patient_id (a UUID) and start (YYYY-MM-DD) are required; end must be a valid date.",
+                details={},
+                status=400,
+            )
+
+        usecase = GetAccessReportUseCase(DjangoRecordAccessReportRepository())
+        try:
+            result = usecase.execute(
+                AccessReportRequest(
+                    user_id=str(request.user.id),
+                    user_role=_get_user_role(request.user),
+                    patient_id=patient_id,
+                    start=start,
+                    end=end,
+                    by_day=params.get("group_by") == "day",
+                )
+            )
+        except RecordError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response(
+            {
+                "data": [asdict(row) for row in result.rows],
+                "meta": {"rolledUpThrough": result.rolled_up_through},
+            }
+        )
+
+
+class RecordAccessEventsView(APIView):
+    """Raw access log drill-down for a narrow window."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        patient_id = _parse_uuid(params.get("patient_id"))
+        start = _parse_instant(params.get("start"))
+        end = _parse_instant(params.get("end"))
+        if patient_id is None or start is None or end is None:
+            return _error_response(
+                code="invalid_query",
+                message="patient_id (a UUID), start and end are required.",
+                details={},
+                status=400,
+            )
+        try:
+            limit = min(max(int(params.get("limit") or 100), 1), 500)
+        except ValueError:
+            return _error_response(
+                code="invalid_pagination",
+                message="limit must be an integer.",
+                details={},
+                status=400,
+            )
+
+        usecase = GetAccessEventsUseCase(DjangoRecordAccessReportRepository())
+        try:
+            result = usecase.execute(
+                AccessEventsRequest(
+                    user_id=str(request.user.id),
+                    user_role=_get_user_role(request.user),
+                    patient_id=patient_id,
+                    start=start,
+                    end=end,
+                    limit=limit,
+                    cursor=params.get("cursor"),
+                )
+            )
+        except RecordError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response(
+            {
+                "data": [asdict(event) for event in result.events],
+                "meta": {"nextCursor": result.next_cursor},
+            }
+        )
+
+
+def _unhashed_etag(record) -> str:
+    # Until backfill_record_digests hashes the file; a new upload bumps updated_at
+    return f"{record.id}-{int(record.updated_at.timestamp() * 1000000)}-{record.file_size}"
+
+
+def _parse_uuid(value):
+    """The canonical form of a UUID, or None if missing or malformed."""
+    if not value:
+        return None
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        return None
+
+
+def _parse_day(value):
+    """A YYYY-MM-DD date, or None if missing, malformed or impossible (e.g. 2024-13-45)."""
+    if not value:
+        return None
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+def _parse_instant(value):
+    """Accept an ISO datetime or a date (midnight in the current timezone)."""
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        # Well formed but impossible, e.g. 2024-13-45T00:00
+        return None
+    if parsed is None:
+        day = _parse_day(value)
+        if day is None:
+            return None
+        parsed = datetime.combine(day, time.min)
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def _get_user_role(user) -> str:
+    if getattr(user, "is_staff", False):
+        return "admin"
+    return str(getattr(user, "role", "") or "").lower()
+
+
+def _error_response(code: str, message: str, details: dict, status: int):
+    return Response(
+        {"error": {"code": code, "message": message, "details": details or {}}},
+        status=status,
+    )
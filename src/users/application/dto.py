@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RequestDataExportRequest:
+    user_id: str
+    user_role: str
+    subject_id: str
+
+
+@dataclass(frozen=True)
+class DataExportRequest:
+    user_id: str
+    user_role: str
+    export_id: str
+
+
+class UserError(Exception):
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        details: Optional[dict] = None,
+        status: int = 400,
+    ) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details or {}
+        self.status = status
@@ -0,0 +1,11 @@
+from users.application.usecases.data_export import (
+    DownloadDataExportUseCase,
+    GetDataExportUseCase,
+    RequestDataExportUseCase,
+)
+
+__all__ = [
+    "DownloadDataExportUseCase",
+    "GetDataExportUseCase",
+    "RequestDataExportUseCase",
+]
@@ -0,0 +1,81 @@
+from users.application.dto import DataExportRequest, RequestDataExportRequest, UserError
+from users.domain.entities import DataExport, DataExportFile
+from users.domain.repositories import DataExportRepository
+from users.domain.value_objects import DataExportStatus
+
+
+class RequestDataExportUseCase:
+    def __init__(self, export_repository: DataExportRepository) -> None:
+        self.export_repository = export_repository
+
+    def execute(self, request: RequestDataExportRequest) -> DataExport:
+        if request.user_role != "admin" and request.user_id != request.subject_id:
+            raise UserError(
+                code="forbidden",
+                message="You can only export your own data.",
+                details={"userId": request.subject_id},
+                status=403,
+            )
+        if not self.export_repository.user_exists(request.subject_id):
+            raise UserError(
+                code="not_found",
+                message="User not found.",
+                details={"userId": request.subject_id},
+                status=404,
+            )
+        # One export at a time per user; repeated requests return the open one
+        existing = self.export_repository.get_open_for_user(request.subject_id)
+        if existing is not None:
+            return existing
+        return self.export_repository.create(request.subject_id, request.user_id)
+
+
+class GetDataExportUseCase:
+    def __init__(self, export_repository: DataExportRepository) -> None:
+        self.export_repository = export_repository
+
+    def execute(self, request: DataExportRequest) -> DataExport:
+        return _get_visible(self.export_repository, request)
+
+
+class DownloadDataExportUseCase:
+    def __init__(self, export_repository: DataExportRepository) -> None:
+        self.export_repository = export_repository
+
+    def execute(self, request: DataExportRequest) -> DataExportFile:
+        export = _get_visible(self.export_repository, request)
+        if export.status == DataExportStatus.EXPIRED:
+            raise UserError(
+                code="export_expired",
+                message="This export has expired; request a new one.",
+                details={"exportId": export.id},
+                status=410,
+            )
+        exported_file = self.export_repository.get_file(export.id)
+        if export.status != DataExportStatus.COMPLETE or exported_file is None:
+            raise UserError(
+                code="export_not_ready",
+                message="This export is not ready yet.",
+                details={"exportId": export.id, "status": export.status.value},
+                status=409,
+            )
+        return exported_file
+
+
+def _get_visible(export_repository: DataExportRepository, request: DataExportRequest) -> DataExport:
+    export = export_repository.get(request.export_id)
+    if export is None:
+        raise UserError(
+            code="not_found",
+            message="Export not found.",
+            details={"exportId": request.export_id},
+            status=404,
+        )
+    if request.user_role != "admin" and request.user_id not in (export.user_id, export.requested_by_id):
+        raise UserError(
+            code="forbidden",
+            message="You cannot access this export.",
+            details={"exportId": request.export_id},
+            status=403,
+        )
+    return export
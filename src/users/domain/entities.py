@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from users.domain.value_objects import DataExportStatus
+
+
+@dataclass(frozen=True)
+class DataExport:
+    id: str
+    user_id: str
+    requested_by_id: str
+    status: DataExportStatus
+    stage: str
+    items_done: int
+    items_total: int
+    bytes_written: int
+    file_size: Optional[int]
+    error: str
+    created_at: datetime
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    expires_at: Optional[datetime]
+
+
+@dataclass(frozen=True)
+class DataExportFile:
+    export_id: str
+    name: str
+    size: int
+    completed_at: datetime
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from users.domain.entities import DataExport, DataExportFile
+
+
+class DataExportRepository(ABC):
+    @abstractmethod
+    def get(self, export_id: str) -> Optional[DataExport]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def user_exists(self, user_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_open_for_user(self, user_id: str) -> Optional[DataExport]:
+        """The user's pending or running export, if any."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def create(self, user_id: str, requested_by_id: str) -> DataExport:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_file(self, export_id: str) -> Optional[DataExportFile]:
+        raise NotImplementedError
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class DataExportStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETE = "COMPLETE"
+    FAILED = "FAILED"
+    EXPIRED = "EXPIRED"
@@ -0,0 +1,346 @@
+import logging
+import os
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from appointments.infrastructure.models import Appointment
+from chat.infrastructure.models import Message as ChatMessage
+from common.blob_storage import get_blob_storage
+from records.infrastructure.models import MedicalRecord
+from users.infrastructure.models import DataExportJob, DataExportStatus, PatientProfile, User, UserPreferences
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+COPY_BLOCK_SIZE = 1024 * 1024
+PROGRESS_INTERVAL = 2.0
+# A RUNNING job without a heartbeat for this long is taken over by another worker
+STALE_AFTER = timedelta(minutes=10)
+EXPORT_RETENTION = timedelta(days=7)
+
+
+class ExportSuperseded(Exception):
+    """The job was reclaimed by another worker; this run must stop."""
+
+
+@dataclass(frozen=True)
+class ExportFile:
+    arcname: str
+    storage: Storage
+    name: str
+
+
+@dataclass(frozen=True)
+class Section:
+    """One JSON-lines member of the archive, plus the files its rows point at."""
+
+    name: str
+    queryset: QuerySet
+    fields: Tuple[str, ...]
+    # Columns read only to locate files; left out of the JSON
+    file_fields: Tuple[str, ...] = ()
+    file_for: Optional[Callable[[dict], Optional[ExportFile]]] = None
+    has_files: Q = field(default_factory=Q)
+
+
+def export_sections(user_id: str) -> List[Section]:
+    record_storage = MedicalRecord._meta.get_field("file").storage
+    blob_storage = get_blob_storage()
+
+    def record_file(row: dict) -> Optional[ExportFile]:
+        if row["blob__file"]:
+            return ExportFile(_arcname("medical_records", row), blob_storage, row["blob__file"])
+        if row["file"]:
+            return ExportFile(_arcname("medical_records", row), record_storage, row["file"])
+        return None
+
+    def message_file(row: dict) -> Optional[ExportFile]:
+        if row["blob__file"]:
+            return ExportFile(_arcname("chat_messages", row), blob_storage, row["blob__file"])
+        return None
+
+    return [
+        Section(
+            "user",
+            User.objects.filter(pk=user_id).order_by("pk"),
+            ("id", "email", "name", "role", "created_at", "updated_at"),
+        ),
+        Section(
+            "patient_profile",
+            PatientProfile.objects.filter(user_id=user_id).order_by("pk"),
+            ("date_of_birth", "gender", "phone_number", "address", "created_at", "updated_at"),
+        ),
+        Section(
+            "preferences",
+            UserPreferences.objects.filter(user_id=user_id).order_by("pk"),
+            (
+                "language",
+                "timezone",
+                "notifications_email",
+                "notifications_sms",
+                "notifications_push",
+                "created_at",
+                "updated_at",
+            ),
+        ),
+        Section(
+            "appointments",
+            Appointment.objects.filter(Q(patient_id=user_id) | Q(doctor_id=user_id)).order_by("start_time", "pk"),
+            (
+                "id",
+                "patient_id",
+                "doctor_id",
+                "start_time",
+                "end_time",
+                "status",
+                "notes",
+                "canceled_at",
+                "created_at",
+                "updated_at",
+            ),
+        ),
+        Section(
+            "medical_records",
+            MedicalRecord.objects.filter(patient_id=user_id).order_by("created_at", "pk"),
+            (
+                "id",
+                "record_type__slug",
+                "title",
+                "status",
+                "metadata",
+                "file_url",
+                "file_size",
+                "file_sha256",
+                "created_by_id",
+                "created_at",
+                "updated_at",
+            ),
+            file_fields=("file", "blob__file"),
+            file_for=record_file,
+            has_files=Q(blob__isnull=False) | ~Q(file=""),
+        ),
+        Section(
+            "chat_messages",
+            ChatMessage.objects.filter(conversation__participants__user_id=user_id).order_by(
+                "conversation_id", "created_at", "pk"
+            ),
+            (
+                "id",
+                "conversation_id",
+                "sender_id",
+                "message_type",
+                "body",
+                "file_url",
+                "metadata",
+                "created_at",
+                "edited_at",
+            ),
+            file_fields=("blob__file",),
+            file_for=message_file,
+            has_files=Q(blob__isnull=False),
+        ),
+    ]
+
+
+def claim_next_job() -> Optional[DataExportJob]:
+    """Claim the oldest pending job, or a running one whose worker stopped heartbeating."""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            DataExportJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=DataExportStatus.PENDING)
+                | Q(status=DataExportStatus.RUNNING, heartbeat_at__lt=now - STALE_AFTER)
+            )
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = DataExportStatus.RUNNING
+        job.stage = ""
+        job.items_done = 0
+        job.bytes_written = 0
+        # started_at doubles as a fencing token: updates from a superseded run match no row
+        job.started_at = now
+        job.heartbeat_at = now
+        job.save(update_fields=["status", "stage", "items_done", "bytes_written", "started_at", "heartbeat_at"])
+    return job
+
+
+def run_export(job: DataExportJob) -> None:
+    sections = export_sections(str(job.user_id))
+    total = sum(_count(section) for section in sections)
+    progress = _Progress(job, total)
+    handle = tempfile.NamedTemporaryFile(
+        suffix=".zip",
+        dir=getattr(settings, "FILE_UPLOAD_TEMP_DIR", None),
+        delete=False,
+    )
+    try:
+        with handle:
+            write_archive(sections, handle, progress)
+            size = handle.tell()
+        progress.set_stage("storing")
+        with open(handle.name, "rb") as archive:
+            name = job.file.storage.save(
+                job.file.field.generate_filename(job, f"export-{job.id}.zip"),
+                File(archive),
+            )
+        now = timezone.now()
+        finished = _fenced(job).update(
+            status=DataExportStatus.COMPLETE,
+            stage="",
+            file=name,
+            file_size=size,
+            items_done=total,
+            bytes_written=size,
+            completed_at=now,
+            heartbeat_at=now,
+            expires_at=now + EXPORT_RETENTION,
+        )
+        if not finished:
+            job.file.storage.delete(name)
+            raise ExportSuperseded(str(job.id))
+    except ExportSuperseded:
+        logger.warning("Export %s was taken over by another worker", job.id)
+    except Exception as exc:
+        logger.exception("Export %s failed", job.id)
+        _fenced(job).update(status=DataExportStatus.FAILED, error=str(exc)[:2000], completed_at=timezone.now())
+    finally:
+        try:
+            os.remove(handle.name)
+        except FileNotFoundError:
+            pass
+
+
+def write_archive(sections: List[Section], target: BinaryIO, progress: "_Progress") -> None:
+    """Write one JSON-lines member per section, then that section's files.
+
+    Rows come from server-side cursors and files are copied block by block,
+    so memory use does not depend on how much the user has.
+    """
+    encoder = DjangoJSONEncoder(separators=(",", ":"), ensure_ascii=False)
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for section in sections:
+            progress.set_stage(section.name)
+            with archive.open(f"{section.name}.jsonl", "w", force_zip64=True) as member:
+                rows = section.queryset.values(*section.fields, *section.file_fields)
+                for row in rows.iterator(chunk_size=CHUNK_SIZE):
+                    exported = section.file_for(row) if section.file_for else None
+                    for key in section.file_fields:
+                        row.pop(key)
+                    if exported is not None:
+                        row["attachment"] = exported.arcname
+                    member.write(encoder.encode(row).encode())
+                    member.write(b"\n")
+                    progress.advance(target)
+
+            if section.file_for is None:
+                continue
+            # Zip members are written one at a time, so files follow in a second pass
+            rows = section.queryset.filter(section.has_files).values(*section.fields, *section.file_fields)
+            for row in rows.iterator(chunk_size=CHUNK_SIZE):
+                exported = section.file_for(row)
+                if exported is None:
+                    continue
+                _copy_file(archive, exported, target, progress)
+                progress.advance(target)
+    progress.flush(target)
+
+
+def expire_exports(batch_size: int = 100) -> int:
+    """Delete archives past their retention; they contain health data."""
+    expired = 0
+    while True:
+        jobs = list(
+            DataExportJob.objects.filter(status=DataExportStatus.COMPLETE, expires_at__lt=timezone.now())
+            .order_by("expires_at")[:batch_size]
+        )
+        for job in jobs:
+            if job.file:
+                job.file.delete(save=False)
+            DataExportJob.objects.filter(pk=job.pk, status=DataExportStatus.COMPLETE).update(
+                status=DataExportStatus.EXPIRED,
+                file="",
+            )
+        expired += len(jobs)
+        if len(jobs) < batch_size:
+            return expired
+
+
+class _Progress:
+    def __init__(self, job: DataExportJob, total: int) -> None:
+        self.job = job
+        self.total = total
+        self.done = 0
+        self.stage = ""
+        self.last_flush = 0.0
+
+    def set_stage(self, stage: str) -> None:
+        self.stage = stage
+        self._write(bytes_written=None)
+
+    def advance(self, target: BinaryIO) -> None:
+        self.done += 1
+        self.heartbeat(target)
+
+    def heartbeat(self, target: BinaryIO) -> None:
+        if time.monotonic() - self.last_flush >= PROGRESS_INTERVAL:
+            self.flush(target)
+
+    def flush(self, target: BinaryIO) -> None:
+        self._write(bytes_written=target.tell())
+
+    def _write(self, bytes_written: Optional[int]) -> None:
+        values = {
+            "stage": self.stage,
+            "items_done": self.done,
+            "items_total": self.total,
+            "heartbeat_at": timezone.now(),
+        }
+        if bytes_written is not None:
+            values["bytes_written"] = bytes_written
+        if not _fenced(self.job).update(**values):
+            raise ExportSuperseded(str(self.job.id))
+        self.last_flush = time.monotonic()
+
+
+def _copy_file(archive: zipfile.ZipFile, exported: ExportFile, target: BinaryIO, progress: _Progress) -> None:
+    try:
+        source = exported.storage.open(exported.name, "rb")
+    except FileNotFoundError:
+        logger.warning("Export skipped missing file %s", exported.name)
+        return
+    with source, archive.open(exported.arcname, "w", force_zip64=True) as member:
+        for block in iter(lambda: source.read(COPY_BLOCK_SIZE), b""):
+            member.write(block)
+            progress.heartbeat(target)
+
+
+def _count(section: Section) -> int:
+    count = section.queryset.count()
+    if section.file_for is not None:
+        count += section.queryset.filter(section.has_files).count()
+    return count
+
+
+def _arcname(section: str, row: dict) -> str:
+    name = row["blob__file"] or row.get("file") or ""
+    return f"files/{section}/{row['id']}{os.path.splitext(name)[1].lower()}"
+
+
+def _fenced(job: DataExportJob) -> QuerySet:
+    return DataExportJob.objects.filter(pk=job.pk, started_at=job.started_at, status=DataExportStatus.RUNNING)
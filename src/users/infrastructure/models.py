@@ -110,3 +110,50 @@ class UserPreferences(models.Model):
 
     def __str__(self) -> str:
         return f"UserPreferences({self.user_id})"
+
+
+class DataExportStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    RUNNING = "RUNNING", "Running"
+    COMPLETE = "COMPLETE", "Complete"
+    FAILED = "FAILED", "Failed"
+    EXPIRED = "EXPIRED", "Expired"
+
+
+class DataExportJob(models.Model):
+    """A data-portability export of everything held about ``user``.
+
+    Built in the background by ``run_data_exports``; the progress fields are
+    updated as the archive is written.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.PROTECT, related_name="data_exports")
+    requested_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name="+")
+    status = models.CharField(max_length=20, choices=DataExportStatus.choices, default=DataExportStatus.PENDING)
+    stage = models.CharField(max_length=50, blank=True)
+    items_done = models.BigIntegerField(default=0)
+    items_total = models.BigIntegerField(default=0)
+    bytes_written = models.BigIntegerField(default=0)
+    file = models.FileField(upload_to="exports/%Y/%m/", blank=True)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+            # Work queue: only unfinished jobs are scanned when claiming
+            models.Index(
+                fields=["created_at"],
+                name="users_export_open_idx",
+                condition=models.Q(status__in=[DataExportStatus.PENDING, DataExportStatus.RUNNING]),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"DataExportJob({self.id})"
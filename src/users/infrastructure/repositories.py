@@ -0,0 +1,74 @@
+import uuid
+from typing import Optional
+
+from users.domain.entities import DataExport, DataExportFile
+from users.domain.repositories import DataExportRepository
+from users.domain.value_objects import DataExportStatus
+from users.infrastructure.models import DataExportJob, User
+from users.infrastructure.models import DataExportStatus as DataExportStatusModel
+
+
+class DjangoDataExportRepository(DataExportRepository):
+    def get(self, export_id: str) -> Optional[DataExport]:
+        if not _is_uuid(export_id):
+            return None
+        job = DataExportJob.objects.filter(pk=export_id).first()
+        return self._to_entity(job) if job else None
+
+    def user_exists(self, user_id: str) -> bool:
+        return _is_uuid(user_id) and User.objects.filter(pk=user_id).exists()
+
+    def get_open_for_user(self, user_id: str) -> Optional[DataExport]:
+        if not _is_uuid(user_id):
+            return None
+        job = (
+            DataExportJob.objects.filter(
+                user_id=user_id,
+                status__in=[DataExportStatusModel.PENDING, DataExportStatusModel.RUNNING],
+            )
+            .order_by("-created_at")
+            .first()
+        )
+        return self._to_entity(job) if job else None
+
+    def create(self, user_id: str, requested_by_id: str) -> DataExport:
+        return self._to_entity(DataExportJob.objects.create(user_id=user_id, requested_by_id=requested_by_id))
+
+    def get_file(self, export_id: str) -> Optional[DataExportFile]:
+        if not _is_uuid(export_id):
+            return None
+        job = DataExportJob.objects.filter(pk=export_id, status=DataExportStatusModel.COMPLETE).exclude(file="").first()
+        if job is None:
+            return None
+        return DataExportFile(
+            export_id=str(job.pk),
+            name=job.file.name,
+            size=job.file_size,
+            completed_at=job.completed_at,
+        )
+
+    def _to_entity(self, job: DataExportJob) -> DataExport:
+        return DataExport(
+            id=str(job.pk),
+            user_id=str(job.user_id),
+            requested_by_id=str(job.requested_by_id),
+            status=DataExportStatus(job.status),
+            stage=job.stage,
+            items_done=job.items_done,
+            items_total=job.items_total,
+            bytes_written=job.bytes_written,
+            file_size=job.file_size,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            completed_at=job.completed_at,
+            expires_at=job.expires_at,
+        )
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.infrastructure.data_export import claim_next_job, expire_exports, run_export
+
+
+class Command(BaseCommand):
+    help = "Build queued data-portability exports and delete expired archives."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0, help="Keep polling for jobs every N seconds.")
+
+    def handle(self, *args, **options):
+        while True:
+            expired = expire_exports()
+            if expired:
+                self.stdout.write(f"Expired {expired} exports.")
+            while True:
+                job = claim_next_job()
+                if job is None:
+                    break
+                self.stdout.write(f"Exporting data for user {job.user_id} (job {job.id})")
+                run_export(job)
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
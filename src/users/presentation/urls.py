@@ -0,0 +1,21 @@
+from django.urls import path
+
+from users.presentation.views import DataExportDetailView, DataExportDownloadView, DataExportRequestView
+
+urlpatterns = [
+    path(
+        "<str:user_id>/exports/",
+        DataExportRequestView.as_view(),
+        name="users-data-export-request",
+    ),
+    path(
+        "exports/<str:export_id>/",
+        DataExportDetailView.as_view(),
+        name="users-data-export-detail",
+    ),
+    path(
+        "exports/<str:export_id>/download/",
+        DataExportDownloadView.as_view(),
+        name="users-data-export-download",
+    ),
+]
@@ -0,0 +1,102 @@
+from dataclasses import asdict
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from records.presentation.downloads import stored_file_response
+from users.application.dto import DataExportRequest, RequestDataExportRequest, UserError
+from users.application.usecases import (
+    DownloadDataExportUseCase,
+    GetDataExportUseCase,
+    RequestDataExportUseCase,
+)
+from users.domain.entities import DataExport
+from users.infrastructure.models import DataExportJob
+from users.infrastructure.repositories import DjangoDataExportRepository
+
+
+class DataExportRequestView(APIView):
+    """Queue a data-portability export; the archive is built in the background."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, user_id: str):
+        usecase = RequestDataExportUseCase(DjangoDataExportRepository())
+        try:
+            export = usecase.execute(
+                RequestDataExportRequest(
+                    user_id=str(request.user.id),
+                    user_role=_get_user_role(request.user),
+                    subject_id=str(user_id),
+                )
+            )
+        except UserError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response({"data": _export_data(export), "meta": {}}, status=202)
+
+
+class DataExportDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, export_id: str):
+        usecase = GetDataExportUseCase(DjangoDataExportRepository())
+        try:
+            export = usecase.execute(
+                DataExportRequest(
+                    user_id=str(request.user.id),
+                    user_role=_get_user_role(request.user),
+                    export_id=str(export_id),
+                )
+            )
+        except UserError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response({"data": _export_data(export), "meta": {}})
+
+
+class DataExportDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, export_id: str):
+        usecase = DownloadDataExportUseCase(DjangoDataExportRepository())
+        try:
+            exported_file = usecase.execute(
+                DataExportRequest(
+                    user_id=str(request.user.id),
+                    user_role=_get_user_role(request.user),
+                    export_id=str(export_id),
+                )
+            )
+        except UserError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return stored_file_response(
+            request,
+            storage=DataExportJob._meta.get_field("file").storage,
+            name=exported_file.name,
+            size=exported_file.size,
+            etag=exported_file.export_id,
+            last_modified=exported_file.completed_at,
+            filename=f"data-export-{exported_file.completed_at:%Y%m%d}.zip",
+        )
+
+
+def _export_data(export: DataExport) -> dict:
+    data = asdict(export)
+    data["progress"] = round(export.items_done / export.items_total, 4) if export.items_total else 0.0
+    return data
+
+
+def _get_user_role(user) -> str:
+    if getattr(user, "is_staff", False):
+        return "admin"
+    return str(getattr(user, "role", "") or "").lower()
+
+
+def _error_response(code: str, message: str, details: dict, status: int):
+    return Response(
+        {"error": {"code": code, "message": message, "details": details or {}}},
+        status=status,
+    )
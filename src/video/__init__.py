@@ -0,0 +1 @@
+"""Video app package."""
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class IngestVideoEventsRequest:
+    user_id: str
+    session_id: str
+    events: list
+
+
+@dataclass(frozen=True)
+class RejectedEvent:
+    index: int
+    message: str
+
+
+@dataclass(frozen=True)
+class IngestVideoEventsResult:
+    accepted: int
+    rejected: List[RejectedEvent]
+
+
+@dataclass(frozen=True)
+class GetSessionQualityRequest:
+    user_id: str
+    session_id: str
+
+
+@dataclass(frozen=True)
+class HeartbeatRequest:
+    user_id: str
+    session_id: str
+
+
+@dataclass(frozen=True)
+class HeartbeatResult:
+    session_id: str
+    lease_expires_at: datetime
+
+
+@dataclass(frozen=True)
+class JoinVideoSessionRequest:
+    user_id: str
+    appointment_id: str
+
+
+@dataclass(frozen=True)
+class JoinVideoSessionResult:
+    session_id: str
+    provider_session_id: str
+    status: str
+    pre_provisioned: bool
+
+
+class VideoError(Exception):
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        details: Optional[dict] = None,
+        status: int = 400,
+    ) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details or {}
+        self.status = status
@@ -0,0 +1,24 @@
+from jsonschema import Draft202012Validator
+
+MAX_EVENTS_PER_BATCH = 500
+
+EVENT_SCHEMA = {
+    "type": "object",
+    "required": ["type", "ts"],
+    "additionalProperties": False,
+    "properties": {
+        "type": {"type": "string", "minLength": 1, "maxLength": 100},
+        # Client clock, milliseconds since the epoch
+        "ts": {"type": "integer", "minimum": 0, "maximum": 4102444800000},
+        "payload": {"type": "object", "maxProperties": 64},
+    },
+}
+
+BATCH_SCHEMA = {
+    "type": "array",
+    "maxItems": MAX_EVENTS_PER_BATCH,
+    "items": EVENT_SCHEMA,
+}
+
+# Built once: the schema is checked and compiled at import, not per request
+batch_validator = Draft202012Validator(BATCH_SCHEMA)
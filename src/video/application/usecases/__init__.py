@@ -0,0 +1,11 @@
+from video.application.usecases.get_session_quality import GetSessionQualityUseCase
+from video.application.usecases.heartbeat import HeartbeatVideoSessionUseCase
+from video.application.usecases.ingest_events import IngestVideoEventsUseCase
+from video.application.usecases.join_session import JoinVideoSessionUseCase
+
+__all__ = [
+    "GetSessionQualityUseCase",
+    "HeartbeatVideoSessionUseCase",
+    "IngestVideoEventsUseCase",
+    "JoinVideoSessionUseCase",
+]
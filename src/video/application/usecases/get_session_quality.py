@@ -0,0 +1,48 @@
+from video.application.dto import GetSessionQualityRequest, VideoError
+from video.domain.entities import SessionQuality
+from video.domain.repositories import VideoQualityRepository, VideoSessionRepository
+
+
+class GetSessionQualityUseCase:
+    def __init__(
+        self,
+        session_repository: VideoSessionRepository,
+        quality_repository: VideoQualityRepository,
+    ) -> None:
+        self.session_repository = session_repository
+        self.quality_repository = quality_repository
+
+    def execute(self, request: GetSessionQualityRequest) -> SessionQuality:
+        session = self.session_repository.get_by_id(request.session_id)
+        if session is None:
+            raise VideoError(
+                code="session_not_found",
+                message="Video session not found.",
+                details={"sessionId": request.session_id},
+                status=404,
+            )
+        if request.user_id not in {session.doctor_id, session.patient_id}:
+            raise VideoError(
+                code="forbidden",
+                message="You are not a participant in this video session.",
+                details={"sessionId": session.id},
+                status=403,
+            )
+
+        quality = self.quality_repository.get_for_session(session.id)
+        if quality is None:
+            # No events rolled up yet
+            return SessionQuality(
+                session_id=session.id,
+                event_count=0,
+                sample_count=0,
+                avg_bitrate_kbps=None,
+                min_bitrate_kbps=None,
+                max_bitrate_kbps=None,
+                avg_packet_loss=None,
+                max_packet_loss=None,
+                reconnects=0,
+                first_event_at=None,
+                last_event_at=None,
+            )
+        return quality
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Callable
+
+from video.application.dto import HeartbeatRequest, HeartbeatResult, VideoError
+from video.domain.repositories import VideoSessionRepository
+
+
+class HeartbeatVideoSessionUseCase:
+    def __init__(
+        self,
+        session_repository: VideoSessionRepository,
+        lease_seconds: int,
+        clock: Callable[[], datetime] = lambda: datetime.now(dt_timezone.utc),
+    ) -> None:
+        self.session_repository = session_repository
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+
+    def execute(self, request: HeartbeatRequest) -> HeartbeatResult:
+        session = self.session_repository.get_by_id(request.session_id)
+        if session is None:
+            raise VideoError(
+                code="session_not_found",
+                message="Video session not found.",
+                details={"sessionId": request.session_id},
+                status=404,
+            )
+        if request.user_id not in {session.doctor_id, session.patient_id}:
+            raise VideoError(
+                code="forbidden",
+                message="You are not a participant in this video session.",
+                details={"sessionId": session.id},
+                status=403,
+            )
+
+        now = self.clock()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        # The status is re-checked in the UPDATE, so a concurrent sweep wins cleanly
+        if not self.session_repository.renew_lease(session.id, now, expires_at):
+            raise VideoError(
+                code="session_closed",
+                message="Video session is no longer active.",
+                details={"sessionId": session.id},
+                status=409,
+            )
+        return HeartbeatResult(session_id=session.id, lease_expires_at=expires_at)
@@ -0,0 +1,90 @@
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, List
+
+from video.application.dto import (
+    IngestVideoEventsRequest,
+    IngestVideoEventsResult,
+    RejectedEvent,
+    VideoError,
+)
+from video.application.event_schema import MAX_EVENTS_PER_BATCH, batch_validator
+from video.domain.entities import VideoEvent
+from video.domain.repositories import VideoEventSink, VideoEventSinkFull, VideoSessionRepository
+from video.domain.value_objects import VideoSessionStatus
+
+
+class IngestVideoEventsUseCase:
+    def __init__(
+        self,
+        session_repository: VideoSessionRepository,
+        event_sink: VideoEventSink,
+    ) -> None:
+        self.session_repository = session_repository
+        self.event_sink = event_sink
+
+    def execute(self, request: IngestVideoEventsRequest) -> IngestVideoEventsResult:
+        if not isinstance(request.events, list) or len(request.events) > MAX_EVENTS_PER_BATCH:
+            raise VideoError(
+                code="invalid_batch",
+                message=f"Events must be an array of at most {MAX_EVENTS_PER_BATCH} items.",
+                details={},
+                status=400,
+            )
+
+        session = self.session_repository.get_by_id(request.session_id)
+        if session is None:
+            raise VideoError(
+                code="session_not_found",
+                message="Video session not found.",
+                details={"sessionId": request.session_id},
+                status=404,
+            )
+        if request.user_id not in {session.doctor_id, session.patient_id}:
+            raise VideoError(
+                code="forbidden",
+                message="You are not a participant in this video session.",
+                details={"sessionId": session.id},
+                status=403,
+            )
+        if session.status not in {VideoSessionStatus.INITIATED, VideoSessionStatus.ACTIVE}:
+            raise VideoError(
+                code="session_closed",
+                message="Video session is no longer accepting events.",
+                details={"status": session.status},
+                status=409,
+            )
+
+        # One validation pass over the whole batch; errors point at the bad items
+        rejected: Dict[int, str] = {}
+        for error in batch_validator.iter_errors(request.events):
+            if error.absolute_path:
+                rejected.setdefault(error.absolute_path[0], error.message)
+
+        events: List[VideoEvent] = []
+        for index, raw in enumerate(request.events):
+            if index in rejected:
+                continue
+            events.append(
+                VideoEvent(
+                    session_id=session.id,
+                    event_type=raw["type"],
+                    occurred_at=datetime.fromtimestamp(raw["ts"] / 1000, tz=dt_timezone.utc),
+                    payload=raw.get("payload", {}),
+                )
+            )
+        if events:
+            try:
+                self.event_sink.write(events)
+            except VideoEventSinkFull:
+                # Nothing from the batch was kept, so the client can resend all of it
+                raise VideoError(
+                    code="ingest_unavailable",
+                    message="Video events cannot be accepted right now; retry the batch later.",
+                    details={"sessionId": session.id},
+                    status=503,
+                )
+
+        return IngestVideoEventsResult(
+            accepted=len(events),
+            rejected=[RejectedEvent(index=index, message=message) for index, message in sorted(rejected.items())],
+        )
@@ -0,0 +1,92 @@
+from appointments.domain.repositories import AppointmentRepository
+from appointments.domain.value_objects import AppointmentStatus
+from video.application.dto import JoinVideoSessionRequest, JoinVideoSessionResult, VideoError
+from video.domain.entities import VideoSession
+from video.domain.repositories import VideoProvider, VideoProviderError, VideoSessionRepository
+from video.domain.value_objects import VideoSessionStatus
+
+
+class JoinVideoSessionUseCase:
+    def __init__(
+        self,
+        session_repository: VideoSessionRepository,
+        appointment_repository: AppointmentRepository,
+        provider: VideoProvider,
+    ) -> None:
+        self.session_repository = session_repository
+        self.appointment_repository = appointment_repository
+        self.provider = provider
+
+    def execute(self, request: JoinVideoSessionRequest) -> JoinVideoSessionResult:
+        # Pre-provisioned sessions are a single lookup on the appointment index
+        session = self.session_repository.get_by_appointment(request.appointment_id)
+        if session is not None:
+            return self._result(request, session, pre_provisioned=True)
+
+        appointment = self.appointment_repository.get_by_id(request.appointment_id)
+        if appointment is None:
+            raise VideoError(
+                code="appointment_not_found",
+                message="Appointment not found.",
+                details={"appointmentId": request.appointment_id},
+                status=404,
+            )
+        if request.user_id not in {appointment.doctor_id, appointment.patient_id}:
+            raise VideoError(
+                code="forbidden",
+                message="You are not a participant in this appointment.",
+                details={"appointmentId": appointment.id},
+                status=403,
+            )
+        if appointment.status != AppointmentStatus.BOOKED:
+            raise VideoError(
+                code="appointment_not_booked",
+                message="Only booked appointments can be joined.",
+                details={"status": appointment.status},
+                status=409,
+            )
+
+        # Slow path: the scheduler has not reached this appointment yet
+        try:
+            provider_session_id = self.provider.create_room(appointment.id)
+        except VideoProviderError as exc:
+            raise VideoError(
+                code="provider_unavailable",
+                message="The video provider is unavailable. Please retry shortly.",
+                details={"reason": str(exc)},
+                status=503,
+            ) from exc
+        session = self.session_repository.create_for_appointment(appointment.id, provider_session_id)
+        return self._result(request, session, pre_provisioned=False)
+
+    def _result(
+        self, request: JoinVideoSessionRequest, session: VideoSession, pre_provisioned: bool
+    ) -> JoinVideoSessionResult:
+        if request.user_id not in {session.doctor_id, session.patient_id}:
+            raise VideoError(
+                code="forbidden",
+                message="You are not a participant in this video session.",
+                details={"sessionId": session.id},
+                status=403,
+            )
+        # The appointment is loaded with the session, so the fast path re-checks it for free
+        if session.appointment_status != AppointmentStatus.BOOKED.value:
+            raise VideoError(
+                code="appointment_not_booked",
+                message="Only booked appointments can be joined.",
+                details={"status": session.appointment_status},
+                status=409,
+            )
+        if session.status not in {VideoSessionStatus.INITIATED, VideoSessionStatus.ACTIVE}:
+            raise VideoError(
+                code="session_closed",
+                message="Video session has already ended.",
+                details={"status": session.status},
+                status=409,
+            )
+        return JoinVideoSessionResult(
+            session_id=session.id,
+            provider_session_id=session.provider_session_id,
+            status=session.status.value,
+            pre_provisioned=pre_provisioned,
+        )
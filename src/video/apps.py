@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+
+
+class VideoConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "video"
+
+    def ready(self) -> None:
+        from django.db.models.signals import post_save
+
+        from appointments.infrastructure.models import Appointment
+        from video.infrastructure import models  # noqa: F401
+        from video.infrastructure.event_sink import video_event_writer
+        from video.infrastructure.quality_rollup import rollup_flushed_events
+        from video.infrastructure.teardown import appointment_saved
+
+        # Quality summaries are folded in from each batch, in the transaction
+        # that inserts it, so a rebuild never counts a batch twice
+        video_event_writer().add_flush_listener(rollup_flushed_events, in_transaction=True)
+        # Canceling an appointment closes any pre-provisioned session for it
+        post_save.connect(appointment_saved, sender=Appointment, dispatch_uid="video.appointment_teardown")
@@ -0,0 +1,54 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from video.domain.value_objects import VideoSessionStatus
+
+
+@dataclass(frozen=True)
+class VideoSession:
+    id: str
+    appointment_id: str
+    doctor_id: str
+    patient_id: str
+    status: VideoSessionStatus
+    provider_session_id: str
+    started_at: Optional[datetime]
+    ended_at: Optional[datetime]
+    lease_expires_at: Optional[datetime] = None
+    appointment_status: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class VideoEvent:
+    session_id: str
+    event_type: str
+    occurred_at: datetime
+    payload: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class QualityMinute:
+    minute: datetime
+    event_count: int
+    avg_bitrate_kbps: Optional[float]
+    min_bitrate_kbps: Optional[float]
+    avg_packet_loss: Optional[float]
+    max_packet_loss: Optional[float]
+    reconnects: int
+
+
+@dataclass(frozen=True)
+class SessionQuality:
+    session_id: str
+    event_count: int
+    sample_count: int
+    avg_bitrate_kbps: Optional[float]
+    min_bitrate_kbps: Optional[float]
+    max_bitrate_kbps: Optional[float]
+    avg_packet_loss: Optional[float]
+    max_packet_loss: Optional[float]
+    reconnects: int
+    first_event_at: Optional[datetime]
+    last_event_at: Optional[datetime]
+    minutes: List[QualityMinute] = field(default_factory=list)
@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from video.domain.entities import SessionQuality, VideoEvent, VideoSession
+
+
+class VideoSessionRepository(ABC):
+    @abstractmethod
+    def get_by_id(self, session_id: str) -> Optional[VideoSession]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_by_appointment(self, appointment_id: str) -> Optional[VideoSession]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_for_appointment(self, appointment_id: str, provider_session_id: str) -> VideoSession:
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew_lease(self, session_id: str, now: datetime, expires_at: datetime) -> bool:
+        raise NotImplementedError
+
+
+class VideoEventSinkFull(Exception):
+    """The sink could not take the batch in time; none of its events were kept."""
+
+
+class VideoEventSink(ABC):
+    @abstractmethod
+    def write(self, events: List[VideoEvent]) -> None:
+        """Keep every event or, raising VideoEventSinkFull, none of them."""
+        raise NotImplementedError
+
+
+class VideoQualityRepository(ABC):
+    @abstractmethod
+    def get_for_session(self, session_id: str) -> Optional[SessionQuality]:
+        raise NotImplementedError
+
+
+class VideoProviderError(Exception):
+    """The provider could not create or reach a room."""
+
+
+class VideoProvider(ABC):
+    @abstractmethod
+    def create_room(self, appointment_id: str) -> str:
+        """Create a provider room and return its provider_session_id."""
+        raise NotImplementedError
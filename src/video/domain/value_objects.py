@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class VideoSessionStatus(str, Enum):
+    INITIATED = "INITIATED"
+    ACTIVE = "ACTIVE"
+    ENDED = "ENDED"
+    FAILED = "FAILED"
@@ -0,0 +1,30 @@
+from typing import List
+
+from common.audit import BufferedBulkWriter, get_writer
+from video.domain.entities import VideoEvent
+from video.domain.repositories import VideoEventSink, VideoEventSinkFull
+from video.infrastructure.models import VideoEventLog
+
+WRITER_NAME = "video_events"
+
+
+def video_event_writer() -> BufferedBulkWriter:
+    return get_writer(WRITER_NAME)
+
+
+class BufferedVideoEventSink(VideoEventSink):
+    """Queues events in the bounded video_events writer; they are bulk inserted off the request path."""
+
+    def write(self, events: List[VideoEvent]) -> None:
+        rows = [
+            VideoEventLog(
+                session_id=event.session_id,
+                event_type=event.event_type,
+                payload=event.payload,
+                occurred_at=event.occurred_at,
+            )
+            for event in events
+        ]
+        # One deadline for the whole batch, not one per event
+        if not video_event_writer().enqueue_many(rows):
+            raise VideoEventSinkFull(f"Dropped a batch of {len(rows)} video events")
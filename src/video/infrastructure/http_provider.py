@@ -0,0 +1,169 @@
+import json
+import logging
+import threading
+import time
+from typing import Callable
+
+import urllib3
+from django.core.exceptions import ImproperlyConfigured
+from urllib3.exceptions import EmptyPoolError, HTTPError
+
+from video.domain.repositories import VideoProvider, VideoProviderError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(VideoProviderError):
+    pass
+
+
+class CircuitBreaker:
+    """Fails fast after ``failure_threshold`` consecutive provider failures.
+
+    After ``reset_timeout`` seconds one trial call is let through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError("video provider circuit is open")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give up a half-open trial that never reached the provider."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("Video provider circuit opened after %d failures", self._failures)
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                self._trial_in_flight = False
+
+
+class HttpVideoProvider(VideoProvider):
+    """Provider adapter over one keep-alive connection pool.
+
+    At most ``max_connections`` calls are in flight per process; further
+    callers wait ``pool_timeout`` seconds for a connection and then fail, so
+    a slow provider cannot hold every request worker. Connect and read
+    timeouts bound each call, and the circuit breaker stops calling a
+    provider that keeps failing.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = "",
+        max_connections: int = 10,
+        connect_timeout: float = 1.0,
+        read_timeout: float = 3.0,
+        pool_timeout: float = 0.5,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        if not base_url:
+            raise ImproperlyConfigured("HttpVideoProvider needs a base_url (VIDEO_PROVIDER_URL).")
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        self.base_url = base_url.rstrip("/")
+        self._path_prefix = (urllib3.util.parse_url(self.base_url).path or "").rstrip("/")
+        self.pool_timeout = pool_timeout
+        self.breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+        self._pool = urllib3.connection_from_url(
+            self.base_url,
+            maxsize=max_connections,
+            block=True,
+            headers=headers,
+            timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+            retries=False,
+        )
+
+    def create_room(self, appointment_id: str) -> str:
+        data = self._post("/rooms", {"external_id": appointment_id}, idempotency_key=f"room:{appointment_id}")
+        room_id = data.get("id")
+        if not room_id:
+            raise VideoProviderError("provider response is missing the room id")
+        return str(room_id)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _post(self, path: str, body: dict, idempotency_key: str) -> dict:
+        self.breaker.before_call()
+        settled = False
+        try:
+            try:
+                response = self._pool.request(
+                    "POST",
+                    self._path_prefix + path,
+                    body=json.dumps(body).encode(),
+                    headers={**self._pool.headers, "Idempotency-Key": idempotency_key},
+                    pool_timeout=self.pool_timeout,
+                )
+            except EmptyPoolError as exc:
+                # Local backpressure, not a provider fault: do not trip the breaker
+                raise VideoProviderError("all provider connections are busy") from exc
+            except HTTPError as exc:
+                self.breaker.record_failure()
+                settled = True
+                raise VideoProviderError(f"provider request failed: {exc}") from exc
+
+            if response.status >= 500 or response.status == 429:
+                self.breaker.record_failure()
+                settled = True
+                raise VideoProviderError(f"provider returned HTTP {response.status}")
+            self.breaker.record_success()
+            settled = True
+        finally:
+            if not settled:
+                # Anything that ended the call without an outcome gives the half-open trial back
+                self.breaker.release_trial()
+        if response.status >= 400:
+            raise VideoProviderError(f"provider rejected the request with HTTP {response.status}")
+        try:
+            return json.loads(response.data or b"{}")
+        except ValueError as exc:
+            raise VideoProviderError("provider returned invalid JSON") from exc
@@ -0,0 +1,83 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from video.domain.value_objects import VideoSessionStatus
+from video.infrastructure.models import VideoEventLog, VideoSession
+from video.infrastructure.quality_rollup import apply_rollup
+
+logger = logging.getLogger(__name__)
+
+LEASE_EXPIRED_EVENT = "session.lease_expired"
+
+
+@dataclass
+class SweepResult:
+    expired: int = 0
+    batches: int = 0
+
+
+def sweep_expired_leases(
+    now: Optional[datetime] = None,
+    batch_size: int = 500,
+    lease_seconds: Optional[int] = None,
+) -> SweepResult:
+    """Fail ACTIVE sessions whose heartbeat lease has lapsed, one batch per transaction.
+
+    Sessions that went ACTIVE before leases existed have no lease; they are
+    treated as holding one lease from when they started.
+    """
+    now = now or timezone.now()
+    if lease_seconds is None:
+        lease_seconds = getattr(settings, "VIDEO_SESSION_LEASE_SECONDS", 45)
+    stale = now - timedelta(seconds=lease_seconds)
+    expired = Q(lease_expires_at__lt=now) | Q(
+        Q(started_at__lt=stale) | Q(started_at__isnull=True, created_at__lt=stale),
+        lease_expires_at__isnull=True,
+    )
+    result = SweepResult()
+    while True:
+        closed = _sweep_batch(now, expired, batch_size)
+        if not closed:
+            return result
+        result.expired += len(closed)
+        result.batches += 1
+        if len(closed) < batch_size:
+            return result
+
+
+def _sweep_batch(now: datetime, condition: Q, batch_size: int) -> List[VideoEventLog]:
+    with transaction.atomic():
+        # Served by video_active_lease_idx; locked rows belong to a concurrent sweeper
+        expired = list(
+            VideoSession.objects.select_for_update(skip_locked=True)
+            .filter(condition, status=VideoSessionStatus.ACTIVE.value)
+            .order_by(F("lease_expires_at").asc(nulls_first=True))
+            .values_list("pk", "lease_expires_at")[:batch_size]
+        )
+        if not expired:
+            return []
+        VideoSession.objects.filter(pk__in=[pk for pk, _ in expired]).update(
+            status=VideoSessionStatus.FAILED.value,
+            ended_at=now,
+        )
+        logs = VideoEventLog.objects.bulk_create(
+            [
+                VideoEventLog(
+                    session_id=pk,
+                    event_type=LEASE_EXPIRED_EVENT,
+                    payload={"lease_expires_at": lease_expires_at.isoformat() if lease_expires_at else None},
+                    occurred_at=now,
+                )
+                for pk, lease_expires_at in expired
+            ]
+        )
+        apply_rollup(logs)
+    logger.info("Failed %d video sessions with expired leases", len(logs))
+    return logs
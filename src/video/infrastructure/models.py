@@ -25,12 +25,19 @@ class VideoSession(models.Model):
     provider_session_id = models.CharField(max_length=255, blank=True)
     started_at = models.DateTimeField(null=True, blank=True)
     ended_at = models.DateTimeField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["created_at"]),
+            # Only live calls are swept, so ended rows stay out of this index
+            models.Index(
+                fields=["lease_expires_at"],
+                name="video_active_lease_idx",
+                condition=models.Q(status=VideoSessionStatus.ACTIVE),
+            ),
         ]
 
     def __str__(self) -> str:
@@ -46,6 +53,7 @@ class VideoEventLog(models.Model):
     )
     event_type = models.CharField(max_length=100)
     payload = models.JSONField(default=dict, blank=True)
+    occurred_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -56,3 +64,59 @@ class VideoEventLog(models.Model):
 
     def __str__(self) -> str:
         return f"{self.session_id}:{self.event_type}"
+
+
+class VideoSessionQualitySummary(models.Model):
+    session = models.OneToOneField(
+        VideoSession,
+        on_delete=models.PROTECT,
+        primary_key=True,
+        related_name="quality_summary",
+    )
+    event_count = models.PositiveIntegerField(default=0)
+    sample_count = models.PositiveIntegerField(default=0)
+    bitrate_sum = models.FloatField(default=0)
+    bitrate_min = models.FloatField(null=True, blank=True)
+    bitrate_max = models.FloatField(null=True, blank=True)
+    packet_loss_sum = models.FloatField(default=0)
+    # Samples carrying packet_loss; they need not carry a bitrate too
+    packet_loss_count = models.PositiveIntegerField(default=0)
+    packet_loss_max = models.FloatField(null=True, blank=True)
+    reconnects = models.PositiveIntegerField(default=0)
+    first_event_at = models.DateTimeField(null=True, blank=True)
+    last_event_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"VideoSessionQualitySummary({self.session_id})"
+
+
+class VideoQualityMinute(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    session = models.ForeignKey(
+        VideoSession,
+        on_delete=models.PROTECT,
+        related_name="quality_minutes",
+    )
+    minute = models.DateTimeField()
+    event_count = models.PositiveIntegerField(default=0)
+    sample_count = models.PositiveIntegerField(default=0)
+    bitrate_sum = models.FloatField(default=0)
+    bitrate_min = models.FloatField(null=True, blank=True)
+    bitrate_max = models.FloatField(null=True, blank=True)
+    packet_loss_sum = models.FloatField(default=0)
+    # Samples carrying packet_loss; they need not carry a bitrate too
+    packet_loss_count = models.PositiveIntegerField(default=0)
+    packet_loss_max = models.FloatField(null=True, blank=True)
+    reconnects = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["session", "minute"],
+                name="uniq_video_quality_minute",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.session_id}:{self.minute.isoformat()}"
@@ -0,0 +1,95 @@
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class ProviderStubServer:
+    """Local stand-in for the video provider's HTTP API.
+
+    Serves ``POST /rooms`` on a background thread, with configurable
+    latency and failure rate, so HttpVideoProvider can be exercised
+    without the real service::
+
+        with ProviderStubServer(latency=0.2) as stub:
+            provider = HttpVideoProvider(stub.url)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+    ) -> None:
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ProviderStubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="video-provider-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def __enter__(self) -> "ProviderStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                stub.requests += 1
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if self.path.rstrip("/") != "/rooms":
+                    return self._reply(404, {"error": "not found"})
+                if stub.failure_rate and random.random() < stub.failure_rate:
+                    return self._reply(stub.failure_status, {"error": "unavailable"})
+                try:
+                    external_id = json.loads(body or b"{}").get("external_id", "")
+                except ValueError:
+                    return self._reply(400, {"error": "invalid json"})
+                room_id = f"stub-{uuid.uuid5(uuid.NAMESPACE_URL, f'appointment:{external_id}')}"
+                return self._reply(201, {"id": room_id, "external_id": external_id})
+
+            def _reply(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,81 @@
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from video.domain.repositories import VideoProvider, VideoProviderError
+
+DEFAULT_PROVIDER = {
+    "BACKEND": "video.infrastructure.providers.FakeVideoProvider",
+    "OPTIONS": {},
+}
+
+
+class FakeVideoProvider(VideoProvider):
+    """In-process stand-in for the real provider, for local runs and tests.
+
+    Room ids are derived from the appointment id, so repeated calls are
+    idempotent like the real API.
+    """
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0) -> None:
+        self.latency = latency
+        self.failure_rate = failure_rate
+
+    def create_room(self, appointment_id: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise VideoProviderError(f"fake provider failed for appointment {appointment_id}")
+        return f"fake-{uuid.uuid5(uuid.NAMESPACE_URL, f'appointment:{appointment_id}')}"
+
+
+@dataclass
+class ProvisioningBatch:
+    created: Dict[str, str] = field(default_factory=dict)
+    failed: Dict[str, Exception] = field(default_factory=dict)
+
+
+class ConcurrentProvisioningClient:
+    """Fans provider calls out over a long-lived thread pool."""
+
+    def __init__(self, provider: VideoProvider, max_workers: int = 8) -> None:
+        self.provider = provider
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="video-provider")
+
+    def create_rooms(self, appointment_ids: Iterable[str]) -> ProvisioningBatch:
+        futures = {
+            appointment_id: self._executor.submit(self.provider.create_room, appointment_id)
+            for appointment_id in appointment_ids
+        }
+        batch = ProvisioningBatch()
+        for appointment_id, future in futures.items():
+            try:
+                batch.created[appointment_id] = future.result()
+            except Exception as exc:
+                batch.failed[appointment_id] = exc
+        return batch
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+_provider: Optional[VideoProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_video_provider() -> VideoProvider:
+    """Return the process-wide provider configured by ``settings.VIDEO_PROVIDER``."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            config = getattr(settings, "VIDEO_PROVIDER", DEFAULT_PROVIDER)
+            _provider = import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+        return _provider
@@ -0,0 +1,65 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.utils import timezone
+
+from appointments.infrastructure.models import Appointment, AppointmentStatus
+from video.infrastructure.models import VideoSession
+from video.infrastructure.providers import ConcurrentProvisioningClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProvisioningResult:
+    provisioned: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+def provision_upcoming_sessions(
+    client: ConcurrentProvisioningClient,
+    window_minutes: int = 30,
+    batch_size: int = 100,
+    now: Optional[datetime] = None,
+) -> ProvisioningResult:
+    """Create video sessions for booked appointments starting within the window.
+
+    Provider calls for a batch run concurrently and outside any transaction;
+    failures are logged and retried on the next run.
+    """
+    now = now or timezone.now()
+    upcoming = Appointment.objects.filter(
+        status=AppointmentStatus.BOOKED,
+        start_time__lte=now + timedelta(minutes=window_minutes),
+        end_time__gt=now,
+        video_session__isnull=True,
+    ).order_by("start_time", "id")
+
+    result = ProvisioningResult()
+    cursor = None
+    while True:
+        page = upcoming
+        if cursor is not None:
+            page = page.filter(start_time__gte=cursor[0]).exclude(start_time=cursor[0], id__lte=cursor[1])
+        rows = list(page.values_list("id", "start_time")[:batch_size])
+        if not rows:
+            return result
+        cursor = (rows[-1][1], rows[-1][0])
+
+        batch = client.create_rooms([str(appointment_id) for appointment_id, _ in rows])
+        for appointment_id, exc in batch.failed.items():
+            logger.warning("Could not provision video session for appointment %s: %s", appointment_id, exc)
+        # A participant may have joined in the meantime; their session is kept
+        VideoSession.objects.bulk_create(
+            [
+                VideoSession(appointment_id=appointment_id, provider_session_id=provider_session_id)
+                for appointment_id, provider_session_id in batch.created.items()
+            ],
+            ignore_conflicts=True,
+        )
+        result.provisioned += len(batch.created)
+        result.failed += len(batch.failed)
+        result.batches += 1
@@ -0,0 +1,253 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from video.infrastructure.models import (
+    VideoEventLog,
+    VideoQualityMinute,
+    VideoSession,
+    VideoSessionQualitySummary,
+)
+
+# Periodic client stats carry {"bitrate_kbps": <number>, "packet_loss": <0..1>}
+QUALITY_EVENT_TYPES = frozenset({"stats", "quality"})
+RECONNECT_EVENT_TYPES = frozenset({"reconnect", "ice.reconnect", "ice.restart"})
+
+
+@dataclass(frozen=True)
+class QualityAggregate:
+    event_count: int
+    sample_count: int
+    bitrate_sum: float
+    bitrate_min: Optional[float]
+    bitrate_max: Optional[float]
+    packet_loss_sum: float
+    packet_loss_count: int
+    packet_loss_max: Optional[float]
+    reconnects: int
+    first_event_at: datetime
+    last_event_at: datetime
+
+
+def aggregate_events(
+    events: List[VideoEventLog],
+) -> Tuple[Dict[str, QualityAggregate], Dict[Tuple[str, datetime], QualityAggregate]]:
+    """Reduce a batch of events to per-session and per-minute aggregates."""
+    count = len(events)
+    if not count:
+        return {}, {}
+
+    session_ids = np.empty(count, dtype=object)
+    timestamps = np.empty(count, dtype=np.float64)
+    bitrate = np.full(count, np.nan)
+    packet_loss = np.full(count, np.nan)
+    reconnect = np.zeros(count, dtype=bool)
+    # Pulling fields out of JSON payloads is the only per-event Python work
+    for index, event in enumerate(events):
+        session_ids[index] = str(event.session_id)
+        timestamps[index] = (event.occurred_at or event.created_at or timezone.now()).timestamp()
+        if event.event_type in QUALITY_EVENT_TYPES:
+            payload = event.payload or {}
+            bitrate[index] = _number(payload.get("bitrate_kbps"))
+            packet_loss[index] = _number(payload.get("packet_loss"))
+        elif event.event_type in RECONNECT_EVENT_TYPES:
+            reconnect[index] = True
+
+    sessions, session_index = np.unique(session_ids.astype(str), return_inverse=True)
+    per_session = _reduce(session_index, len(sessions), timestamps, bitrate, packet_loss, reconnect)
+
+    minutes = (timestamps // 60).astype(np.int64)
+    pairs, pair_index = np.unique(np.stack([session_index, minutes]), axis=1, return_inverse=True)
+    per_minute = _reduce(pair_index.ravel(), pairs.shape[1], timestamps, bitrate, packet_loss, reconnect)
+
+    by_session = {str(sessions[group]): aggregate for group, aggregate in enumerate(per_session)}
+    by_minute = {
+        (str(sessions[pairs[0, group]]), datetime.fromtimestamp(int(pairs[1, group]) * 60, tz=dt_timezone.utc)): aggregate
+        for group, aggregate in enumerate(per_minute)
+    }
+    return by_session, by_minute
+
+
+def apply_rollup(events: Iterable[VideoEventLog]) -> None:
+    """Fold a batch of stored events into the summary tables."""
+    events = [event for event in events if isinstance(event, VideoEventLog)]
+    by_session, by_minute = aggregate_events(events)
+    _lock_sessions(list(by_session))
+    now = timezone.now()
+    for session_id, aggregate in sorted(by_session.items()):
+        _upsert(
+            VideoSessionQualitySummary,
+            {"session_id": session_id},
+            aggregate,
+            {
+                "first_event_at": Least(_coalesce("first_event_at", aggregate.first_event_at), Value(aggregate.first_event_at)),
+                "last_event_at": Greatest(_coalesce("last_event_at", aggregate.last_event_at), Value(aggregate.last_event_at)),
+                "updated_at": now,
+            },
+            {
+                "first_event_at": aggregate.first_event_at,
+                "last_event_at": aggregate.last_event_at,
+            },
+        )
+    for (session_id, minute), aggregate in sorted(by_minute.items()):
+        _upsert(VideoQualityMinute, {"session_id": session_id, "minute": minute}, aggregate, {}, {})
+
+
+def rebuild(session_ids: Optional[List[str]] = None, batch_size: int = 5000, sessions_per_batch: int = 100) -> int:
+    """Recompute summaries from the raw event log, a few sessions per transaction.
+
+    Each group of sessions is locked, cleared and replayed in one
+    transaction. The flush listener folds batches in the transaction that
+    inserts them and takes the same session locks, so a batch is either
+    committed before the replay reads it or applied on top of the rebuilt rows.
+    """
+    total = 0
+    for group in _session_groups(session_ids, sessions_per_batch):
+        with transaction.atomic():
+            _lock_sessions(group)
+            VideoQualityMinute.objects.filter(session_id__in=group).delete()
+            VideoSessionQualitySummary.objects.filter(session_id__in=group).delete()
+            events = VideoEventLog.objects.filter(session_id__in=group).order_by("session_id", "created_at")
+            batch: List[VideoEventLog] = []
+            for event in events.only("session_id", "event_type", "payload", "occurred_at", "created_at").iterator(
+                chunk_size=batch_size
+            ):
+                batch.append(event)
+                if len(batch) >= batch_size:
+                    apply_rollup(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                apply_rollup(batch)
+                total += len(batch)
+    return total
+
+
+def _lock_sessions(session_ids: List) -> None:
+    # Sorted so a rebuild and concurrent flushes always lock in the same order
+    sessions = VideoSession.objects.select_for_update().filter(pk__in=session_ids).order_by("pk")
+    list(sessions.values_list("pk", flat=True))
+
+
+def _session_groups(session_ids: Optional[List[str]], size: int) -> Iterator[List]:
+    if session_ids:
+        for start in range(0, len(session_ids), size):
+            yield session_ids[start:start + size]
+        return
+    last_id = None
+    while True:
+        sessions = VideoSession.objects.order_by("pk")
+        if last_id is not None:
+            sessions = sessions.filter(pk__gt=last_id)
+        group = list(sessions.values_list("pk", flat=True)[:size])
+        if not group:
+            return
+        yield group
+        last_id = group[-1]
+
+
+def rollup_flushed_events(batch: list) -> None:
+    """Flush listener for the video_events writer."""
+    apply_rollup(batch)
+
+
+def _reduce(group_index, groups, timestamps, bitrate, packet_loss, reconnect) -> List[QualityAggregate]:
+    has_sample = ~np.isnan(bitrate)
+    has_loss = ~np.isnan(packet_loss)
+    event_count = np.bincount(group_index, minlength=groups)
+    sample_count = np.bincount(group_index, weights=has_sample, minlength=groups)
+    loss_count = np.bincount(group_index, weights=has_loss, minlength=groups)
+    bitrate_sum = np.bincount(group_index, weights=np.nan_to_num(bitrate), minlength=groups)
+    loss_sum = np.bincount(group_index, weights=np.nan_to_num(packet_loss), minlength=groups)
+    reconnects = np.bincount(group_index, weights=reconnect, minlength=groups)
+
+    # fmax/fmin skip NaN, so events without samples do not affect extremes
+    bitrate_min = np.full(groups, np.inf)
+    np.fmin.at(bitrate_min, group_index, bitrate)
+    bitrate_max = np.full(groups, -np.inf)
+    np.fmax.at(bitrate_max, group_index, bitrate)
+    loss_max = np.full(groups, -np.inf)
+    np.fmax.at(loss_max, group_index, packet_loss)
+    first = np.full(groups, np.inf)
+    np.minimum.at(first, group_index, timestamps)
+    last = np.full(groups, -np.inf)
+    np.maximum.at(last, group_index, timestamps)
+
+    return [
+        QualityAggregate(
+            event_count=int(event_count[group]),
+            sample_count=int(sample_count[group]),
+            bitrate_sum=float(bitrate_sum[group]),
+            bitrate_min=_finite(bitrate_min[group]),
+            bitrate_max=_finite(bitrate_max[group]),
+            packet_loss_sum=float(loss_sum[group]),
+            packet_loss_count=int(loss_count[group]),
+            packet_loss_max=_finite(loss_max[group]),
+            reconnects=int(reconnects[group]),
+            first_event_at=datetime.fromtimestamp(first[group], tz=dt_timezone.utc),
+            last_event_at=datetime.fromtimestamp(last[group], tz=dt_timezone.utc),
+        )
+        for group in range(groups)
+    ]
+
+
+def _upsert(model, key: dict, aggregate: QualityAggregate, extra_updates: dict, extra_initial: dict) -> None:
+    updates = {
+        "event_count": F("event_count") + aggregate.event_count,
+        "sample_count": F("sample_count") + aggregate.sample_count,
+        "bitrate_sum": F("bitrate_sum") + aggregate.bitrate_sum,
+        "packet_loss_sum": F("packet_loss_sum") + aggregate.packet_loss_sum,
+        "packet_loss_count": F("packet_loss_count") + aggregate.packet_loss_count,
+        "reconnects": F("reconnects") + aggregate.reconnects,
+        **extra_updates,
+    }
+    extremes = {
+        "bitrate_min": (Least, aggregate.bitrate_min),
+        "bitrate_max": (Greatest, aggregate.bitrate_max),
+        "packet_loss_max": (Greatest, aggregate.packet_loss_max),
+    }
+    for field, (pick, value) in extremes.items():
+        if value is not None:
+            updates[field] = pick(_coalesce(field, value), Value(value, output_field=FloatField()))
+
+    with transaction.atomic():
+        if model.objects.filter(**key).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(
+                    **key,
+                    event_count=aggregate.event_count,
+                    sample_count=aggregate.sample_count,
+                    bitrate_sum=aggregate.bitrate_sum,
+                    bitrate_min=aggregate.bitrate_min,
+                    bitrate_max=aggregate.bitrate_max,
+                    packet_loss_sum=aggregate.packet_loss_sum,
+                    packet_loss_count=aggregate.packet_loss_count,
+                    packet_loss_max=aggregate.packet_loss_max,
+                    reconnects=aggregate.reconnects,
+                    **extra_initial,
+                )
+        except IntegrityError:
+            # Another worker created the row first
+            model.objects.filter(**key).update(**updates)
+
+
+def _coalesce(field: str, value):
+    return Coalesce(F(field), Value(value))
+
+
+def _number(value) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return np.nan
+    return float(value)
+
+
+def _finite(value) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
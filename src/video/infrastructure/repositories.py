@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from video.domain.entities import QualityMinute, SessionQuality, VideoSession
+from video.domain.repositories import VideoQualityRepository, VideoSessionRepository
+from video.domain.value_objects import VideoSessionStatus
+from video.infrastructure.models import VideoQualityMinute, VideoSessionQualitySummary
+from video.infrastructure.models import VideoSession as VideoSessionModel
+
+
+class DjangoVideoSessionRepository(VideoSessionRepository):
+    def get_by_id(self, session_id: str) -> Optional[VideoSession]:
+        session = (
+            VideoSessionModel.objects.select_related("appointment")
+            .filter(pk=session_id)
+            .first()
+        )
+        return self._to_entity(session) if session else None
+
+    def get_by_appointment(self, appointment_id: str) -> Optional[VideoSession]:
+        # Unique OneToOne index on appointment_id
+        session = (
+            VideoSessionModel.objects.select_related("appointment")
+            .filter(appointment_id=appointment_id)
+            .first()
+        )
+        return self._to_entity(session) if session else None
+
+    def create_for_appointment(self, appointment_id: str, provider_session_id: str) -> VideoSession:
+        try:
+            with transaction.atomic():
+                VideoSessionModel.objects.create(
+                    appointment_id=appointment_id,
+                    provider_session_id=provider_session_id,
+                )
+        except IntegrityError:
+            # Provisioned concurrently; the existing session wins
+            pass
+        return self.get_by_appointment(appointment_id)
+
+    def renew_lease(self, session_id: str, now: datetime, expires_at: datetime) -> bool:
+        # A single UPDATE: the first heartbeat also activates the session
+        updated = VideoSessionModel.objects.filter(
+            pk=session_id,
+            status__in=[VideoSessionStatus.INITIATED.value, VideoSessionStatus.ACTIVE.value],
+        ).update(
+            status=VideoSessionStatus.ACTIVE.value,
+            started_at=Coalesce(F("started_at"), now),
+            lease_expires_at=expires_at,
+        )
+        return bool(updated)
+
+    def _to_entity(self, session: VideoSessionModel) -> VideoSession:
+        return VideoSession(
+            id=str(session.pk),
+            appointment_id=str(session.appointment_id),
+            doctor_id=str(session.appointment.doctor_id),
+            patient_id=str(session.appointment.patient_id),
+            status=VideoSessionStatus(session.status),
+            provider_session_id=session.provider_session_id,
+            started_at=session.started_at,
+            ended_at=session.ended_at,
+            lease_expires_at=session.lease_expires_at,
+            appointment_status=session.appointment.status,
+        )
+
+
+class DjangoVideoQualityRepository(VideoQualityRepository):
+    """Reads the pre-aggregated rollup tables; raw event logs are never scanned."""
+
+    def get_for_session(self, session_id: str) -> Optional[SessionQuality]:
+        summary = VideoSessionQualitySummary.objects.filter(session_id=session_id).first()
+        if summary is None:
+            return None
+        minutes = VideoQualityMinute.objects.filter(session_id=session_id).order_by("minute")
+        return SessionQuality(
+            session_id=str(summary.session_id),
+            event_count=summary.event_count,
+            sample_count=summary.sample_count,
+            avg_bitrate_kbps=_average(summary.bitrate_sum, summary.sample_count),
+            min_bitrate_kbps=summary.bitrate_min,
+            max_bitrate_kbps=summary.bitrate_max,
+            avg_packet_loss=_average(summary.packet_loss_sum, summary.packet_loss_count),
+            max_packet_loss=summary.packet_loss_max,
+            reconnects=summary.reconnects,
+            first_event_at=summary.first_event_at,
+            last_event_at=summary.last_event_at,
+            minutes=[
+                QualityMinute(
+                    minute=row.minute,
+                    event_count=row.event_count,
+                    avg_bitrate_kbps=_average(row.bitrate_sum, row.sample_count),
+                    min_bitrate_kbps=row.bitrate_min,
+                    avg_packet_loss=_average(row.packet_loss_sum, row.packet_loss_count),
+                    max_packet_loss=row.packet_loss_max,
+                    reconnects=row.reconnects,
+                )
+                for row in minutes
+            ],
+        )
+
+
+def _average(total: float, count: int) -> Optional[float]:
+    return total / count if count else None
@@ -0,0 +1,16 @@
+from django.utils import timezone
+
+from appointments.domain.value_objects import AppointmentStatus
+from video.domain.value_objects import VideoSessionStatus
+from video.infrastructure.models import VideoSession
+
+
+def appointment_saved(sender, instance, **kwargs) -> None:
+    """End the appointment's open video session once it is canceled."""
+    if instance.status != AppointmentStatus.CANCELED.value:
+        return
+    # Runs in the cancel transaction, so a join either sees both changes or neither
+    VideoSession.objects.filter(
+        appointment_id=instance.pk,
+        status__in=[VideoSessionStatus.INITIATED.value, VideoSessionStatus.ACTIVE.value],
+    ).update(status=VideoSessionStatus.ENDED.value, ended_at=timezone.now(), lease_expires_at=None)
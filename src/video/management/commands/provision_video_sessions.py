@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from video.infrastructure.providers import ConcurrentProvisioningClient, get_video_provider
+from video.infrastructure.provisioning import provision_upcoming_sessions
+
+
+class Command(BaseCommand):
+    help = "Pre-create video sessions for booked appointments starting soon."
+
+    def add_arguments(self, parser):
+        config = getattr(settings, "VIDEO_PROVISIONING", {})
+        parser.add_argument("--window", type=int, default=config.get("window_minutes", 30), help="Minutes ahead.")
+        parser.add_argument("--batch-size", type=int, default=config.get("batch_size", 100))
+        parser.add_argument("--workers", type=int, default=config.get("max_workers", 8))
+        parser.add_argument("--interval", type=float, default=0, help="Keep provisioning every N seconds.")
+
+    def handle(self, *args, **options):
+        client = ConcurrentProvisioningClient(get_video_provider(), max_workers=options["workers"])
+        try:
+            while True:
+                result = provision_upcoming_sessions(
+                    client,
+                    window_minutes=options["window"],
+                    batch_size=options["batch_size"],
+                )
+                if result.provisioned or result.failed:
+                    self.stdout.write(
+                        f"Provisioned {result.provisioned} sessions ({result.failed} failed) "
+                        f"in {result.batches} batches."
+                    )
+                if not options["interval"]:
+                    return
+                time.sleep(options["interval"])
+        finally:
+            client.close()
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from video.infrastructure.quality_rollup import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute video quality summaries from the raw event log."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--session", action="append", dest="sessions", help="Limit to a session id (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        total = rebuild(options["sessions"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {total} events."))
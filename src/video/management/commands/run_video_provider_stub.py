@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from video.infrastructure.provider_stub import ProviderStubServer
+
+
+class Command(BaseCommand):
+    help = "Serve a local stand-in for the video provider API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering.")
+        parser.add_argument("--failure-rate", type=float, default=0.0)
+        parser.add_argument("--failure-status", type=int, default=503)
+
+    def handle(self, *args, **options):
+        stub = ProviderStubServer(
+            host=options["host"],
+            port=options["port"],
+            latency=options["latency"],
+            failure_rate=options["failure_rate"],
+            failure_status=options["failure_status"],
+        )
+        self.stdout.write(f"Video provider stub listening on {stub.url}")
+        try:
+            stub.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from video.infrastructure.lease_sweeper import sweep_expired_leases
+
+
+class Command(BaseCommand):
+    help = "Mark ACTIVE video sessions with expired heartbeat leases as FAILED."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--interval", type=float, default=0, help="Keep sweeping every N seconds.")
+
+    def handle(self, *args, **options):
+        while True:
+            result = sweep_expired_leases(batch_size=options["batch_size"])
+            if result.expired:
+                self.stdout.write(f"Failed {result.expired} sessions in {result.batches} batches.")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
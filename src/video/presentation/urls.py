@@ -0,0 +1,37 @@
+from django.urls import path
+
+from video.presentation.views import (
+    BufferedWriterMetricsView,
+    VideoEventIngestView,
+    VideoSessionHeartbeatView,
+    VideoSessionJoinView,
+    VideoSessionQualityView,
+)
+
+urlpatterns = [
+    path(
+        "appointments/<str:appointment_id>/join/",
+        VideoSessionJoinView.as_view(),
+        name="video-session-join",
+    ),
+    path(
+        "sessions/<str:session_id>/events/",
+        VideoEventIngestView.as_view(),
+        name="video-events-ingest",
+    ),
+    path(
+        "sessions/<str:session_id>/heartbeat/",
+        VideoSessionHeartbeatView.as_view(),
+        name="video-session-heartbeat",
+    ),
+    path(
+        "sessions/<str:session_id>/quality/",
+        VideoSessionQualityView.as_view(),
+        name="video-session-quality",
+    ),
+    path(
+        "ingest/metrics/",
+        BufferedWriterMetricsView.as_view(),
+        name="video-ingest-metrics",
+    ),
+]
@@ -0,0 +1,126 @@
+from dataclasses import asdict
+
+from django.conf import settings
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from appointments.infrastructure.repositories import DjangoAppointmentRepository
+from common.audit import all_metrics
+from video.application.dto import (
+    GetSessionQualityRequest,
+    HeartbeatRequest,
+    IngestVideoEventsRequest,
+    JoinVideoSessionRequest,
+    VideoError,
+)
+from video.application.usecases import (
+    GetSessionQualityUseCase,
+    HeartbeatVideoSessionUseCase,
+    IngestVideoEventsUseCase,
+    JoinVideoSessionUseCase,
+)
+from video.infrastructure.event_sink import BufferedVideoEventSink
+from video.infrastructure.providers import get_video_provider
+from video.infrastructure.repositories import DjangoVideoQualityRepository, DjangoVideoSessionRepository
+
+
+class VideoEventIngestView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, session_id: str):
+        events = request.data.get("events") if isinstance(request.data, dict) else request.data
+        usecase = IngestVideoEventsUseCase(
+            DjangoVideoSessionRepository(),
+            BufferedVideoEventSink(),
+        )
+        try:
+            result = usecase.execute(
+                IngestVideoEventsRequest(
+                    user_id=str(request.user.id),
+                    session_id=str(session_id),
+                    events=events,
+                )
+            )
+        except VideoError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response(
+            {
+                "data": {
+                    "accepted": result.accepted,
+                    "rejected": [asdict(item) for item in result.rejected],
+                },
+                "meta": {},
+            },
+            status=202,
+        )
+
+
+class VideoSessionJoinView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, appointment_id: str):
+        usecase = JoinVideoSessionUseCase(
+            DjangoVideoSessionRepository(),
+            DjangoAppointmentRepository(),
+            get_video_provider(),
+        )
+        try:
+            result = usecase.execute(
+                JoinVideoSessionRequest(user_id=str(request.user.id), appointment_id=str(appointment_id))
+            )
+        except VideoError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response({"data": asdict(result), "meta": {}})
+
+
+class VideoSessionHeartbeatView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, session_id: str):
+        usecase = HeartbeatVideoSessionUseCase(
+            DjangoVideoSessionRepository(),
+            lease_seconds=getattr(settings, "VIDEO_SESSION_LEASE_SECONDS", 45),
+        )
+        try:
+            result = usecase.execute(
+                HeartbeatRequest(user_id=str(request.user.id), session_id=str(session_id))
+            )
+        except VideoError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response({"data": asdict(result), "meta": {}})
+
+
+class VideoSessionQualityView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, session_id: str):
+        usecase = GetSessionQualityUseCase(
+            DjangoVideoSessionRepository(),
+            DjangoVideoQualityRepository(),
+        )
+        try:
+            quality = usecase.execute(
+                GetSessionQualityRequest(user_id=str(request.user.id), session_id=str(session_id))
+            )
+        except VideoError as exc:
+            return _error_response(exc.code, exc.message, exc.details, exc.status)
+
+        return Response({"data": asdict(quality), "meta": {}})
+
+
+class BufferedWriterMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"data": [asdict(metrics) for metrics in all_metrics()], "meta": {}})
+
+
+def _error_response(code: str, message: str, details: dict, status: int):
+    return Response(
+        {"error": {"code": code, "message": message, "details": details or {}}},
+        status=status,
+    )